@@ -0,0 +1,129 @@
+"""
+Motor de resúmenes periódicos de precios de acciones.
+
+Calcula los agregados OHLC por símbolo y período (semana por defecto)
+directamente desde los archivos diarios de cada símbolo, y a partir de ellos
+los mejores períodos para comprar y vender. Todo se resuelve con operaciones
+vectorizadas en una sola pasada, sin importar la cantidad de símbolos.
+"""
+import threading
+
+import pandas as pd
+
+from datos import cargar, firma
+
+ACCIONES = ('acciones_ea', 'acciones_konami', 'acciones_nintendo', 'acciones_squarenix', 'acciones_ubisoft')
+
+_bloqueo = threading.Lock()
+_diarios = {}
+
+
+def diarios(datasets:tuple=ACCIONES) -> pd.DataFrame:
+    """
+    Une los precios diarios de varios símbolos en un solo DataFrame.
+
+    El resultado se cachea mientras no cambie ninguno de los archivos fuente.
+
+    Parámetros:
+        datasets (tuple, opcional): Datasets diarios a unir. Por defecto ACCIONES.
+
+    Retorna:
+        DataFrame: Precios diarios con Symbol categórico, ordenados por símbolo y fecha.
+    """
+    version = tuple(firma(nombre) for nombre in datasets)
+
+    with _bloqueo:
+        entrada = _diarios.get(datasets)
+        if entrada is None or entrada[0] != version:
+            df = pd.concat([cargar(nombre) for nombre in datasets], ignore_index=True)
+            df['Symbol'] = df['Symbol'].astype('category')
+            df = df.sort_values(['Symbol', 'Fecha'], ignore_index=True)
+            entrada = (version, df)
+            _diarios[datasets] = entrada
+
+    return entrada[1]
+
+
+def resumen_periodico(df:pd.DataFrame, periodo:str='W-SUN') -> pd.DataFrame:
+    """
+    Agrega precios diarios en velas OHLC por símbolo y período.
+
+    Parámetros:
+        df (DataFrame): Precios diarios con Symbol, Fecha y columnas Precio_*.
+        periodo (str, opcional): Frecuencia de pandas del período, por ejemplo
+            'W-SUN' (semanas de lunes a domingo), '2W-SUN' o 'MS'. Por defecto 'W-SUN'.
+
+    Retorna:
+        DataFrame: Una fila por símbolo y período con la fecha del primer día
+        operado, la semana ISO de esa fecha, apertura, máximo, mínimo, cierre
+        y cierre promedio del período.
+    """
+    resumen = (df.groupby(['Symbol', pd.Grouper(key='Fecha', freq=periodo)], observed=True)
+                 .agg(Fecha_Inicio=('Fecha', 'first'),
+                      Precio_Apertura=('Precio_Apertura', 'first'),
+                      Precio_Maximo=('Precio_Maximo', 'max'),
+                      Precio_Minimo=('Precio_Minimo', 'min'),
+                      Precio_Cierre=('Precio_Cierre', 'last'),
+                      Precio_Cierre_Promedio=('Precio_Cierre', 'mean'))
+                 .dropna(subset=['Fecha_Inicio'])
+                 .reset_index(level='Fecha', drop=True)
+                 .reset_index()
+                 .rename(columns={'Fecha_Inicio': 'Fecha'}))
+
+    resumen.insert(1, 'Semana', resumen['Fecha'].dt.isocalendar().week.astype('int16'))
+    return resumen
+
+
+def mejores_periodos(resumen:pd.DataFrame, columna:str='Precio_Cierre_Promedio') -> tuple:
+    """
+    Elige para cada símbolo el período más barato (compra) y el más caro (venta).
+
+    Se resuelve con un único ordenamiento del resumen: la primera fila de cada
+    símbolo es la de menor precio y la última la de mayor.
+
+    Parámetros:
+        resumen (DataFrame): Resultado de resumen_periodico.
+        columna (str, opcional): Precio a comparar. Por defecto 'Precio_Cierre_Promedio'.
+
+    Retorna:
+        tuple: (DataFrame de compra, DataFrame de venta), una fila por símbolo.
+    """
+    ordenado = resumen.sort_values(['Symbol', columna], kind='stable')
+    compra = ordenado.drop_duplicates('Symbol', keep='first').reset_index(drop=True)
+    venta = ordenado.drop_duplicates('Symbol', keep='last').reset_index(drop=True)
+    return compra, venta
+
+
+def texto_hover(df:pd.DataFrame, columna:str='Precio_Cierre_Promedio') -> pd.Series:
+    """
+    Arma el texto emergente de cada período con operaciones de texto vectorizadas.
+
+    Parámetros:
+        df (DataFrame): Filas de un resumen periódico.
+        columna (str, opcional): Precio a mostrar. Por defecto 'Precio_Cierre_Promedio'.
+
+    Retorna:
+        Series: Texto HTML para el hover de Plotly.
+    """
+    return ('Simbolo: ' + df['Symbol'].astype(str)
+            + '<br>Fecha: ' + df['Fecha'].dt.strftime('%d-%m-%Y')
+            + '<br>Semana: ' + df['Semana'].astype(str)
+            + '<br>Precio: ' + df[columna].map('{:.2f}'.format) + '$')
+
+
+def lineas_informe(df:pd.DataFrame, columna:str='Precio_Cierre_Promedio') -> str:
+    """
+    Redacta una línea por símbolo con la semana, fecha y precio de un resumen.
+
+    Parámetros:
+        df (DataFrame): Filas elegidas por mejores_periodos.
+        columna (str, opcional): Precio a mostrar. Por defecto 'Precio_Cierre_Promedio'.
+
+    Retorna:
+        str: Líneas separadas por saltos de línea de Markdown.
+    """
+    lineas = (df['Symbol'].astype(str)
+              + ': Semana ' + df['Semana'].astype(str)
+              + ', Fecha ' + df['Fecha'].dt.strftime('%Y-%m-%d')
+              + ', Precio de Cierre Promedio: ' + df[columna].map('{:.2f}'.format))
+    return '  \n'.join(lineas)
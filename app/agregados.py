@@ -0,0 +1,209 @@
+"""
+Almacén de agregados precalculados para las consultas del catálogo.
+
+Uso:
+    python app/agregados.py    # materializa todas las consultas de consultas.CONSULTAS
+
+Cada resultado se guarda como Arrow IPC en Data/agregados con un nombre que
+incluye la huella del dataset fuente y de la definición de la consulta, por lo
+que un cambio en cualquiera de los dos genera una entrada nueva. La app sólo
+consulta el almacén; si una entrada falta la calcula una vez por proceso.
+"""
+import hashlib
+import os
+import threading
+
+import pyarrow as pa
+
+import diagnostico
+from consultas import CONSULTAS, combinar, ejecutar, es_combinable, finalizar, parcial
+from datos import RUTA_DATOS, firma
+
+RUTA_AGREGADOS = RUTA_DATOS / 'agregados'
+
+_bloqueo = threading.Lock()
+_memoria = {}
+
+
+def clave(nombre:str) -> str:
+    """
+    Calcula la clave de almacenamiento de una consulta.
+
+    Parámetros:
+        nombre (str): Nombre de la consulta en CONSULTAS.
+
+    Retorna:
+        str: Hash sha256 de la huella del dataset y la definición de la consulta.
+    """
+    consulta = CONSULTAS[nombre]
+    contenido = f'{firma(consulta.dataset)}|{consulta!r}'
+    return hashlib.sha256(contenido.encode()).hexdigest()
+
+
+def _ruta(nombre:str, clave_consulta:str):
+    return RUTA_AGREGADOS / f'{nombre}-{clave_consulta[:16]}.arrow'
+
+
+def _ruta_parcial(nombre:str, clave_consulta:str):
+    return RUTA_AGREGADOS / f'{nombre}-{clave_consulta[:16]}.parcial.arrow'
+
+
+def _leer(ruta):
+    try:
+        with pa.memory_map(str(ruta)) as fuente:
+            return pa.ipc.open_file(fuente).read_all().to_pandas()
+    except (FileNotFoundError, pa.ArrowInvalid):
+        return None
+
+
+def _escribir(ruta, df):
+    tabla = pa.Table.from_pandas(df, preserve_index=False)
+    temporal = ruta.with_suffix(f'.{os.getpid()}.tmp')
+    with pa.OSFile(str(temporal), 'wb') as destino:
+        with pa.ipc.new_file(destino, tabla.schema) as escritor:
+            escritor.write_table(tabla)
+    os.replace(temporal, ruta)
+
+
+def _leer_parcial(nombre, clave_consulta):
+    df = _leer(_ruta_parcial(nombre, clave_consulta))
+    if df is None:
+        return None
+    return df.set_index(list(CONSULTAS[nombre].grupos))
+
+
+def _escribir_parcial(nombre, clave_consulta, df):
+    _escribir(_ruta_parcial(nombre, clave_consulta), df.reset_index())
+
+
+def resultado(nombre:str):
+    """
+    Devuelve el resultado de una consulta del catálogo.
+
+    Busca primero en memoria, luego en el almacén en disco y sólo si no existe
+    ninguna entrada vigente ejecuta la consulta. El frame devuelto se comparte
+    entre sesiones y no debe modificarse en el lugar.
+
+    Parámetros:
+        nombre (str): Nombre de la consulta en CONSULTAS.
+
+    Retorna:
+        DataFrame: Resultado de la consulta.
+    """
+    clave_consulta = clave(nombre)
+
+    entrada = _memoria.get(nombre)
+    if entrada is not None and entrada[0] == clave_consulta:
+        diagnostico.contar('agregados', True)
+        return entrada[1]
+
+    diagnostico.contar('agregados', False)
+    with _bloqueo:
+        entrada = _memoria.get(nombre)
+        if entrada is None or entrada[0] != clave_consulta:
+            df = _leer(_ruta(nombre, clave_consulta))
+            if df is None:
+                with diagnostico.medir(f'consulta:{nombre}'):
+                    df = ejecutar(CONSULTAS[nombre])
+            entrada = (clave_consulta, df)
+            _memoria[nombre] = entrada
+
+    return entrada[1]
+
+
+def materializar_consulta(nombre:str) -> list:
+    """
+    Guarda en el almacén el resultado de una consulta si no tiene una entrada vigente.
+
+    Parámetros:
+        nombre (str): Nombre de la consulta en CONSULTAS.
+
+    Retorna:
+        list: Rutas vigentes de la consulta (resultado y, si es combinable, parcial).
+    """
+    RUTA_AGREGADOS.mkdir(exist_ok=True)
+    consulta = CONSULTAS[nombre]
+    clave_consulta = clave(nombre)
+    ruta = _ruta(nombre, clave_consulta)
+    rutas = [ruta]
+    if es_combinable(consulta):
+        rutas.append(_ruta_parcial(nombre, clave_consulta))
+
+    if not all(ruta.exists() for ruta in rutas):
+        if es_combinable(consulta):
+            agregado = parcial(consulta)
+            _escribir_parcial(nombre, clave_consulta, agregado)
+            _escribir(ruta, finalizar(consulta, agregado))
+        else:
+            _escribir(ruta, ejecutar(consulta))
+        print(f'{nombre} -> {ruta.name}')
+
+    return rutas
+
+
+def materializar() -> list:
+    """
+    Ejecuta todas las consultas del catálogo y guarda sus resultados en el almacén.
+
+    Las consultas con una entrada vigente no se recalculan y los archivos de
+    versiones anteriores se eliminan.
+
+    Retorna:
+        list: Rutas de los archivos vigentes del almacén.
+    """
+    vigentes = []
+    for nombre in CONSULTAS:
+        vigentes.extend(materializar_consulta(nombre))
+
+    for ruta in RUTA_AGREGADOS.glob('*.arrow'):
+        if ruta not in vigentes:
+            ruta.unlink()
+
+    return vigentes
+
+
+def actualizar(dataset:str, nuevas, claves_anteriores:dict) -> list:
+    """
+    Actualiza los agregados de un dataset después de anexarle filas.
+
+    Para cada consulta combinable del dataset que tenga un parcial guardado
+    con la clave anterior, se combina ese parcial con el de las filas nuevas y
+    se guardan el parcial y el resultado con la clave nueva. Las demás
+    consultas del dataset se recalculan la próxima vez que se pidan.
+
+    Parámetros:
+        dataset (str): Nombre del dataset al que se anexaron filas.
+        nuevas (DataFrame): Filas anexadas, con los tipos del dataset.
+        claves_anteriores (dict): Clave de cada consulta antes de anexar.
+
+    Retorna:
+        list: Nombres de las consultas actualizadas.
+    """
+    actualizadas = []
+
+    for nombre, consulta in CONSULTAS.items():
+        if consulta.dataset != dataset or not es_combinable(consulta):
+            continue
+
+        anterior = claves_anteriores.get(nombre)
+        agregado = _leer_parcial(nombre, anterior) if anterior else None
+        if agregado is None:
+            continue
+
+        clave_consulta = clave(nombre)
+        agregado = combinar(consulta, agregado, parcial(consulta, nuevas))
+        df = finalizar(consulta, agregado)
+        _escribir_parcial(nombre, clave_consulta, agregado)
+        _escribir(_ruta(nombre, clave_consulta), df)
+        _ruta(nombre, anterior).unlink(missing_ok=True)
+        _ruta_parcial(nombre, anterior).unlink(missing_ok=True)
+
+        with _bloqueo:
+            _memoria[nombre] = (clave_consulta, df)
+        actualizadas.append(nombre)
+
+    return actualizadas
+
+
+if __name__ == '__main__':
+    materializar()
@@ -0,0 +1,231 @@
+"""
+Animaciones de carrera de barras generadas a partir de los datos.
+
+Uso:
+    python app/animaciones.py    # exporta a video las carreras de todas las secciones
+
+Una Carrera describe una animación (categoría, valor y período) y se usa como
+gráfico de una sección: devuelve una figura de Plotly animada en el navegador.
+La figura lleva una sola vez el estilo de cada barra y cada cuadro sólo trae
+los valores que cambiaron respecto del período anterior y el orden de las
+categorías, así que lo que se envía al cliente es mínimo y siempre coincide
+con los datos actuales.
+
+Si además hace falta un archivo de video, solicitar_video lo renderiza con
+Matplotlib en un hilo en segundo plano y lo guarda en Data/videos con la
+huella de la tabla en el nombre, de modo que se genera una sola vez por
+versión de los datos. Se usa MP4 si ffmpeg está disponible y GIF si no.
+"""
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+import pandas as pd
+import plotly.graph_objects as go
+from plotly.colors import qualitative
+
+from datos import RUTA_DATOS
+
+RUTA_VIDEOS = RUTA_DATOS / 'videos'
+COLORES = qualitative.Light24 + qualitative.Dark24
+DURACION_CUADRO = 800
+
+_bloqueo = threading.Lock()
+_trabajos = {}
+_ejecutor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='videos')
+
+
+@dataclass(frozen=True)
+class Carrera:
+    """
+    Carrera de barras horizontales de una categoría a lo largo de los períodos.
+
+    Atributos:
+        categoria (str): Columna de las barras, por ejemplo 'Industria'.
+        valor (str): Columna del largo de las barras.
+        periodo (str): Columna de los cuadros de la animación, por ejemplo 'Ano'.
+        titulo (str): Título del gráfico; se le agrega el período de cada cuadro.
+        etiqueta (str): Título del eje de valores.
+        n (int): Cantidad de barras visibles en cada cuadro. Por defecto 10.
+    """
+    categoria: str
+    valor: str
+    periodo: str
+    titulo: str
+    etiqueta: str = ''
+    n: int = 10
+
+    def tabla(self, df:pd.DataFrame) -> pd.DataFrame:
+        """Valores por período (filas) y categoría (columnas); 0 donde no hay datos."""
+        return (df.pivot_table(index=self.periodo, columns=self.categoria, values=self.valor,
+                               aggfunc='sum', observed=True)
+                  .fillna(0)
+                  .astype('float64')
+                  .round(2))
+
+    def __call__(self, df:pd.DataFrame):
+        """
+        Construye la carrera como figura animada de Plotly.
+
+        Cada categoría es una traza con su color fijo. Los cuadros sólo
+        actualizan las trazas cuyo valor cambió y reordenan el eje de
+        categorías, que muestra las n mayores del período.
+
+        Parámetros:
+            df (DataFrame): Tabla con las columnas categoria, valor y periodo.
+
+        Retorna:
+            plotly.graph_objects.Figure: Figura con un cuadro por período.
+        """
+        tabla = self.tabla(df)
+        categorias = tabla.columns.astype(str).tolist()
+        visibles = min(self.n, len(categorias))
+
+        primero = tabla.iloc[0].to_numpy()
+        fig = go.Figure(data=[
+            go.Bar(x=[primero[i]], y=[categoria], orientation='h', name=categoria,
+                   marker_color=COLORES[i % len(COLORES)], showlegend=False,
+                   texttemplate='%{x:,.0f}', textposition='outside', cliponaxis=False,
+                   hovertemplate='%{y}: %{x:,.2f}<extra></extra>')
+            for i, categoria in enumerate(categorias)
+        ])
+
+        cuadros = []
+        anterior = None
+        for periodo, fila in tabla.iterrows():
+            valores = fila.to_numpy()
+            cambios = [i for i in range(len(valores)) if anterior is None or valores[i] != anterior[i]]
+            orden = [categorias[i] for i in valores.argsort(kind='stable')]
+            cuadros.append(go.Frame(
+                name=str(periodo),
+                traces=cambios,
+                data=[go.Bar(x=[valores[i]]) for i in cambios],
+                layout=go.Layout(title_text=f'{self.titulo} ({periodo})',
+                                 xaxis_range=[0, valores.max() * 1.15],
+                                 yaxis_categoryarray=orden),
+            ))
+            anterior = valores
+        fig.frames = cuadros
+
+        transicion = {'frame': {'duration': DURACION_CUADRO, 'redraw': True},
+                      'transition': {'duration': DURACION_CUADRO // 2}}
+        fig.update_layout(
+            cuadros[0].layout,
+            height=120 + 40 * visibles,
+            xaxis_title=self.etiqueta,
+            yaxis=dict(categoryorder='array', range=[len(categorias) - visibles - 0.5, len(categorias) - 0.5]),
+            updatemenus=[dict(type='buttons', direction='left', x=0, y=-0.15, xanchor='left', buttons=[
+                dict(label='▶', method='animate', args=[None, {**transicion, 'fromcurrent': True}]),
+                dict(label='❚❚', method='animate', args=[[None], {'mode': 'immediate'}]),
+            ])],
+            sliders=[dict(x=0.1, len=0.9, y=-0.1, currentvalue={'prefix': f'{self.periodo}: '}, steps=[
+                dict(label=cuadro.name, method='animate', args=[[cuadro.name], {**transicion, 'mode': 'immediate'}])
+                for cuadro in cuadros
+            ])],
+        )
+        return fig
+
+    def video(self, df:pd.DataFrame, ruta, pasos:int=10, fps:int=10):
+        """
+        Renderiza la carrera a un archivo de video con Matplotlib.
+
+        Entre dos períodos los valores se interpolan en `pasos` cuadros para
+        que las barras se muevan de forma continua.
+
+        Parámetros:
+            df (DataFrame): Tabla con las columnas categoria, valor y periodo.
+            ruta (Path): Archivo de destino (.mp4 o .gif).
+            pasos (int, opcional): Cuadros por período. Por defecto 10.
+            fps (int, opcional): Cuadros por segundo. Por defecto 10.
+        """
+        from matplotlib.animation import FFMpegWriter, FuncAnimation, PillowWriter
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        tabla = self.tabla(df)
+        periodos = tabla.index.tolist()
+        categorias = tabla.columns.astype(str).tolist()
+        colores = {categoria: COLORES[i % len(COLORES)] for i, categoria in enumerate(categorias)}
+
+        # Cuadros intermedios: se interpolan los valores entre períodos consecutivos.
+        tabla = tabla.reset_index(drop=True)
+        tabla.index = tabla.index * pasos
+        tabla = tabla.reindex(range(tabla.index[-1] + 1)).interpolate()
+
+        fig = Figure(figsize=(12, 0.5 * self.n + 1.5))
+        FigureCanvasAgg(fig)
+        fig.subplots_adjust(left=0.28, right=0.95)
+        ax = fig.add_subplot()
+
+        def dibujar(cuadro):
+            fila = tabla.iloc[cuadro].set_axis(categorias).nlargest(self.n).iloc[::-1]
+            ax.clear()
+            barras = ax.barh(fila.index, fila.to_numpy(), color=[colores[categoria] for categoria in fila.index])
+            ax.bar_label(barras, labels=[f'{valor:,.0f}' for valor in fila.to_numpy()], padding=4)
+            ax.set_xlim(0, fila.max() * 1.15)
+            ax.set_xlabel(self.etiqueta)
+            ax.set_title(f'{self.titulo} ({periodos[min(cuadro // pasos, len(periodos) - 1)]})')
+
+        animacion = FuncAnimation(fig, dibujar, frames=len(tabla), repeat=False)
+        escritor = FFMpegWriter(fps=fps) if ruta.suffix == '.mp4' else PillowWriter(fps=fps)
+        animacion.save(str(ruta), writer=escritor)
+
+
+def extension_video() -> str:
+    """Devuelve '.mp4' si ffmpeg está disponible y '.gif' si no."""
+    from matplotlib.animation import writers
+    return '.mp4' if writers.is_available('ffmpeg') else '.gif'
+
+
+def _ruta_video(clave:str, carrera:Carrera, df:pd.DataFrame):
+    sha = hashlib.sha256()
+    sha.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    sha.update(repr(carrera).encode())
+    return RUTA_VIDEOS / f'{clave}-{sha.hexdigest()[:16]}{extension_video()}'
+
+
+def _renderizar(carrera:Carrera, df:pd.DataFrame, ruta):
+    RUTA_VIDEOS.mkdir(exist_ok=True)
+    temporal = ruta.with_name(f'tmp-{ruta.name}')
+    carrera.video(df, temporal)
+    temporal.replace(ruta)
+    for anterior in RUTA_VIDEOS.glob(f'{ruta.name.rsplit("-", 1)[0]}-*'):
+        if anterior != ruta:
+            anterior.unlink(missing_ok=True)
+    return ruta
+
+
+def solicitar_video(clave:str, carrera:Carrera, df:pd.DataFrame):
+    """
+    Devuelve el video de una carrera o encarga su renderizado en segundo plano.
+
+    Parámetros:
+        clave (str): Identificador de la sección, se usa en el nombre del archivo.
+        carrera (Carrera): Animación a renderizar.
+        df (DataFrame): Tabla de la sección.
+
+    Retorna:
+        Path o None: Ruta del video si ya está listo, o None si se está generando.
+    """
+    ruta = _ruta_video(clave, carrera, df)
+    if ruta.exists():
+        return ruta
+
+    with _bloqueo:
+        trabajo = _trabajos.get(ruta)
+        if trabajo is None or (trabajo.done() and trabajo.exception() is not None):
+            _trabajos[ruta] = _ejecutor.submit(_renderizar, carrera, df, ruta)
+    return None
+
+
+if __name__ == '__main__':
+    from secciones import SECCIONES
+
+    for seccion in SECCIONES.values():
+        if isinstance(seccion.grafico, Carrera):
+            df = seccion.tabla()
+            ruta = _ruta_video(seccion.clave, seccion.grafico, df)
+            if not ruta.exists():
+                _renderizar(seccion.grafico, df, ruta)
+            print(f'{seccion.clave} -> {ruta.name}')
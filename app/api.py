@@ -0,0 +1,365 @@
+"""
+API HTTP de solo lectura con los resultados del dashboard, sin Streamlit.
+
+Uso:
+    python app/api.py                               # escucha en 127.0.0.1:8765
+    python app/api.py --host 0.0.0.0 --puerto 9000
+
+Rutas (GET o HEAD, respuestas JSON):
+    /secciones                  secciones del dashboard (clave, página y pregunta)
+    /secciones/<clave>          tabla, informe y hechos citados en el informe de
+                                una sección; las que dependen de sus controles
+                                los reciben como parámetros, por ejemplo
+                                /secciones/explorar_cubo?medida=Ganancias&dimension=Continente
+    /consultas                  catálogo de consultas (ver consultas.py)
+    /consultas/<nombre>         resultado de una consulta
+    /cubo                       agregación del cubo (ver cubo.py), por ejemplo
+                                /cubo?por=Industria,Ano&medidas=Ingresos&Continente=Europe
+    /empresas                   empresas de Forbes 2015-2022 que cumplen filtros
+                                resueltos con los índices (ver indices.py), por
+                                ejemplo /empresas?Industria=Banking&Activos=0:300000&limite=100;
+                                limite va de 1 a LIMITE_EMPRESAS (el valor por defecto)
+
+Cada respuesta lleva un ETag con el hash de su contenido. Un cliente que
+consulta periódicamente manda el último en If-None-Match y, si los datos no
+cambiaron, recibe 304 Not Modified sin cuerpo. Las respuestas se guardan por
+ruta y versión de los datos, así que esa consulta sólo verifica las huellas
+de los archivos: no vuelve a ejecutar pandas ni a serializar.
+
+Las conexiones se atienden con asyncio y el cálculo de cada respuesta corre
+en un hilo aparte, de modo que una consulta lenta no demora a las demás. El
+cuerpo de una petición se lee y se descarta; una línea de petición de más de
+64 KB se responde con 400 y unas cabeceras demasiado grandes con 431, y en
+ambos casos se cierra la conexión.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import sys
+import traceback
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import pandas as pd
+
+import cubo
+import indices
+from agregados import clave as clave_consulta, resultado
+from consultas import CONSULTAS
+from datos import cargar, firma, para_mostrar
+from renderizado import CacheLRU
+from secciones import DATASET_EXPLORADOR, SECCIONES
+
+HOST = '127.0.0.1'
+PUERTO = 8765
+TIPO_JSON = 'application/json; charset=utf-8'
+LIMITE_EMPRESAS = 1000
+MAXIMO_CABECERAS = 100
+
+ESTADOS = {
+    200: 'OK',
+    304: 'Not Modified',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    431: 'Request Header Fields Too Large',
+    500: 'Internal Server Error',
+}
+
+RUTAS = ['/secciones', '/secciones/<clave>', '/consultas', '/consultas/<nombre>', '/cubo', '/empresas']
+
+_respuestas = CacheLRU()
+
+
+class ErrorHTTP(Exception):
+    """Error de la petición que se responde con un estado HTTP y un mensaje."""
+
+    def __init__(self, estado:int, mensaje:str):
+        super().__init__(mensaje)
+        self.estado = estado
+        self.mensaje = mensaje
+
+
+def _tabla(df:pd.DataFrame) -> list:
+    # Los montos float32 se muestran redondeados, como en la app (ver datos.para_mostrar).
+    df = para_mostrar(df)
+    return json.loads(df.to_json(orient='records', date_format='iso', force_ascii=False))
+
+
+def _lista(parametros:dict, nombre:str) -> list:
+    # Los valores se pueden repetir (?Pais=Spain&Pais=Japan) o separar con comas.
+    return [valor for grupo in parametros.get(nombre, []) for valor in grupo.split(',') if valor]
+
+
+def _valor(columna:str, valor:str):
+    if columna == 'Ano':
+        try:
+            return int(valor)
+        except ValueError:
+            raise ErrorHTTP(400, f'Año inválido: {valor!r}')
+    return valor
+
+
+def _secciones(parametros:dict) -> tuple:
+    return '', lambda: [{'clave': seccion.clave, 'pagina': seccion.pagina, 'pregunta': seccion.pregunta}
+                        for seccion in SECCIONES.values()]
+
+
+def _seccion(clave:str, parametros:dict) -> tuple:
+    seccion = SECCIONES.get(clave)
+    if seccion is None:
+        raise ErrorHTTP(404, f'No existe la sección {clave!r}')
+    controles = {nombre: valores[-1] for nombre, valores in parametros.items()}
+    if controles and not seccion.datos_con_controles:
+        raise ErrorHTTP(400, f'La sección {clave!r} no acepta parámetros')
+
+    def construir():
+        try:
+            df = seccion.tabla(**controles)
+        except (TypeError, ValueError, KeyError) as error:
+            raise ErrorHTTP(400, f'Parámetros inválidos para {clave!r}: {error}')
+        hechos = seccion.hechos(df) if seccion.hechos is not None else {}
+        return {
+            'clave': seccion.clave,
+            'pagina': seccion.pagina,
+            'pregunta': seccion.pregunta,
+            'tabla': _tabla(df),
+            'informe': seccion.redactar(df),
+            'hechos': {nombre: _tabla(valor) for nombre, valor in hechos.items()},
+        }
+
+    return seccion.version(), construir
+
+
+def _consultas(parametros:dict) -> tuple:
+    return '', lambda: [{'nombre': consulta.nombre, 'dataset': consulta.dataset}
+                        for consulta in CONSULTAS.values()]
+
+
+def _consulta(nombre:str, parametros:dict) -> tuple:
+    if nombre not in CONSULTAS:
+        raise ErrorHTTP(404, f'No existe la consulta {nombre!r}')
+    return clave_consulta(nombre), lambda: {'nombre': nombre, 'tabla': _tabla(resultado(nombre))}
+
+
+def _cubo(parametros:dict) -> tuple:
+    por = tuple(_lista(parametros, 'por')) or ('Industria',)
+    medidas = tuple(_lista(parametros, 'medidas')) or cubo.MEDIDAS
+    invalidas = [dimension for dimension in por if dimension not in cubo.DIMENSIONES]
+    invalidas += [medida for medida in medidas if medida not in cubo.MEDIDAS]
+    if invalidas:
+        raise ErrorHTTP(400, f'Dimensiones o medidas desconocidas: {invalidas}')
+    try:
+        cubo.validar(por)
+    except ValueError as error:
+        raise ErrorHTTP(400, str(error))
+    filtros = {dimension: [_valor(dimension, valor) for valor in _lista(parametros, dimension)]
+               for dimension in cubo.DIMENSIONES if dimension in parametros}
+
+    return cubo.huella(), lambda: {'tabla': _tabla(cubo.obtener().consultar(por, medidas, filtros))}
+
+
+def _rango(columna:str, texto:str) -> tuple:
+    desde, _, hasta = texto.partition(':')
+    try:
+        return (float(desde) if desde else float('-inf'), float(hasta) if hasta else float('inf'))
+    except ValueError:
+        raise ErrorHTTP(400, f'Rango inválido para {columna}: {texto!r}, se espera desde:hasta')
+
+
+def _empresas(parametros:dict) -> tuple:
+    valores = {columna: [_valor(columna, valor) for valor in _lista(parametros, columna)]
+               for columna in indices.CATEGORICAS if columna in parametros}
+    rangos = {columna: _rango(columna, parametros[columna][-1])
+              for columna in indices.NUMERICAS if columna in parametros}
+    try:
+        limite = int(parametros.get('limite', [LIMITE_EMPRESAS])[-1])
+    except ValueError:
+        limite = None
+    if limite is None or not 1 <= limite <= LIMITE_EMPRESAS:
+        raise ErrorHTTP(400, f'El límite debe ser un número entero entre 1 y {LIMITE_EMPRESAS}')
+
+    def construir():
+        posiciones = indices.obtener(DATASET_EXPLORADOR).filtrar(valores, rangos)
+        df = cargar(DATASET_EXPLORADOR).take(posiciones[:limite])
+        return {'total': len(posiciones), 'filas': _tabla(df)}
+
+    return firma(DATASET_EXPLORADOR), construir
+
+
+def _resolver(ruta:str, parametros:dict) -> tuple:
+    partes = [parte for parte in ruta.split('/') if parte]
+    if partes == []:
+        return '', lambda: {'rutas': RUTAS}
+    if partes == ['secciones']:
+        return _secciones(parametros)
+    if len(partes) == 2 and partes[0] == 'secciones':
+        return _seccion(partes[1], parametros)
+    if partes == ['consultas']:
+        return _consultas(parametros)
+    if len(partes) == 2 and partes[0] == 'consultas':
+        return _consulta(partes[1], parametros)
+    if partes == ['cubo']:
+        return _cubo(parametros)
+    if partes == ['empresas']:
+        return _empresas(parametros)
+    raise ErrorHTTP(404, f'No existe la ruta {ruta!r}')
+
+
+def responder(ruta:str, parametros:dict) -> tuple:
+    """
+    Calcula (o toma de la cache) el cuerpo JSON y el ETag de una ruta.
+
+    Parámetros:
+        ruta (str): Ruta pedida, por ejemplo '/secciones/top_empresas_ROA'.
+        parametros (dict): Parámetros de la query string, como los devuelve parse_qs.
+
+    Retorna:
+        tuple: (cuerpo en bytes, ETag entre comillas).
+    """
+    version, construir = _resolver(ruta, parametros)
+    clave = (ruta, tuple(sorted((nombre, tuple(valores)) for nombre, valores in parametros.items())))
+
+    entrada = _respuestas.obtener(clave)
+    if entrada is not None and entrada[0] == version:
+        return entrada[1:]
+
+    cuerpo = json.dumps(construir(), ensure_ascii=False).encode('utf-8')
+    etag = f'"{hashlib.sha256(cuerpo).hexdigest()[:32]}"'
+    _respuestas.guardar(clave, (version, cuerpo, etag), len(cuerpo))
+    return cuerpo, etag
+
+
+def _coincide(etag:str, condicion:str) -> bool:
+    # If-None-Match admite una lista de ETags, débiles (W/) o '*'.
+    etiquetas = [etiqueta.strip().removeprefix('W/') for etiqueta in condicion.split(',')]
+    return '*' in etiquetas or etag in etiquetas
+
+
+def _error(mensaje:str) -> bytes:
+    return json.dumps({'error': mensaje}, ensure_ascii=False).encode()
+
+
+async def _procesar(metodo:str, destino:str, cabeceras:dict) -> tuple:
+    if metodo not in ('GET', 'HEAD'):
+        return 405, _error(f'Método {metodo} no permitido'), None
+
+    partes = urlsplit(destino)
+    ruta = unquote(partes.path)
+    parametros = parse_qs(partes.query)
+    try:
+        cuerpo, etag = await asyncio.get_running_loop().run_in_executor(None, responder, ruta, parametros)
+    except ErrorHTTP as error:
+        return error.estado, _error(error.mensaje), None
+    except Exception:
+        traceback.print_exc(file=sys.stderr)
+        return 500, _error('Error interno'), None
+
+    if _coincide(etag, cabeceras.get('if-none-match', '')):
+        return 304, b'', etag
+    return 200, cuerpo, etag
+
+
+def _escribir(escritor:asyncio.StreamWriter, metodo:str, estado:int, cuerpo:bytes, etag:str, seguir:bool):
+    lineas = [f'HTTP/1.1 {estado} {ESTADOS[estado]}']
+    if estado != 304:
+        lineas += [f'Content-Type: {TIPO_JSON}', f'Content-Length: {len(cuerpo)}']
+    if etag:
+        lineas += [f'ETag: {etag}', 'Cache-Control: no-cache']
+    lineas.append(f'Connection: {"keep-alive" if seguir else "close"}')
+    escritor.write(('\r\n'.join(lineas) + '\r\n\r\n').encode('latin-1'))
+    if metodo != 'HEAD':
+        escritor.write(cuerpo)
+
+
+async def _descartar_cuerpo(lector:asyncio.StreamReader, cabeceras:dict):
+    # Las rutas no usan el cuerpo, pero hay que leerlo para que la próxima
+    # petición de la conexión empiece donde corresponde.
+    if 'transfer-encoding' in cabeceras:
+        raise ErrorHTTP(400, 'No se admiten cuerpos con Transfer-Encoding')
+    try:
+        pendiente = int(cabeceras.get('content-length', 0))
+    except ValueError:
+        raise ErrorHTTP(400, 'Content-Length inválido')
+    if pendiente < 0:
+        raise ErrorHTTP(400, 'Content-Length inválido')
+    while pendiente:
+        pendiente -= len(await lector.readexactly(min(pendiente, 1 << 16)))
+
+
+async def _atender(lector:asyncio.StreamReader, escritor:asyncio.StreamWriter):
+    # Atiende las peticiones de una conexión, que se mantiene abierta con HTTP/1.1.
+    # Una petición mal formada se responde y cierra la conexión, porque ya no
+    # se sabe dónde empieza la siguiente.
+    try:
+        while True:
+            # readline lanza ValueError si la línea supera el límite del lector (64 KB).
+            try:
+                linea = await lector.readline()
+            except ValueError:
+                _escribir(escritor, 'GET', 400, _error('Línea de petición demasiado larga'), None, False)
+                break
+            if not linea:
+                break
+            try:
+                metodo, destino, version = linea.decode('latin-1').split()
+            except ValueError:
+                _escribir(escritor, 'GET', 400, _error('Línea de petición inválida'), None, False)
+                break
+
+            cabeceras = {}
+            try:
+                while True:
+                    linea = await lector.readline()
+                    if linea in (b'\r\n', b'\n', b''):
+                        break
+                    nombre, _, valor = linea.decode('latin-1').partition(':')
+                    cabeceras[nombre.strip().lower()] = valor.strip()
+                    if len(cabeceras) > MAXIMO_CABECERAS:
+                        raise ValueError
+            except ValueError:
+                _escribir(escritor, metodo, 431, _error('Cabeceras demasiado grandes'), None, False)
+                break
+
+            try:
+                await _descartar_cuerpo(lector, cabeceras)
+            except ErrorHTTP as error:
+                _escribir(escritor, metodo, error.estado, _error(error.mensaje), None, False)
+                break
+
+            estado, cuerpo, etag = await _procesar(metodo, destino, cabeceras)
+            seguir = version == 'HTTP/1.1' and cabeceras.get('connection', '').lower() != 'close'
+            _escribir(escritor, metodo, estado, cuerpo, etag, seguir)
+            await escritor.drain()
+            if not seguir:
+                break
+        await escritor.drain()
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        escritor.close()
+
+
+async def servir(host:str=HOST, puerto:int=PUERTO):
+    """
+    Atiende la API hasta que se interrumpa el proceso.
+
+    Parámetros:
+        host (str, opcional): Dirección en la que escuchar. Por defecto sólo local.
+        puerto (int, opcional): Puerto TCP. Por defecto PUERTO.
+    """
+    servidor = await asyncio.start_server(_atender, host, puerto)
+    print(f'API escuchando en http://{host}:{puerto}')
+    async with servidor:
+        await servidor.serve_forever()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='API HTTP con los resultados del dashboard.')
+    parser.add_argument('--host', default=HOST, help=f'Dirección en la que escuchar. Por defecto {HOST}.')
+    parser.add_argument('--puerto', type=int, default=PUERTO, help=f'Puerto TCP. Por defecto {PUERTO}.')
+    argumentos = parser.parse_args()
+    try:
+        asyncio.run(servir(argumentos.host, argumentos.puerto))
+    except KeyboardInterrupt:
+        pass
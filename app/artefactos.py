@@ -0,0 +1,161 @@
+"""
+Gráficos estáticos prerenderizados para las secciones de Matplotlib.
+
+Uso:
+    python app/artefactos.py             # genera los gráficos que falten (PNG)
+    python app/artefactos.py --svg       # genera los gráficos en SVG
+
+Cada sección que usa bar_char, hbar_char o scatter_char se dibuja una sola
+vez y se guarda en Data/graficos con un nombre que incluye la huella de su
+tabla y de los parámetros del gráfico. Si cambian los datos o las opciones
+cambia el nombre, así que la app nunca sirve una imagen desactualizada y sólo
+se vuelve a dibujar lo que cambió. Los gráficos de huellas anteriores se
+eliminan con podar().
+"""
+import argparse
+import hashlib
+from pathlib import Path
+
+import pandas as pd
+
+from datos import RUTA_DATOS
+from renderizado import Salida, serializar
+
+RUTA_ARTEFACTOS = RUTA_DATOS / 'graficos'
+FORMATOS = ('png', 'svg')
+
+
+def es_estatico(seccion) -> bool:
+    """Indica si el gráfico de la sección sale de una función de visualizaciones.py."""
+    return isinstance(seccion.grafico, str)
+
+
+def huella(seccion, df:pd.DataFrame) -> str:
+    """
+    Calcula la huella del contenido de un gráfico: tabla, función y opciones.
+
+    Parámetros:
+        seccion (Seccion): Sección del gráfico.
+        df (DataFrame): Tabla de la sección.
+
+    Retorna:
+        str: Hash sha256 en hexadecimal.
+    """
+    sha = hashlib.sha256()
+    sha.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    sha.update(repr(list(df.columns)).encode())
+    sha.update(repr((seccion.grafico, seccion.filas_grafico, sorted(seccion.opciones.items()))).encode())
+    return sha.hexdigest()
+
+
+def _rutas(seccion, df):
+    codigo = huella(seccion, df)[:16]
+    return [RUTA_ARTEFACTOS / f'{seccion.clave}-{codigo}.{formato}' for formato in FORMATOS]
+
+
+def leer_artefacto(seccion, df:pd.DataFrame):
+    """
+    Devuelve el gráfico prerenderizado de una sección si existe y está vigente.
+
+    Parámetros:
+        seccion (Seccion): Sección del gráfico.
+        df (DataFrame): Tabla actual de la sección.
+
+    Retorna:
+        Salida o None: Imagen guardada, o None si no hay una para estos datos.
+    """
+    if not es_estatico(seccion) or not RUTA_ARTEFACTOS.exists():
+        return None
+
+    for ruta in _rutas(seccion, df):
+        if ruta.exists():
+            if ruta.suffix == '.svg':
+                return Salida('svg', ruta.read_text(encoding='utf-8'))
+            return Salida('png', ruta.read_bytes())
+    return None
+
+
+def construir_seccion(seccion, formato:str='png') -> list:
+    """
+    Genera el gráfico estático de una sección si no tiene uno vigente.
+
+    Parámetros:
+        seccion (Seccion): Sección cuyo gráfico sale de visualizaciones.py.
+        formato (str, opcional): 'png' (comprimido) o 'svg'. Por defecto 'png'.
+
+    Retorna:
+        list: Rutas vigentes del gráfico de la sección.
+    """
+    RUTA_ARTEFACTOS.mkdir(exist_ok=True)
+    df = seccion.tabla()
+    rutas = _rutas(seccion, df)
+    existentes = [ruta for ruta in rutas if ruta.exists()]
+    if existentes:
+        return existentes
+
+    ruta = rutas[FORMATOS.index(formato)]
+    salida = serializar(seccion.figura(df, motor='matplotlib'), formato=formato, comprimir=True)
+    temporal = ruta.with_name(f'tmp-{ruta.name}')
+    if formato == 'svg':
+        temporal.write_text(salida.contenido, encoding='utf-8')
+    else:
+        temporal.write_bytes(salida.contenido)
+    temporal.replace(ruta)
+    print(f'{seccion.clave} -> {ruta.name} ({salida.tamano // 1024} KB)')
+    return [ruta]
+
+
+def construir(formato:str='png') -> list:
+    """
+    Genera los gráficos estáticos de todas las secciones que no estén vigentes.
+
+    Las versiones anteriores de cada gráfico se eliminan.
+
+    Parámetros:
+        formato (str, opcional): 'png' (comprimido) o 'svg'. Por defecto 'png'.
+
+    Retorna:
+        list: Rutas de los gráficos vigentes.
+    """
+    from secciones import SECCIONES
+
+    RUTA_ARTEFACTOS.mkdir(exist_ok=True)
+    vigentes = []
+    for seccion in SECCIONES.values():
+        if es_estatico(seccion):
+            vigentes.extend(construir_seccion(seccion, formato))
+
+    podar(vigentes)
+    return vigentes
+
+
+def podar(vigentes:list, claves=None) -> list:
+    """
+    Elimina los gráficos guardados que no están entre los vigentes.
+
+    Parámetros:
+        vigentes (list): Rutas de los gráficos vigentes, como las que devuelve construir_seccion.
+        claves (iterable, opcional): Secciones cuyos gráficos se revisan. Por
+            defecto todos los archivos de la carpeta.
+
+    Retorna:
+        list: Rutas eliminadas.
+    """
+    if not RUTA_ARTEFACTOS.exists():
+        return []
+    vigentes = {Path(ruta) for ruta in vigentes}
+    claves = None if claves is None else set(claves)
+    eliminadas = []
+    for ruta in RUTA_ARTEFACTOS.iterdir():
+        # Los archivos se llaman <clave>-<huella>.<formato>.
+        if ruta in vigentes or (claves is not None and ruta.stem.rsplit('-', 1)[0] not in claves):
+            continue
+        ruta.unlink(missing_ok=True)
+        eliminadas.append(ruta)
+    return eliminadas
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Prerenderiza los gráficos estáticos del dashboard.')
+    parser.add_argument('--svg', action='store_true', help='Genera SVG en lugar de PNG.')
+    construir('svg' if parser.parse_args().svg else 'png')
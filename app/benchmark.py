@@ -0,0 +1,342 @@
+"""
+Benchmark de carga, agregación y renderizado de cada sección del dashboard.
+
+Uso:
+    python app/benchmark.py                          # escalas 1, 10 y 100
+    python app/benchmark.py --escalas 1 10 --repeticiones 3
+    python app/benchmark.py --sintetico                # datos generados en lugar de replicados
+    python app/benchmark.py --motor webgl              # gráficos de visualizaciones.py con Plotly
+    python app/benchmark.py --comparar benchmarks/anterior.json
+
+Cada escala se mide en un proceso aparte, fuera de Streamlit, sobre una copia
+de los datos generada por sinteticos.escalar, o por sinteticos.generar con
+--sintetico (DATA_INSIDER_DATOS apunta a esa carpeta, así que snapshots,
+particiones y agregados también quedan aislados). Para cada dataset se mide
+la carga y para cada sección la tabla (consulta o datos), la construcción del
+gráfico y su serialización, con las caches vaciadas antes de cada repetición.
+Se registra el tiempo (mínimo y mediana), el pico de memoria y los bloques de
+memoria que quedan asignados, medidos con tracemalloc en una corrida aparte
+para no alterar los tiempos.
+
+Además se mide con `python -X importtime` lo que cuesta importar la app y lo
+que importa cada página la primera vez que se dibuja, agrupado por paquete,
+para detectar bibliotecas pesadas que se cargan sin hacer falta.
+
+Los resultados se guardan como JSON en benchmarks/<commit>.json; con
+--comparar se listan las mediciones que empeoraron respecto de otro archivo.
+"""
+import argparse
+import ast
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+RUTA_BENCHMARKS = RAIZ / 'benchmarks'
+ESCALAS = (1, 10, 100)
+TOLERANCIA = 1.2
+MARCA_PAGINA = '-- pagina --'
+
+
+def _limpiar():
+    # Vacía las caches en memoria de los datos y de todo lo que se construye
+    # a partir de ellos, y las tablas compartidas entre procesos (vistas y
+    # celdas del cubo), para que cada corrida las vuelva a calcular. Los
+    # snapshots y las particiones se conservan: son parte de la preparación.
+    import acciones
+    import agregados
+    import compartidos
+    import cubo
+    import datos
+    import indices
+    import secciones
+
+    datos._cache.clear()
+    acciones._diarios.clear()
+    agregados._memoria.clear()
+    cubo._cache.clear()
+    indices._cache.clear()
+    secciones._resultados.vaciar()
+    for ruta in compartidos.RUTA_COMPARTIDOS.glob('*.arrow'):
+        ruta.unlink(missing_ok=True)
+
+
+def medir(funcion, repeticiones:int=5) -> dict:
+    """
+    Mide una función con las caches de datos vacías.
+
+    Parámetros:
+        funcion (Callable): Función sin argumentos a medir.
+        repeticiones (int, opcional): Corridas cronometradas. Por defecto 5.
+
+    Retorna:
+        dict: Segundos (mínimo y mediana), pico de memoria en bytes y bloques
+        de memoria que siguen asignados al terminar.
+    """
+    tiempos = []
+    for _ in range(repeticiones):
+        _limpiar()
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+
+    _limpiar()
+    tracemalloc.start()
+    antes = tracemalloc.take_snapshot()
+    funcion()
+    despues = tracemalloc.take_snapshot()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    bloques = sum(stat.count_diff for stat in despues.compare_to(antes, 'filename') if stat.count_diff > 0)
+
+    return {
+        'segundos': min(tiempos),
+        'mediana': statistics.median(tiempos),
+        'pico_bytes': pico,
+        'bloques': bloques,
+    }
+
+
+def medir_escala(repeticiones:int=5) -> dict:
+    """
+    Mide todas las etapas sobre la carpeta de datos configurada.
+
+    Parámetros:
+        repeticiones (int, opcional): Corridas cronometradas por etapa. Por defecto 5.
+
+    Retorna:
+        dict: Mediciones de preparación, cargas y secciones.
+    """
+    import particiones
+    import snapshots
+    from consultas import CONSULTAS, ejecutar
+    from datos import DATASETS, VISTAS, cargar
+    from renderizado import serializar
+    from secciones import SECCIONES
+
+    resultado = {'preparacion': {}, 'cargas': {}, 'secciones': {}}
+
+    inicio = time.perf_counter()
+    snapshots.construir()
+    resultado['preparacion']['snapshots'] = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    particiones.construir()
+    resultado['preparacion']['particiones'] = time.perf_counter() - inicio
+
+    for nombre in [*DATASETS, *VISTAS]:
+        resultado['cargas'][nombre] = medir(lambda: cargar(nombre), repeticiones)
+        resultado['cargas'][nombre]['filas'] = len(cargar(nombre))
+
+    for clave, seccion in SECCIONES.items():
+        def tabla():
+            if seccion.datos is not None:
+                df = seccion.datos()
+            else:
+                df = ejecutar(CONSULTAS[seccion.consulta or clave])
+            return seccion.ajuste(df) if seccion.ajuste is not None else df
+
+        medidas = {'tabla': medir(tabla, repeticiones)}
+        df = tabla()
+        if seccion.grafico is not None:
+            medidas['grafico'] = medir(lambda: seccion.figura(df), repeticiones)
+            medidas['render'] = medir(lambda: serializar(seccion.figura(df)), repeticiones)
+            medidas['render']['bytes'] = serializar(seccion.figura(df)).tamano
+        resultado['secciones'][clave] = medidas
+
+    return resultado
+
+
+def _importaciones_app() -> str:
+    # Las mismas importaciones que hace st_data_science.py al arrancar.
+    arbol = ast.parse((RAIZ / 'app' / 'st_data_science.py').read_text(encoding='utf-8'))
+    return '\n'.join(ast.unparse(nodo) for nodo in arbol.body if isinstance(nodo, (ast.Import, ast.ImportFrom)))
+
+
+def _resumir_importaciones(lineas:list) -> dict:
+    # Cada línea de -X importtime es 'import time: propio | acumulado | módulo'.
+    paquetes = Counter()
+    for linea in lineas:
+        if not linea.startswith('import time:') or '[us]' in linea:
+            continue
+        propio, _, modulo = linea.removeprefix('import time:').split('|')
+        paquetes[modulo.strip().split('.')[0]] += int(propio) / 1e6
+    return {
+        'segundos': sum(paquetes.values()),
+        'paquetes': {paquete: segundos for paquete, segundos in paquetes.most_common() if segundos >= 0.001},
+    }
+
+
+def medir_importaciones(entorno:dict=None) -> dict:
+    """
+    Mide con -X importtime el arranque de la app y la primera visita a cada página.
+
+    Cada página se calcula en un proceso nuevo después de las importaciones de
+    la app, así que lo que se importa durante el cálculo es lo que esa página
+    agrega al arranque.
+
+    Parámetros:
+        entorno (dict, opcional): Variables de entorno de los procesos. Por defecto las actuales.
+
+    Retorna:
+        dict: Segundos totales y por paquete del arranque y de cada página.
+    """
+    from secciones import PAGINAS
+
+    arranque = _importaciones_app()
+    resultado = {'paginas': {}}
+    for pagina in PAGINAS:
+        codigo = '\n'.join([
+            arranque,
+            'import sys',
+            'from secciones import calcular, secciones_de',
+            f'sys.stderr.write({MARCA_PAGINA!r} + "\\n")',
+            f'for seccion in secciones_de({pagina!r}): calcular(seccion)',
+        ])
+        proceso = subprocess.run([sys.executable, '-X', 'importtime', '-c', codigo], cwd=RAIZ / 'app',
+                                 env=entorno, capture_output=True, text=True, check=True)
+        lineas = proceso.stderr.splitlines()
+        corte = lineas.index(MARCA_PAGINA)
+        resultado.setdefault('arranque', _resumir_importaciones(lineas[:corte]))
+        resultado['paginas'][pagina] = _resumir_importaciones(lineas[corte + 1:])
+    return resultado
+
+
+def _commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=RAIZ,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'sin-commit'
+
+
+def ejecutar_benchmark(escalas=ESCALAS, repeticiones:int=5, sintetico:bool=False, motor:str=None) -> dict:
+    """
+    Mide cada escala en un proceso aparte sobre datos sintéticos.
+
+    Parámetros:
+        escalas (tuple, opcional): Factores de filas. Por defecto (1, 10, 100).
+        repeticiones (int, opcional): Corridas cronometradas por etapa. Por defecto 5.
+        sintetico (bool, opcional): Usa sinteticos.generar (2000 empresas por año
+            y 5 acciones por unidad de escala) en lugar de replicar los datos de
+            ejemplo. Por defecto False.
+        motor (str, opcional): Motor de los gráficos de visualizaciones.py
+            (ver visualizaciones.MOTORES). Por defecto el de DATA_INSIDER_MOTOR.
+
+    Retorna:
+        dict: Metadatos de la corrida y mediciones por escala.
+    """
+    import pandas as pd
+
+    from sinteticos import escalar, generar
+    from visualizaciones import MOTOR
+
+    motor = motor or MOTOR
+
+    resultados = {
+        'commit': _commit(),
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'repeticiones': repeticiones,
+        'datos': 'generados' if sintetico else 'replicados',
+        'motor': motor,
+        'escalas': {},
+    }
+
+    for escala in escalas:
+        with tempfile.TemporaryDirectory(prefix=f'benchmark-{escala}x-') as carpeta:
+            if sintetico:
+                generar(carpeta, empresas=2000 * escala, simbolos=5 * escala)
+            else:
+                escalar(carpeta, escala)
+            entorno = {**os.environ, 'DATA_INSIDER_DATOS': carpeta, 'DATA_INSIDER_MOTOR': motor, 'MPLBACKEND': 'Agg'}
+            proceso = subprocess.run(
+                [sys.executable, __file__, '--medir', '--repeticiones', str(repeticiones)],
+                env=entorno, capture_output=True, text=True, check=True)
+            resultados['escalas'][str(escala)] = json.loads(proceso.stdout.splitlines()[-1])
+            if 'importaciones' not in resultados:
+                resultados['importaciones'] = medir_importaciones(entorno)
+        print(f'escala {escala}x medida', file=sys.stderr)
+
+    return resultados
+
+
+def _aplanar(resultados:dict) -> dict:
+    planos = {}
+    for escala, medidas in resultados['escalas'].items():
+        for nombre, medida in medidas['cargas'].items():
+            planos[f'{escala}x carga {nombre}'] = medida
+        for clave, etapas in medidas['secciones'].items():
+            for etapa, medida in etapas.items():
+                planos[f'{escala}x {clave} {etapa}'] = medida
+    return planos
+
+
+def comparar(anterior:dict, actual:dict, tolerancia:float=TOLERANCIA) -> list:
+    """
+    Lista las mediciones que empeoraron entre dos corridas.
+
+    Parámetros:
+        anterior (dict): Resultados de referencia.
+        actual (dict): Resultados nuevos.
+        tolerancia (float, opcional): Cociente a partir del cual se considera
+            una regresión. Por defecto 1.2 (20 % peor).
+
+    Retorna:
+        list: Tuplas (medición, métrica, valor anterior, valor actual).
+    """
+    previas = _aplanar(anterior)
+    regresiones = []
+    for nombre, medida in _aplanar(actual).items():
+        previa = previas.get(nombre)
+        if previa is None:
+            continue
+        for metrica in ('mediana', 'pico_bytes'):
+            if previa[metrica] and medida[metrica] / previa[metrica] > tolerancia:
+                regresiones.append((nombre, metrica, previa[metrica], medida[metrica]))
+    return regresiones
+
+
+if __name__ == '__main__':
+    from visualizaciones import MOTORES
+
+    parser = argparse.ArgumentParser(description='Mide carga, agregación y renderizado de cada sección.')
+    parser.add_argument('--escalas', type=int, nargs='+', default=list(ESCALAS), help='Factores de filas.')
+    parser.add_argument('--repeticiones', type=int, default=5, help='Corridas cronometradas por etapa.')
+    parser.add_argument('--sintetico', action='store_true', help='Usa datos generados en lugar de replicados.')
+    parser.add_argument('--motor', choices=MOTORES,
+                        help='Motor de los gráficos de visualizaciones.py.')
+    parser.add_argument('--salida', help='Archivo JSON de resultados. Por defecto benchmarks/<commit>.json.')
+    parser.add_argument('--comparar', help='Resultados anteriores contra los que buscar regresiones.')
+    parser.add_argument('--medir', action='store_true', help=argparse.SUPPRESS)
+    argumentos = parser.parse_args()
+
+    if argumentos.medir:
+        print(json.dumps(medir_escala(argumentos.repeticiones)))
+        sys.exit()
+
+    resultados = ejecutar_benchmark(argumentos.escalas, argumentos.repeticiones, argumentos.sintetico,
+                                    argumentos.motor)
+    salida = Path(argumentos.salida) if argumentos.salida else RUTA_BENCHMARKS / f'{resultados["commit"]}.json'
+    salida.parent.mkdir(parents=True, exist_ok=True)
+    salida.write_text(json.dumps(resultados, indent=2), encoding='utf-8')
+    print(f'Resultados en {salida}')
+
+    importaciones = resultados['importaciones']
+    for nombre, medida in [('arranque', importaciones['arranque']), *importaciones['paginas'].items()]:
+        paquetes = ', '.join(f'{paquete} {segundos:.2f}s' for paquete, segundos in list(medida['paquetes'].items())[:5])
+        print(f'importaciones {nombre}: {medida["segundos"]:.2f}s ({paquetes})')
+
+    if argumentos.comparar:
+        anterior = json.loads(Path(argumentos.comparar).read_text(encoding='utf-8'))
+        for nombre, metrica, previo, actual in comparar(anterior, resultados):
+            print(f'{nombre}: {metrica} {previo:.4g} -> {actual:.4g}')
@@ -0,0 +1,134 @@
+"""
+Tablas compartidas entre los procesos del servidor mediante archivos Arrow.
+
+Con varios procesos de Streamlit detrás de un balanceador, cada uno leería
+su propia copia de los CSV y construiría sus propias vistas, y la memoria
+crecería con la cantidad de procesos. En cambio, el primer proceso que
+necesita una tabla la publica en Data/compartidos como archivo Arrow IPC sin
+compresión, con la huella de sus datos en el nombre, y todos los procesos
+(incluido el que la publicó) la abren con memory-map. No todas las columnas
+de los frames resultantes se comparten:
+
+- Las numéricas sin nulos apuntan directamente a las páginas del archivo,
+  que el sistema operativo comparte entre procesos.
+- Las de texto también, porque con pandas >= 3 el tipo str guarda los
+  buffers de Arrow tal cual en lugar de crear objetos de Python.
+- Las categóricas copian sus códigos en cada proceso, un byte por fila
+  (el diccionario de valores es chico).
+- Las numéricas con nulos se copian en cada proceso, al convertir los nulos
+  de Arrow en NaN.
+
+Los datasets de la app no tienen nulos en sus columnas numéricas, así que lo
+único que se repite por proceso son los códigos de las categóricas.
+
+Mientras un proceso publica una tabla, los demás que la piden esperan con un
+bloqueo de archivo (fcntl) en lugar de construirla también. En sistemas sin
+fcntl cada proceso la publica por su cuenta, con el mismo resultado.
+
+Los datasets con snapshot vigente (ver snapshots.py) ya se leen con
+memory-map; este módulo cubre los que no lo tienen y las vistas.
+"""
+import os
+from contextlib import contextmanager
+from typing import Callable
+
+import pandas as pd
+import pyarrow as pa
+
+from datos import RUTA_DATOS
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+RUTA_COMPARTIDOS = RUTA_DATOS / 'compartidos'
+
+
+def _ruta(nombre:str, huella:str):
+    return RUTA_COMPARTIDOS / f'{nombre}-{huella[:16]}.arrow'
+
+
+@contextmanager
+def _bloqueo(nombre:str):
+    # Bloqueo exclusivo entre procesos mientras se publica una tabla.
+    if fcntl is None:
+        yield
+        return
+    with open(RUTA_COMPARTIDOS / f'{nombre}.lock', 'w') as archivo:
+        fcntl.flock(archivo, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(archivo, fcntl.LOCK_UN)
+
+
+def adjuntar(nombre:str, huella:str):
+    """
+    Abre con memory-map la versión publicada de una tabla.
+
+    Parámetros:
+        nombre (str): Nombre del dataset o vista.
+        huella (str): Huella de la versión de los datos.
+
+    Retorna:
+        DataFrame o None: Tabla publicada, o None si no existe esa versión.
+    """
+    try:
+        with pa.memory_map(str(_ruta(nombre, huella))) as fuente:
+            tabla = pa.ipc.open_file(fuente).read_all()
+    except (FileNotFoundError, pa.ArrowInvalid):
+        return None
+    return tabla.to_pandas(split_blocks=True)
+
+
+def publicar(nombre:str, huella:str, df:pd.DataFrame):
+    """
+    Escribe una tabla como archivo Arrow y elimina sus versiones anteriores.
+
+    Parámetros:
+        nombre (str): Nombre del dataset o vista.
+        huella (str): Huella de la versión de los datos.
+        df (DataFrame): Tabla a publicar.
+    """
+    ruta = _ruta(nombre, huella)
+    tabla = pa.Table.from_pandas(df, preserve_index=False)
+    temporal = ruta.with_suffix(f'.{os.getpid()}.tmp')
+    with pa.OSFile(str(temporal), 'wb') as destino:
+        with pa.ipc.new_file(destino, tabla.schema) as escritor:
+            escritor.write_table(tabla)
+    os.replace(temporal, ruta)
+
+    for anterior in RUTA_COMPARTIDOS.glob(f'{nombre}-*.arrow'):
+        if anterior != ruta:
+            try:
+                anterior.unlink()
+            except OSError:
+                # En Windows no se puede borrar un archivo que otro proceso tiene mapeado.
+                pass
+
+
+def obtener(nombre:str, huella:str, construir:Callable) -> pd.DataFrame:
+    """
+    Devuelve una tabla compartida, publicándola si ningún proceso lo hizo todavía.
+
+    Parámetros:
+        nombre (str): Nombre del dataset o vista.
+        huella (str): Huella de la versión de los datos.
+        construir (Callable): Función sin argumentos que produce la tabla; sólo
+            se llama en el proceso que la publica.
+
+    Retorna:
+        DataFrame: Tabla abierta con memory-map, de solo lectura.
+    """
+    df = adjuntar(nombre, huella)
+    if df is not None:
+        return df
+
+    RUTA_COMPARTIDOS.mkdir(parents=True, exist_ok=True)
+    with _bloqueo(nombre):
+        df = adjuntar(nombre, huella)
+        if df is None:
+            publicar(nombre, huella, construir())
+            df = adjuntar(nombre, huella)
+    return df
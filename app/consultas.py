@@ -0,0 +1,270 @@
+"""
+Catálogo declarativo de las consultas de los cuestionarios.
+
+Cada pregunta del dashboard se describe como una Consulta (filtro, claves de
+agrupación, agregación, orden y cantidad de filas) en lugar de escribir el
+groupby a mano. Así el mismo catálogo lo usa la app para consultar resultados
+y agregados.py para materializarlos fuera de línea.
+"""
+import operator
+from dataclasses import dataclass
+
+import pandas as pd
+
+from datos import cargar
+from particiones import consultar
+from seleccion import por_grupo
+
+OPERADORES = {
+    '==': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+    'in': lambda serie, valores: serie.isin(valores),
+}
+
+TECNOLOGIA = ('Telecommunications Services', 'Technology Hardware & Equipment')
+HOTELES = 'Hotels, Restaurants & Leisure'
+PETROLERAS = 'Oil & Gas Operations'
+MARGEN = 'Margen_de_rentabilidad (%)'
+
+
+@dataclass(frozen=True)
+class Consulta:
+    """
+    Describe una consulta sobre un dataset registrado.
+
+    Atributos:
+        nombre (str): Identificador de la consulta en el catálogo.
+        dataset (str): Nombre del dataset en datos.DATASETS.
+        filtros (tuple): Condiciones (columna, operador, valor) combinadas con AND.
+        grupos (tuple): Columnas de agrupación. Vacío para una selección de filas.
+        columnas (tuple): Columnas a agregar o seleccionar.
+        agregacion (str): Función de agregación de pandas, o una de SELECCIONES
+            para quedarse con filas enteras de cada grupo (ver seleccion.py):
+            'idxmin'/'idxmax' conservan la fila completa del mínimo/máximo y
+            'nsmallest'/'nlargest' las columnas pedidas de las k filas con
+            menor/mayor métrica.
+        orden (str): Columna por la que ordenar el resultado.
+        ascendente (bool): Sentido del orden. Por defecto descendente.
+        n (int): Cantidad de filas a conservar tras ordenar.
+        redondeo (int): Decimales a los que redondear el resultado agregado.
+        umbral (tuple): Condición (columna, operador, valor) sobre el resultado final.
+        metrica (str): Columna por la que se eligen las filas en SELECCIONES.
+            Por defecto la última de columnas.
+        k (int): Filas por grupo en 'nsmallest'/'nlargest'. Por defecto 1.
+    """
+    nombre: str
+    dataset: str
+    filtros: tuple = ()
+    grupos: tuple = ()
+    columnas: tuple = ()
+    agregacion: str = None
+    orden: str = None
+    ascendente: bool = False
+    n: int = None
+    redondeo: int = None
+    umbral: tuple = None
+    metrica: str = None
+    k: int = 1
+
+
+def _mascara(df:pd.DataFrame, filtros:tuple):
+    mascara = None
+    for columna, operador, valor in filtros:
+        condicion = OPERADORES[operador](df[columna], valor)
+        mascara = condicion if mascara is None else mascara & condicion
+    return mascara
+
+
+def _filas(consulta:Consulta, df:pd.DataFrame=None) -> pd.DataFrame:
+    # Sin un frame explícito se intenta leer sólo lo necesario de las
+    # particiones (ver particiones.py), con los filtros aplicados al leer.
+    if df is None:
+        columnas = None
+        if consulta.agregacion not in ('idxmin', 'idxmax'):
+            columnas = list(dict.fromkeys([*consulta.grupos, *consulta.columnas, *_metrica(consulta),
+                                           *(filtro[0] for filtro in consulta.filtros)]))
+        filtradas = consultar(consulta.dataset, columnas, consulta.filtros)
+        if filtradas is not None:
+            return filtradas
+        df = cargar(consulta.dataset)
+
+    if consulta.filtros:
+        df = df.loc[_mascara(df, consulta.filtros)]
+    return df
+
+
+# Agregaciones que eligen filas enteras de cada grupo en lugar de resumirlas.
+SELECCIONES = ('idxmin', 'idxmax', 'nsmallest', 'nlargest')
+
+
+def _metrica(consulta:Consulta) -> list:
+    if consulta.agregacion not in SELECCIONES:
+        return []
+    return [consulta.metrica or consulta.columnas[-1]]
+
+
+# Agregaciones cuyo resultado se puede combinar a partir de resultados parciales.
+COMBINABLES = {'count': 'sum', 'sum': 'sum', 'max': 'max', 'min': 'min'}
+
+
+def es_combinable(consulta:Consulta) -> bool:
+    """Indica si la consulta se puede actualizar sumando el resultado de filas nuevas."""
+    # Las k mejores de todas las filas están entre las k mejores de cada parte.
+    return consulta.agregacion in COMBINABLES or consulta.agregacion in ('nsmallest', 'nlargest')
+
+
+def parcial(consulta:Consulta, df:pd.DataFrame=None) -> pd.DataFrame:
+    """
+    Aplica el filtro y la agregación de una consulta, sin ordenar ni recortar.
+
+    Parámetros:
+        consulta (Consulta): Consulta a ejecutar.
+        df (DataFrame, opcional): Datos sobre los que ejecutarla. Por defecto
+            se usa el dataset declarado en la consulta.
+
+    Retorna:
+        DataFrame: Resultado agregado completo, indexado por las claves de agrupación.
+    """
+    df = _filas(consulta, df)
+    columnas = list(consulta.columnas)
+
+    if consulta.agregacion in SELECCIONES:
+        mayores = consulta.agregacion in ('idxmax', 'nlargest')
+        k = consulta.k if consulta.agregacion in ('nsmallest', 'nlargest') else 1
+        elegidas = por_grupo(df, consulta.grupos, *_metrica(consulta), k=k, mayores=mayores)
+        if consulta.agregacion in ('idxmin', 'idxmax'):
+            return elegidas
+        return elegidas.set_index(list(consulta.grupos))[columnas]
+    if consulta.agregacion:
+        return df.groupby(list(consulta.grupos), observed=True)[columnas].agg(consulta.agregacion)
+    return df[columnas]
+
+
+def combinar(consulta:Consulta, *parciales:pd.DataFrame) -> pd.DataFrame:
+    """
+    Combina resultados parciales de una consulta combinable.
+
+    Parámetros:
+        consulta (Consulta): Consulta combinable (ver es_combinable).
+        *parciales (DataFrame): Resultados de parcial sobre conjuntos de filas disjuntos.
+
+    Retorna:
+        DataFrame: Resultado parcial equivalente al de todas las filas juntas.
+    """
+    unidos = pd.concat(parciales)
+    if consulta.agregacion in ('nsmallest', 'nlargest'):
+        elegidas = por_grupo(unidos.reset_index(), consulta.grupos, *_metrica(consulta),
+                             k=consulta.k, mayores=consulta.agregacion == 'nlargest')
+        return elegidas.set_index(list(consulta.grupos))
+    return unidos.groupby(level=list(range(unidos.index.nlevels)), observed=True).agg(COMBINABLES[consulta.agregacion])
+
+
+def finalizar(consulta:Consulta, resultado:pd.DataFrame) -> pd.DataFrame:
+    """
+    Aplica el redondeo, el orden, el recorte y el umbral a un resultado parcial.
+
+    Parámetros:
+        consulta (Consulta): Consulta a la que pertenece el resultado.
+        resultado (DataFrame): Resultado de parcial o de combinar.
+
+    Retorna:
+        DataFrame: Resultado final con índice numérico.
+    """
+    if consulta.redondeo is not None:
+        resultado = resultado.round(consulta.redondeo)
+    if consulta.orden and consulta.n and pd.api.types.is_numeric_dtype(resultado[consulta.orden]):
+        # Selección parcial de las n primeras en lugar de ordenar todo el resultado.
+        elegir = resultado.nsmallest if consulta.ascendente else resultado.nlargest
+        resultado = elegir(consulta.n, consulta.orden)
+    elif consulta.orden:
+        resultado = resultado.sort_values(by=consulta.orden, ascending=consulta.ascendente)
+    if consulta.n:
+        resultado = resultado.head(consulta.n)
+
+    resultado = resultado.reset_index(drop=not consulta.agregacion or consulta.agregacion in ('idxmin', 'idxmax'))
+
+    if consulta.umbral:
+        resultado = resultado.loc[_mascara(resultado, (consulta.umbral,))].reset_index(drop=True)
+
+    return resultado
+
+
+def ejecutar(consulta:Consulta, df:pd.DataFrame=None) -> pd.DataFrame:
+    """
+    Ejecuta una consulta del catálogo.
+
+    Parámetros:
+        consulta (Consulta): Consulta a ejecutar.
+        df (DataFrame, opcional): Datos sobre los que ejecutarla. Por defecto
+            se usa el dataset declarado en la consulta.
+
+    Retorna:
+        DataFrame: Resultado de la consulta con índice numérico.
+    """
+    return finalizar(consulta, parcial(consulta, df))
+
+
+CONSULTAS = {
+    consulta.nombre: consulta for consulta in [
+        # Cuestionario A (Forbes 2022)
+        Consulta('top_paises_con_mas_empresas', 'forbes_2022',
+                 grupos=('Pais', 'Codigo'), columnas=('Empresa',), agregacion='count',
+                 orden='Empresa', n=10),
+        Consulta('top_paises_empresas_tech', 'forbes_2022',
+                 filtros=(('Industria', 'in', TECNOLOGIA),),
+                 grupos=('Pais', 'Codigo'), columnas=('Empresa',), agregacion='count',
+                 orden='Empresa', n=4),
+        Consulta('top_empresas_margen_perdida', 'forbes_2022',
+                 filtros=(('Industria', '==', HOTELES),),
+                 grupos=('Empresa',), columnas=(MARGEN,), agregacion='mean',
+                 orden=MARGEN, ascendente=True, n=5),
+        Consulta('margen_rentabilidad_Asia', 'forbes_2022',
+                 filtros=(('Industria', '==', PETROLERAS), ('Continente', '==', 'Asia')),
+                 grupos=('Empresa',), columnas=(MARGEN,), agregacion='mean',
+                 orden=MARGEN, n=7),
+        Consulta('empresas_NA_top_rentabilidad', 'forbes_2022',
+                 filtros=(('Continente', '==', 'North America'),),
+                 grupos=('Industria',), columnas=('Empresa', MARGEN), agregacion='nlargest',
+                 orden=MARGEN),
+        Consulta('empresas_EU_top_perdidas', 'forbes_2022',
+                 filtros=(('Continente', '==', 'Europe'), ('Industria', '!=', 'Banking')),
+                 grupos=('Industria',), columnas=('Empresa', 'Ganancias'), agregacion='nsmallest',
+                 orden='Ganancias', ascendente=True),
+        Consulta('bancos_dist_activos_ingresos', 'forbes_2022',
+                 filtros=(('Industria', '==', 'Banking'), ('Activos', '<=', 300000)),
+                 columnas=('Ingresos', 'Activos', 'Ganancias')),
+
+        # Cuestionario B (Forbes 2015-2022)
+        Consulta('top_paises_empresas_15_22', 'forbes_2015_2022',
+                 grupos=('Pais', 'Codigo'), columnas=('Empresa',), agregacion='count',
+                 orden='Empresa', n=10),
+        Consulta('top_paises_empresas_tech_15_22', 'forbes_2015_2022',
+                 filtros=(('Industria', 'in', TECNOLOGIA),),
+                 grupos=('Pais', 'Codigo'), columnas=('Empresa',), agregacion='count',
+                 orden='Empresa', n=5),
+        Consulta('top_perdidas_empresas_HRE', 'forbes_2015_2022',
+                 filtros=(('Industria', '==', HOTELES),),
+                 grupos=('Empresa',), columnas=('Ganancias',), agregacion='sum',
+                 orden='Ganancias', ascendente=True, n=10),
+        Consulta('top_empresas_ROA', 'forbes_2015_2022',
+                 filtros=(('Continente', 'in', ('North America', 'South America')),
+                          ('Industria', '==', PETROLERAS)),
+                 grupos=('Empresa',), columnas=('ROA (%)',), agregacion='mean',
+                 redondeo=2, orden='ROA (%)', umbral=('ROA (%)', '>=', 20)),
+        Consulta('empresas_EU_top_rentabilidad', 'forbes_2015_2022',
+                 filtros=(('Continente', '==', 'Europe'),),
+                 grupos=('Industria',), columnas=('Empresa', MARGEN), agregacion='nlargest',
+                 orden=MARGEN),
+        Consulta('empresas_NA_top_perdidas', 'forbes_2015_2022',
+                 filtros=(('Continente', '==', 'North America'),),
+                 grupos=('Industria',), columnas=('Empresa', 'Ganancias'), agregacion='nsmallest',
+                 orden='Ganancias', ascendente=True, n=10),
+        Consulta('bancos_dist_activos_ingresos_15_22', 'forbes_2015_2022',
+                 filtros=(('Industria', '==', 'Banking'), ('Activos', '<=', 150000)),
+                 columnas=('Ingresos', 'Activos', 'Ganancias')),
+    ]
+}
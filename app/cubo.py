@@ -0,0 +1,361 @@
+"""
+Cubo OLAP en memoria de Forbes 2015-2022.
+
+Las preguntas que agrupan el histórico de Forbes por industria, país o
+continente y año recorren todas las filas en cada consulta. El cubo las
+precalcula una sola vez por versión de los datos: arreglos densos de NumPy
+indexados por los códigos de Industria × Pais × Ano, con la cantidad de
+empresas y la suma de cada medida en cada celda. El continente no es un eje
+propio: cada país pertenece a un solo continente, así que se obtiene sumando
+los países de cada uno.
+
+Con unas decenas de industrias, países y años el cubo ocupa pocos cientos de
+KB, y cualquier corte o agregación es una suma sobre esos arreglos, sin
+volver a leer las filas.
+
+Las celdas no vacías se publican como tabla compartida (ver compartidos.py),
+así que los demás procesos arman el cubo sin cargar Forbes. Al ingerir años
+nuevos (ver ingesta.py) las celdas de las filas nuevas se suman a las de la
+versión anterior en lugar de recorrer todo el histórico.
+"""
+import hashlib
+import threading
+
+import numpy as np
+import pandas as pd
+
+import compartidos
+import diagnostico
+from datos import VISTAS, cargar, firma
+
+DIMENSIONES = ('Industria', 'Pais', 'Continente', 'Ano')
+MEDIDAS = ('Ingresos', 'Ganancias', 'Activos', 'Valor_de_mercado', 'Empleados')
+# Medida que cuenta las empresas de cada celda.
+CONTEO = 'Empresas'
+
+# Los datos de empleados salen de la vista que los une con Forbes (ver datos.py).
+FUENTES = ('forbes_2015_2022', 'forbes_empleados')
+# Claves de cada celda; el continente acompaña al país.
+CLAVES = ['Industria', 'Pais', 'Continente', 'Ano']
+
+_bloqueo = threading.Lock()
+_cache = {}
+
+
+class Cubo:
+    """
+    Cantidad de empresas y sumas de las medidas por Industria × Pais × Ano.
+
+    Atributos:
+        categorias (dict): Etiquetas de cada dimensión, en el orden de sus códigos.
+        continente_de_pais (ndarray): Código de continente de cada país.
+        conteo (ndarray): Empresas por celda, de forma (industrias, países, años).
+        sumas (dict): Suma de cada medida por celda, con la misma forma.
+    """
+
+    def __init__(self, tabla:pd.DataFrame):
+        self.categorias = {
+            'Industria': pd.Index(_categorias(tabla['Industria'])),
+            'Pais': pd.Index(_categorias(tabla['Pais'])),
+            'Continente': pd.Index(_categorias(tabla['Continente'])),
+            'Ano': pd.Index(np.sort(tabla['Ano'].dropna().unique())),
+        }
+        self._tipo_ano = tabla['Ano'].dtype
+        self.forma = tuple(len(self.categorias[dimension]) for dimension in ('Industria', 'Pais', 'Ano'))
+
+        paises = self._codigo(tabla, 'Pais')
+        continentes = self._codigo(tabla, 'Continente')
+        self.continente_de_pais = np.full(self.forma[1], -1, dtype=np.int64)
+        validos = (paises >= 0) & (continentes >= 0)
+        self.continente_de_pais[paises[validos]] = continentes[validos]
+
+        # Matriz país × continente para sumar los países de cada continente.
+        self._continentes = np.zeros((self.forma[1], len(self.categorias['Continente'])))
+        self._continentes[np.flatnonzero(self.continente_de_pais >= 0),
+                          self.continente_de_pais[self.continente_de_pais >= 0]] = 1
+        self._posiciones = {dimension: {etiqueta: posicion for posicion, etiqueta in enumerate(etiquetas)}
+                            for dimension, etiquetas in self.categorias.items()}
+
+        posiciones = self._celdas(tabla)
+        self.conteo = self._sumar(posiciones, tabla[CONTEO]).astype(np.int64)
+        self.sumas = {medida: self._sumar(posiciones, tabla[medida]) for medida in MEDIDAS}
+
+    def _codigo(self, df:pd.DataFrame, dimension:str) -> np.ndarray:
+        if dimension == 'Ano':
+            codigos = self.categorias['Ano'].get_indexer(df['Ano'])
+        else:
+            codigos = pd.Categorical(df[dimension], categories=self.categorias[dimension]).codes
+        return np.asarray(codigos, dtype=np.int64)
+
+    def _celdas(self, df:pd.DataFrame) -> np.ndarray:
+        # Posición de cada fila en el cubo aplanado, -1 si le falta alguna clave.
+        industrias, paises, anos = (self._codigo(df, dimension) for dimension in ('Industria', 'Pais', 'Ano'))
+        posiciones = (industrias * self.forma[1] + paises) * self.forma[2] + anos
+        posiciones[(industrias < 0) | (paises < 0) | (anos < 0)] = -1
+        return posiciones
+
+    def _sumar(self, posiciones:np.ndarray, valores:pd.Series) -> np.ndarray:
+        validas = posiciones >= 0
+        pesos = np.nan_to_num(valores.to_numpy(dtype=np.float64, na_value=np.nan))[validas]
+        suma = np.bincount(posiciones[validas], weights=pesos, minlength=int(np.prod(self.forma)))
+        return suma.reshape(self.forma)
+
+    def _mascara(self, dimension:str, valores) -> np.ndarray:
+        # Posiciones del eje de la dimensión (países para Continente) que cumplen el filtro.
+        posiciones = self._posiciones[dimension]
+        elegidos = [posiciones[valor] for valor in valores if valor in posiciones]
+        if dimension == 'Continente':
+            return self._continentes[:, elegidos].any(axis=1)
+        mascara = np.zeros(len(posiciones), dtype=bool)
+        mascara[elegidos] = True
+        return mascara
+
+    def sumar(self, por:tuple, medida:str=CONTEO, filtros:dict=None) -> np.ndarray:
+        """
+        Agrega una medida del cubo por las dimensiones pedidas.
+
+        Cada eje del cubo se reduce con un producto por una matriz chica: la
+        identidad (con ceros en lo filtrado) si el eje se conserva, la matriz
+        país × continente si se pide el continente, o un vector de unos (con
+        ceros en lo filtrado) si se suma. Cuesta decenas de microsegundos.
+
+        Parámetros:
+            por (tuple): Dimensiones del resultado, en DIMENSIONES, sin repetir.
+                Las demás se suman. Pais y Continente comparten el eje de los
+                países, así que no se pueden pedir juntos.
+            medida (str, opcional): Medida de MEDIDAS o CONTEO. Por defecto CONTEO.
+            filtros (dict, opcional): Valores permitidos de cada dimensión, por
+                ejemplo {'Continente': ['Europe'], 'Ano': [2021, 2022]}.
+
+        Retorna:
+            ndarray: Arreglo con un eje por dimensión de `por`, en ese orden,
+            indexado como las etiquetas de categorias.
+
+        Lanza:
+            ValueError: Si `por` o `filtros` tienen una dimensión desconocida,
+            una dimensión repetida o Pais junto con Continente.
+        """
+        validar(por)
+        desconocidas = [dimension for dimension in (filtros or {}) if dimension not in DIMENSIONES]
+        if desconocidas:
+            raise ValueError(f'Dimensiones desconocidas en los filtros: {desconocidas}')
+
+        mascaras = [np.ones(largo) for largo in self.forma]
+        for dimension, valores in (filtros or {}).items():
+            eje = 1 if dimension == 'Continente' else ('Industria', 'Pais', 'Ano').index(dimension)
+            mascaras[eje] = mascaras[eje] * self._mascara(dimension, valores)
+
+        arreglo = self.conteo if medida == CONTEO else self.sumas[medida]
+        ejes = []
+        for eje, dimension in enumerate(('Industria', 'Pais', 'Ano')):
+            if eje == 1 and 'Continente' in por:
+                dimension, proyeccion = 'Continente', self._continentes * mascaras[1][:, None]
+            elif dimension in por:
+                proyeccion = np.diag(mascaras[eje])
+            else:
+                dimension, proyeccion = None, mascaras[eje][:, None]
+            # tensordot deja el eje reducido al final: tras los tres ejes
+            # el arreglo vuelve a quedar en el orden original.
+            arreglo = np.tensordot(arreglo, proyeccion, axes=([0], [0]))
+            ejes.append(dimension)
+
+        arreglo = arreglo.reshape([arreglo.shape[eje] for eje, dimension in enumerate(ejes) if dimension])
+        restantes = [dimension for dimension in ejes if dimension]
+        return np.transpose(arreglo, [restantes.index(dimension) for dimension in por])
+
+    def consultar(self, por:tuple, medidas:tuple=MEDIDAS, filtros:dict=None) -> pd.DataFrame:
+        """
+        Agrega el cubo y lo devuelve como tabla, sin las combinaciones sin empresas.
+
+        Parámetros:
+            por (tuple): Dimensiones del resultado, en DIMENSIONES (ver sumar).
+            medidas (tuple, opcional): Medidas a incluir. Por defecto todas las de MEDIDAS.
+            filtros (dict, opcional): Valores permitidos de cada dimensión.
+
+        Retorna:
+            DataFrame: Una fila por combinación de `por` con al menos una
+            empresa, con las columnas de `por`, CONTEO y las medidas pedidas,
+            redondeadas a dos decimales.
+
+        Lanza:
+            ValueError: Si la combinación de `por` no es válida (ver sumar).
+        """
+        por = tuple(por)
+        conteo = self.sumar(por, CONTEO, filtros)
+        presentes = np.flatnonzero(conteo.ravel() > 0)
+        columnas = {}
+        for dimension, posiciones in zip(por, np.unravel_index(presentes, conteo.shape) if por else ()):
+            if dimension == 'Ano':
+                columnas['Ano'] = self.categorias['Ano'].to_numpy()[posiciones].astype(self._tipo_ano)
+            else:
+                columnas[dimension] = pd.Categorical.from_codes(posiciones, categories=self.categorias[dimension])
+        columnas[CONTEO] = conteo.ravel()[presentes].astype(np.int64)
+        for medida in medidas:
+            # Las sumas de montos float32 arrastran ruido de precisión más allá del segundo decimal.
+            columnas[medida] = self.sumar(por, medida, filtros).ravel()[presentes].round(2)
+        tabla = pd.DataFrame(columnas)
+        return tabla
+
+
+def validar(por:tuple):
+    """
+    Verifica que las dimensiones pedidas se puedan agregar juntas.
+
+    Parámetros:
+        por (tuple): Dimensiones del resultado.
+
+    Lanza:
+        ValueError: Si hay una dimensión desconocida, una repetida o Pais
+        junto con Continente.
+    """
+    desconocidas = [dimension for dimension in por if dimension not in DIMENSIONES]
+    if desconocidas:
+        raise ValueError(f'Dimensiones desconocidas: {desconocidas}')
+    repetidas = sorted({dimension for dimension in por if list(por).count(dimension) > 1})
+    if repetidas:
+        raise ValueError(f'Dimensiones repetidas: {repetidas}')
+    if 'Pais' in por and 'Continente' in por:
+        raise ValueError('Pais y Continente no se pueden combinar: cada país pertenece a un solo continente')
+
+
+def _categorias(serie:pd.Series) -> list:
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        return list(serie.cat.categories)
+    return sorted(serie.dropna().unique())
+
+
+def celdas(forbes:pd.DataFrame, empleados:pd.DataFrame) -> pd.DataFrame:
+    """
+    Resume filas de Forbes en las celdas no vacías del cubo.
+
+    Parámetros:
+        forbes (DataFrame): Filas de forbes_2015_2022.
+        empleados (DataFrame): Filas de forbes_empleados de las mismas empresas.
+
+    Retorna:
+        DataFrame: Una fila por combinación de CLAVES con la cantidad de
+        empresas (CONTEO) y la suma de cada medida de MEDIDAS.
+    """
+    # Las medidas se suman en float64, como en el resto del cubo.
+    forbes = forbes[CLAVES].assign(**{medida: forbes[medida].astype(np.float64)
+                                      for medida in MEDIDAS if medida != 'Empleados'})
+    agrupar = dict(observed=True, dropna=False, sort=False)
+    tabla = forbes.groupby(CLAVES, **agrupar).agg(
+        **{CONTEO: ('Ano', 'size')},
+        **{medida: (medida, 'sum') for medida in MEDIDAS if medida != 'Empleados'})
+    tabla['Empleados'] = empleados.groupby(CLAVES, **agrupar)['Empleados'].sum().astype(np.float64)
+    return tabla.fillna({'Empleados': 0}).astype(np.float64).reset_index()
+
+
+def combinar(anterior:pd.DataFrame, nuevas:pd.DataFrame) -> pd.DataFrame:
+    """
+    Suma dos tablas de celdas, como las de celdas().
+
+    Parámetros:
+        anterior (DataFrame): Celdas de la versión anterior.
+        nuevas (DataFrame): Celdas de las filas agregadas.
+
+    Retorna:
+        DataFrame: Celdas con la suma de ambas.
+    """
+    tabla = pd.concat([anterior, nuevas], ignore_index=True)
+    for clave in CLAVES[:-1]:
+        tabla[clave] = tabla[clave].astype('category')
+    return tabla.groupby(CLAVES, observed=True, dropna=False, sort=False).sum().reset_index()
+
+
+def huella() -> str:
+    """Huella de la versión del cubo, combinando las de sus fuentes."""
+    return hashlib.sha256('|'.join(firma(fuente) for fuente in FUENTES).encode()).hexdigest()
+
+
+def obtener() -> Cubo:
+    """
+    Devuelve el cubo de Forbes 2015-2022, construyéndolo si cambiaron los datos.
+
+    Se cachea a nivel de proceso como los datasets (ver datos.cargar) y se
+    reconstruye cuando cambia la huella de alguna de sus fuentes. Las celdas
+    se comparten entre procesos: sólo el que las publica carga las fuentes.
+
+    Retorna:
+        Cubo: Cubo vigente.
+    """
+    actual = huella()
+    entrada = _cache.get('cubo')
+    diagnostico.contar('cubo', entrada is not None and entrada[0] == actual)
+    if entrada is not None and entrada[0] == actual:
+        return entrada[1]
+
+    with _bloqueo, diagnostico.medir('carga:cubo'):
+        entrada = _cache.get('cubo')
+        if entrada is None or entrada[0] != actual:
+            tabla = compartidos.obtener('cubo', actual, lambda: celdas(*(cargar(fuente) for fuente in FUENTES)))
+            entrada = (actual, Cubo(tabla))
+            _cache['cubo'] = entrada
+    return entrada[1]
+
+
+def actualizar(nuevas:pd.DataFrame, huella_anterior:str) -> bool:
+    """
+    Suma al cubo las filas anexadas a forbes_2015_2022.
+
+    Si la versión anterior del cubo está publicada, se combinan sus celdas
+    con las de las filas nuevas y se publica el resultado con la huella
+    nueva. Si no, el cubo se construye completo la próxima vez que se pida.
+
+    Parámetros:
+        nuevas (DataFrame): Filas anexadas a forbes_2015_2022.
+        huella_anterior (str): Huella del cubo (ver huella) antes de anexar.
+
+    Retorna:
+        bool: True si el cubo se actualizó a partir de las filas nuevas.
+    """
+    anterior = compartidos.adjuntar('cubo', huella_anterior)
+    if anterior is None:
+        return False
+
+    # Las filas de empleados de los años nuevos son las de la vista
+    # restringida a las filas nuevas de Forbes.
+    vista = VISTAS[FUENTES[1]]
+    empleados = vista.construir(cargar('empleados'), nuevas)
+    tabla = combinar(anterior, celdas(nuevas, empleados))
+
+    actual = huella()
+    compartidos.RUTA_COMPARTIDOS.mkdir(parents=True, exist_ok=True)
+    compartidos.publicar('cubo', actual, tabla)
+    with _bloqueo:
+        _cache['cubo'] = (actual, Cubo(compartidos.adjuntar('cubo', actual)))
+    return True
+
+
+def variacion_interanual(valores:np.ndarray) -> np.ndarray:
+    """
+    Variación porcentual de cada año respecto del anterior, sobre el último eje.
+
+    Parámetros:
+        valores (ndarray): Arreglo cuyo último eje son los años, como el de Cubo.sumar.
+
+    Retorna:
+        ndarray: Mismo arreglo con la variación en %; NaN en el primer año y
+        donde el año anterior vale 0.
+    """
+    variacion = np.full(valores.shape, np.nan)
+    anterior = valores[..., :-1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        variacion[..., 1:] = np.where(anterior != 0, (valores[..., 1:] - anterior) / np.abs(anterior) * 100, np.nan)
+    return variacion
+
+
+def participacion(valores:np.ndarray) -> np.ndarray:
+    """
+    Participación porcentual de cada categoría en el total de cada año.
+
+    Parámetros:
+        valores (ndarray): Arreglo de forma (categorías, años), como el de Cubo.sumar.
+
+    Retorna:
+        ndarray: Mismo arreglo en % del total de su año; NaN en los años sin total.
+    """
+    totales = valores.sum(axis=0, keepdims=True)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(totales != 0, valores / totales * 100, np.nan)
@@ -0,0 +1,315 @@
+import hashlib
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+
+import pandas as pd
+
+import diagnostico
+
+# Los DataFrames cacheados se comparten entre todas las sesiones, con
+# copy-on-write cualquier operación derivada crea su propia copia y nunca
+# modifica el frame compartido (en pandas >= 3 siempre está activo).
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option('mode.copy_on_write', True)
+
+# DATA_INSIDER_DATOS permite apuntar la app a otra carpeta de datos (por
+# ejemplo datos sintéticos más grandes, ver benchmark.py).
+RUTA_DATOS = Path(os.environ.get('DATA_INSIDER_DATOS', Path(__file__).resolve().parent.parent / 'Data'))
+
+COLUMNAS_DINERO = ['Ingresos', 'Ganancias', 'Activos', 'Valor_de_mercado']
+
+TIPOS_FORBES = {
+    'Rank_nr': 'int32',
+    'Industria': 'category',
+    'Pais': 'category',
+    **{columna: 'float32' for columna in COLUMNAS_DINERO},
+    'Margen_de_rentabilidad (%)': 'float64',
+    'ROA (%)': 'float64',
+    'Ano': 'int16',
+    'Codigo': 'category',
+    'Continente': 'category',
+}
+
+TIPOS_ACCIONES = {
+    'Symbol': 'category',
+    'Precio_Apertura': 'float32',
+    'Precio_Cierre': 'float32',
+    'Precio_Maximo': 'float32',
+    'Precio_Minimo': 'float32',
+}
+
+
+@dataclass(frozen=True)
+class Dataset:
+    """
+    Describe un archivo de datos y cómo debe leerse.
+
+    Atributos:
+        nombre (str): Identificador del dataset dentro del registro.
+        archivo (str): Nombre del archivo dentro de la carpeta Data.
+        tipos (dict): Tipos de datos por columna para pd.read_csv.
+        fechas (list): Columnas que se deben interpretar como fechas.
+    """
+    nombre: str
+    archivo: str
+    tipos: dict = field(default_factory=dict)
+    fechas: list = field(default_factory=list)
+
+    @property
+    def ruta(self) -> Path:
+        return RUTA_DATOS / self.archivo
+
+    @property
+    def esquema(self) -> str:
+        """Huella de la declaración de tipos, para detectar snapshots con otro esquema."""
+        return hashlib.sha256(repr((sorted(self.tipos.items()), self.fechas)).encode()).hexdigest()
+
+
+DATASETS = {
+    dataset.nombre: dataset for dataset in [
+        Dataset('forbes_2022', 'forbes_2022.csv', TIPOS_FORBES),
+        Dataset('forbes_2015_2022', 'forbes_2015_2022.csv', TIPOS_FORBES),
+        Dataset('empleados', 'empleados.csv', {'Rank_nr': 'int32', 'Ano': 'int16', 'Empleados': 'int32'}),
+        Dataset('acciones_ea', 'datos_ea_2024.csv', TIPOS_ACCIONES, ['Fecha']),
+        Dataset('acciones_konami', 'datos_konami_2024.csv', TIPOS_ACCIONES, ['Fecha']),
+        Dataset('acciones_nintendo', 'datos_nintendo_2024.csv', TIPOS_ACCIONES, ['Fecha']),
+        Dataset('acciones_squarenix', 'datos_squarenix_2024.csv', TIPOS_ACCIONES, ['Fecha']),
+        Dataset('acciones_ubisoft', 'datos_ubisoft_2024.csv', TIPOS_ACCIONES, ['Fecha']),
+    ]
+}
+
+
+
+@dataclass(frozen=True)
+class Vista:
+    """
+    Describe un DataFrame derivado de otros datasets, calculado al pedirlo.
+
+    Atributos:
+        nombre (str): Identificador de la vista, se carga igual que un dataset.
+        fuentes (tuple): Datasets (o vistas) de los que se deriva.
+        construir (Callable): Función que recibe los frames de las fuentes, en
+            el mismo orden, y devuelve la vista.
+    """
+    nombre: str
+    fuentes: tuple
+    construir: Callable
+
+
+def _forbes_empleados(empleados:pd.DataFrame, forbes:pd.DataFrame) -> pd.DataFrame:
+    # Rank_nr distingue a las empresas homónimas del mismo año (Merck de
+    # Estados Unidos y de Alemania).
+    df = empleados.merge(forbes, on=['Rank_nr', 'Empresa', 'Ano'], how='inner')
+    return df[[*forbes.columns, 'Empleados']]
+
+
+def _ventas_globales(forbes:pd.DataFrame) -> pd.DataFrame:
+    return forbes.groupby(['Pais', 'Codigo'], observed=True)['Ingresos'].sum().reset_index()
+
+
+VISTAS = {
+    vista.nombre: vista for vista in [
+        Vista('forbes_empleados', ('empleados', 'forbes_2015_2022'), _forbes_empleados),
+        Vista('ventas_globales', ('forbes_2022',), _ventas_globales),
+    ]
+}
+
+_bloqueo = threading.Lock()
+_huellas = {}
+_cache = {}
+
+
+def firma(nombre:str) -> str:
+    """
+    Calcula la huella (sha256) del archivo fuente de un dataset.
+
+    El hash sólo se recalcula cuando cambia la fecha de modificación o el
+    tamaño del archivo, por lo que consultarla en cada rerun es barato. La
+    huella de una vista es el hash de las huellas de sus fuentes.
+
+    Parámetros:
+        nombre (str): Nombre del dataset registrado en DATASETS o de una vista en VISTAS.
+
+    Retorna:
+        str: Hash sha256 en hexadecimal del contenido del archivo.
+    """
+    if nombre in VISTAS:
+        fuentes = '|'.join(firma(fuente) for fuente in VISTAS[nombre].fuentes)
+        return hashlib.sha256(fuentes.encode()).hexdigest()
+
+    ruta = DATASETS[nombre].ruta
+    estado = os.stat(ruta)
+    clave = (estado.st_mtime_ns, estado.st_size)
+
+    huella = _huellas.get(nombre)
+    if huella is None or huella[0] != clave:
+        sha = hashlib.sha256()
+        with open(ruta, 'rb') as archivo:
+            for bloque in iter(lambda: archivo.read(1 << 20), b''):
+                sha.update(bloque)
+        huella = (clave, sha)
+        _huellas[nombre] = huella
+
+    return huella[1].hexdigest()
+
+
+def leer_csv(dataset:Dataset) -> pd.DataFrame:
+    """
+    Lee el CSV fuente de un dataset aplicando los tipos declarados.
+
+    Parámetros:
+        dataset (Dataset): Descripción del dataset a leer.
+
+    Retorna:
+        DataFrame: Datos del archivo con los tipos declarados.
+    """
+    return pd.read_csv(dataset.ruta, dtype=dataset.tipos, parse_dates=dataset.fechas)
+
+
+def para_mostrar(df:pd.DataFrame, decimales:int=2) -> pd.DataFrame:
+    """
+    Prepara una tabla con los tipos compactos del cargador para mostrarla.
+
+    Los montos y precios se guardan como float32 y, mostrados tal cual, dejan
+    ver el ruido de precisión (-523.30005 en lugar de -523.3). Las columnas
+    float32 pasan a float64 redondeado; las demás no cambian.
+
+    Parámetros:
+        df (DataFrame): Tabla a mostrar.
+        decimales (int, opcional): Decimales de las columnas convertidas. Por defecto 2.
+
+    Retorna:
+        DataFrame: Tabla lista para mostrar, el mismo objeto si no tiene columnas float32.
+    """
+    reducidas = df.select_dtypes('float32').columns
+    if len(reducidas) == 0:
+        return df
+    return df.astype(dict.fromkeys(reducidas, 'float64')).round(dict.fromkeys(reducidas, decimales))
+
+
+def _leer(dataset:Dataset, huella:str) -> pd.DataFrame:
+    from compartidos import obtener
+    from snapshots import leer_snapshot
+
+    df = leer_snapshot(dataset, huella)
+    if df is None:
+        df = obtener(dataset.nombre, huella, lambda: leer_csv(dataset))
+    return df
+
+
+def cargar(nombre:str) -> pd.DataFrame:
+    """
+    Devuelve el DataFrame tipado de un dataset registrado.
+
+    La lectura se cachea a nivel de proceso, de modo que todas las sesiones y
+    reruns de Streamlit comparten el mismo frame. La entrada se invalida
+    cuando cambia la huella del archivo fuente. Si existe un snapshot Arrow
+    vigente (ver snapshots.py) se lee de ahí y si no, del CSV. Las vistas se
+    construyen a partir de sus fuentes la primera vez que se piden y se
+    vuelven a construir cuando cambia alguna. Los datasets sin snapshot y las
+    vistas se publican como archivos Arrow compartidos entre los procesos del
+    servidor (ver compartidos.py), de modo que sólo el primer proceso los
+    lee o construye. El frame devuelto es de solo lectura: no debe
+    modificarse en el lugar.
+
+    Parámetros:
+        nombre (str): Nombre del dataset registrado en DATASETS o de una vista en VISTAS.
+
+    Retorna:
+        DataFrame: Datos del archivo con los tipos declarados.
+    """
+    huella = firma(nombre)
+
+    entrada = _cache.get(nombre)
+    if entrada is not None and entrada[0] == huella:
+        diagnostico.contar('datos', True)
+        return entrada[1]
+
+    diagnostico.contar('datos', False)
+    if nombre in VISTAS:
+        from compartidos import obtener
+
+        vista = VISTAS[nombre]
+        with diagnostico.medir(f'carga:{nombre}'):
+            df = obtener(nombre, huella, lambda: vista.construir(*(cargar(fuente) for fuente in vista.fuentes)))
+        with _bloqueo:
+            _cache[nombre] = (huella, df)
+        return df
+
+    with _bloqueo, diagnostico.medir(f'carga:{nombre}'):
+        entrada = _cache.get(nombre)
+        if entrada is None or entrada[0] != huella:
+            entrada = (huella, _leer(DATASETS[nombre], huella))
+            _cache[nombre] = entrada
+
+    return entrada[1]
+
+
+def _extender(df:pd.DataFrame, nuevas:pd.DataFrame, dataset:Dataset) -> pd.DataFrame:
+    # Convierte sólo las filas nuevas. Las categorías que no existían se
+    # agregan al final, así los códigos del histórico no cambian y el concat
+    # conserva las columnas categóricas sin recodificarlas.
+    nuevas = nuevas[df.columns].astype(dataset.tipos)
+    for fecha in dataset.fechas:
+        nuevas[fecha] = pd.to_datetime(nuevas[fecha]).astype(df[fecha].dtype)
+    historico = {}
+    for columna in df.columns:
+        if isinstance(df[columna].dtype, pd.CategoricalDtype):
+            categorias = df[columna].cat.categories
+            faltantes = nuevas[columna].cat.categories.difference(categorias)
+            if len(faltantes):
+                categorias = categorias.append(faltantes)
+                historico[columna] = df[columna].cat.add_categories(faltantes)
+            nuevas[columna] = nuevas[columna].cat.set_categories(categorias)
+    if historico:
+        df = df.assign(**historico)
+    return pd.concat([df, nuevas], ignore_index=True)
+
+
+def anexar(nombre:str, nuevas:pd.DataFrame) -> str:
+    """
+    Agrega filas al final del CSV fuente de un dataset sin reescribirlo.
+
+    La huella se actualiza hasheando sólo los bytes agregados y, si el dataset
+    está cacheado, el frame en memoria se extiende con las filas nuevas en
+    lugar de volver a leer el archivo: sólo las filas nuevas se convierten a
+    los tipos declarados y el histórico se copia tal cual. El estado del hash
+    vive en memoria, así que en un proceso que todavía no calculó la huella
+    (por ejemplo el CLI de ingesta) la primera llamada lee el archivo completo
+    una vez; las siguientes sólo hashean lo agregado.
+
+    Parámetros:
+        nombre (str): Nombre del dataset registrado en DATASETS.
+        nuevas (DataFrame): Filas a agregar, con las mismas columnas que el archivo.
+
+    Retorna:
+        str: Nueva huella del dataset.
+    """
+    dataset = DATASETS[nombre]
+
+    with _bloqueo:
+        firma(nombre)
+        with open(dataset.ruta, 'rb') as archivo:
+            columnas = archivo.readline().decode('utf-8').rstrip('\r\n').split(',')
+            archivo.seek(-1, os.SEEK_END)
+            salto = '' if archivo.read(1) == b'\n' else '\n'
+
+        contenido = (salto + nuevas.to_csv(columns=columnas, header=False, index=False,
+                                           date_format='%Y-%m-%d')).encode('utf-8')
+        with open(dataset.ruta, 'ab') as archivo:
+            archivo.write(contenido)
+
+        sha = _huellas[nombre][1].copy()
+        sha.update(contenido)
+        estado = os.stat(dataset.ruta)
+        _huellas[nombre] = ((estado.st_mtime_ns, estado.st_size), sha)
+        huella = sha.hexdigest()
+
+        entrada = _cache.get(nombre)
+        if entrada is not None:
+            _cache[nombre] = (huella, _extender(entrada[1], nuevas, dataset))
+
+    return huella
@@ -0,0 +1,185 @@
+"""
+Modo diagnóstico: tiempos por sección y aciertos de las caches.
+
+Se activa con la variable de entorno DATA_INSIDER_DIAGNOSTICO=1 o, sólo para
+una sesión, abriendo la app con ?diagnostico=1. Mientras está activo cada
+sección de la página se cronometra por etapa (carga de datos, tabla,
+construcción del gráfico, serialización y envío a Streamlit), la app muestra
+el desglose en un desplegable y al terminar cada corrida las métricas se
+exportan a Data/diagnostico: metricas.jsonl (una línea por etapa y corrida)
+y metricas.prom (acumulados del proceso en formato de texto de Prometheus).
+
+Con el modo apagado los cronómetros no miden nada; sólo se cuentan los
+aciertos y fallos de las caches, que es una suma por consulta.
+"""
+import json
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from functools import wraps
+
+ENTORNO = os.environ.get('DATA_INSIDER_DIAGNOSTICO', '') not in ('', '0')
+GENERAL = 'general'
+
+# Streamlit ejecuta cada sesión en su propio hilo, así que activar el modo con
+# el parámetro de la URL no afecta a las demás sesiones.
+_corrida = ContextVar('corrida', default=None)
+_seccion = ContextVar('seccion', default=GENERAL)
+
+_bloqueo = threading.Lock()
+_caches = Counter()
+_acumulado = defaultdict(lambda: [0.0, 0])
+
+
+class Corrida:
+    """
+    Tiempos de una ejecución del script, por sección y etapa.
+
+    Atributos:
+        tiempos (dict): {seccion: {etapa: [segundos, llamadas]}} en orden de aparición.
+    """
+
+    def __init__(self):
+        self.inicio = datetime.now()
+        self.tiempos = defaultdict(lambda: defaultdict(lambda: [0.0, 0]))
+
+    def registrar(self, seccion:str, etapa:str, segundos:float):
+        medida = self.tiempos[seccion][etapa]
+        medida[0] += segundos
+        medida[1] += 1
+
+    def desglose(self, seccion:str) -> list:
+        """Filas (etapa, milisegundos, llamadas) de una sección, para mostrarlas en una tabla."""
+        return [{'Etapa': etapa, 'ms': round(segundos * 1000, 2), 'Llamadas': llamadas}
+                for etapa, (segundos, llamadas) in self.tiempos.get(seccion, {}).items()]
+
+
+def iniciar(activo:bool=False):
+    """
+    Comienza una corrida si el modo diagnóstico está activo.
+
+    Parámetros:
+        activo (bool, opcional): Activa el modo para esta sesión aunque no esté
+            activada la variable de entorno. Por defecto False.
+
+    Retorna:
+        Corrida o None: La corrida en curso, o None si el modo está apagado.
+    """
+    corrida = Corrida() if activo or ENTORNO else None
+    _corrida.set(corrida)
+    return corrida
+
+
+@contextmanager
+def seccion(clave:str):
+    """Atribuye a la sección `clave` los tiempos medidos dentro del bloque."""
+    marca = _seccion.set(clave)
+    try:
+        yield
+    finally:
+        _seccion.reset(marca)
+
+
+@contextmanager
+def medir(etapa:str):
+    """Cronometra el bloque como una etapa de la sección actual, si hay una corrida activa."""
+    corrida = _corrida.get()
+    if corrida is None:
+        yield
+        return
+
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        segundos = time.perf_counter() - inicio
+        corrida.registrar(_seccion.get(), etapa, segundos)
+        with _bloqueo:
+            acumulado = _acumulado[(_seccion.get(), etapa)]
+            acumulado[0] += segundos
+            acumulado[1] += 1
+
+
+def cronometrado(etapa:str):
+    """
+    Decorador que cronometra cada llamada como la etapa '<etapa>:<función>'.
+
+    Parámetros:
+        etapa (str): Prefijo de la etapa, por ejemplo 'grafico'.
+    """
+    def decorador(funcion):
+        nombre = f'{etapa}:{funcion.__name__}'
+
+        @wraps(funcion)
+        def envoltura(*args, **kwargs):
+            if _corrida.get() is None:
+                return funcion(*args, **kwargs)
+            with medir(nombre):
+                return funcion(*args, **kwargs)
+        return envoltura
+    return decorador
+
+
+def contar(cache:str, acierto:bool):
+    """Suma un acierto o un fallo a los contadores de una cache."""
+    with _bloqueo:
+        _caches[(cache, 'aciertos' if acierto else 'fallos')] += 1
+
+
+def caches() -> list:
+    """Filas (cache, aciertos, fallos) acumuladas en el proceso."""
+    nombres = sorted({cache for cache, _ in _caches})
+    return [{'Cache': cache, 'Aciertos': _caches[(cache, 'aciertos')], 'Fallos': _caches[(cache, 'fallos')]}
+            for cache in nombres]
+
+
+def _prometheus() -> str:
+    lineas = [
+        '# HELP data_insider_etapa_segundos_total Tiempo acumulado por sección y etapa.',
+        '# TYPE data_insider_etapa_segundos_total counter',
+    ]
+    with _bloqueo:
+        acumulado = dict(_acumulado)
+        contadores = dict(_caches)
+    for (seccion_, etapa), (segundos, _) in acumulado.items():
+        lineas.append(f'data_insider_etapa_segundos_total{{seccion="{seccion_}",etapa="{etapa}"}} {segundos:.6f}')
+    lineas += ['# HELP data_insider_etapa_llamadas_total Llamadas acumuladas por sección y etapa.',
+               '# TYPE data_insider_etapa_llamadas_total counter']
+    for (seccion_, etapa), (_, llamadas) in acumulado.items():
+        lineas.append(f'data_insider_etapa_llamadas_total{{seccion="{seccion_}",etapa="{etapa}"}} {llamadas}')
+    lineas += ['# HELP data_insider_cache_total Consultas a cada cache por resultado.',
+               '# TYPE data_insider_cache_total counter']
+    for (cache, resultado), cantidad in contadores.items():
+        lineas.append(f'data_insider_cache_total{{cache="{cache}",resultado="{resultado}"}} {cantidad}')
+    return '\n'.join(lineas) + '\n'
+
+
+def exportar(corrida:Corrida):
+    """
+    Guarda las métricas de una corrida en Data/diagnostico.
+
+    Agrega una línea JSON por sección y etapa a metricas.jsonl y reescribe
+    metricas.prom con los acumulados del proceso.
+
+    Parámetros:
+        corrida (Corrida): Corrida terminada.
+    """
+    from datos import RUTA_DATOS
+
+    carpeta = RUTA_DATOS / 'diagnostico'
+    carpeta.mkdir(exist_ok=True)
+    fecha = corrida.inicio.isoformat(timespec='milliseconds')
+
+    with open(carpeta / 'metricas.jsonl', 'a', encoding='utf-8') as archivo:
+        for seccion_, etapas in corrida.tiempos.items():
+            for etapa, (segundos, llamadas) in etapas.items():
+                archivo.write(json.dumps({'fecha': fecha, 'pid': os.getpid(), 'seccion': seccion_,
+                                          'etapa': etapa, 'segundos': segundos, 'llamadas': llamadas}) + '\n')
+
+    temporal = carpeta / 'metricas.prom.tmp'
+    temporal.write_text(_prometheus(), encoding='utf-8')
+    os.replace(temporal, carpeta / 'metricas.prom')
@@ -0,0 +1,59 @@
+"""
+Importación diferida de las bibliotecas pesadas de gráficos.
+
+Matplotlib, Seaborn y plotly.express tardan en conjunto cerca de un segundo
+en importarse, y ninguna página las necesita todas: los gráficos de
+Matplotlib prerenderizados se leen como imágenes (ver artefactos.py) y la
+página de visualizaciones extra sólo usa Plotly. Los módulos que las usan
+las declaran con diferido(), que devuelve un sustituto del módulo que lo
+importa recién al acceder a su primer atributo; así el arranque del servidor
+no paga por gráficos que todavía no se dibujaron.
+
+Con el modo diagnóstico activo, el tiempo de esa primera importación se
+registra como la etapa 'importar:<módulo>' de la sección que la provocó.
+"""
+import importlib
+
+import diagnostico
+
+
+class ModuloDiferido:
+    """
+    Sustituto de un módulo que se importa al usarlo por primera vez.
+
+    Atributos:
+        nombre (str): Nombre completo del módulo, por ejemplo 'plotly.express'.
+    """
+
+    def __init__(self, nombre:str):
+        self.nombre = nombre
+        self._modulo = None
+
+    def cargar(self):
+        """Importa el módulo si todavía no se importó y lo devuelve."""
+        if self._modulo is None:
+            # import_module es seguro entre hilos: si dos sesiones llegan a la
+            # vez, la segunda espera a la primera y obtiene el mismo módulo.
+            with diagnostico.medir(f'importar:{self.nombre}'):
+                self._modulo = importlib.import_module(self.nombre)
+        return self._modulo
+
+    def __getattr__(self, atributo:str):
+        return getattr(self.cargar(), atributo)
+
+    def __repr__(self):
+        estado = 'importado' if self._modulo is not None else 'sin importar'
+        return f'<módulo diferido {self.nombre!r} ({estado})>'
+
+
+def diferido(nombre:str) -> ModuloDiferido:
+    """
+    Declara un módulo que se importa recién cuando se usa.
+
+    Parámetros:
+        nombre (str): Nombre completo del módulo.
+
+    Retorna:
+        ModuloDiferido: Objeto que se comporta como el módulo.
+    """
+    return ModuloDiferido(nombre)
@@ -0,0 +1,207 @@
+"""
+Ingesta incremental (sólo agregar) de años nuevos de Forbes y días de cotización.
+
+Uso:
+    python app/ingesta.py forbes_2015_2022 nuevos.csv   # agrega los años nuevos
+    python app/ingesta.py acciones nuevos.csv           # agrega los días nuevos de cada símbolo
+
+Cada dataset incremental tiene una marca de agua: el último Ano ingerido, o la
+última Fecha por Symbol en los precios. De un archivo de entrada sólo se
+agregan las filas posteriores a la marca, al final del CSV fuente y sin
+reescribirlo, y se actualizan únicamente los agregados combinables de ese
+dataset (ver agregados.actualizar) y, para Forbes, las celdas del cubo (ver
+cubo.actualizar). Si el dataset está particionado, las filas nuevas se
+escriben como particiones nuevas (ver particiones.anexar).
+Las marcas se guardan en Data/marcas.json junto a la huella del CSV que
+describen; si la huella no coincide se vuelven a calcular desde los datos.
+"""
+import argparse
+import json
+import os
+import sys
+
+import pandas as pd
+
+import cubo
+from acciones import ACCIONES
+from agregados import actualizar, clave
+from consultas import CONSULTAS
+from datos import DATASETS, RUTA_DATOS, anexar, cargar, firma
+from particiones import anexar as anexar_particiones
+
+RUTA_MARCAS = RUTA_DATOS / 'marcas.json'
+
+# Columna de la marca de agua y columna por la que se lleva una marca separada.
+INCREMENTALES = {
+    'forbes_2015_2022': ('Ano', None),
+    **{nombre: ('Fecha', 'Symbol') for nombre in ACCIONES},
+}
+
+
+def _leer_marcas() -> dict:
+    try:
+        with open(RUTA_MARCAS, encoding='utf-8') as archivo:
+            return json.load(archivo)
+    except FileNotFoundError:
+        return {}
+
+
+def _escribir_marcas(marcas:dict):
+    temporal = RUTA_MARCAS.with_suffix('.tmp')
+    with open(temporal, 'w', encoding='utf-8') as archivo:
+        json.dump(marcas, archivo, indent=2)
+    os.replace(temporal, RUTA_MARCAS)
+
+
+def _calcular_marca(df:pd.DataFrame, columna:str, grupo:str) -> dict:
+    if grupo is None:
+        valores = {'': df[columna].max()}
+    else:
+        valores = df.groupby(grupo, observed=True)[columna].max().to_dict()
+    return {str(clave_grupo): (valor.strftime('%Y-%m-%d') if isinstance(valor, pd.Timestamp) else int(valor))
+            for clave_grupo, valor in valores.items()}
+
+
+def marca(nombre:str) -> dict:
+    """
+    Devuelve la marca de agua vigente de un dataset incremental.
+
+    Parámetros:
+        nombre (str): Nombre del dataset en INCREMENTALES.
+
+    Retorna:
+        dict: Último valor ingerido por grupo ('' si el dataset no se agrupa).
+    """
+    entrada = _leer_marcas().get(nombre)
+    if entrada is not None and entrada['sha256'] == firma(nombre):
+        return entrada['marca']
+    columna, grupo = INCREMENTALES[nombre]
+    return _calcular_marca(cargar(nombre), columna, grupo)
+
+
+def pendientes(nombre:str, nuevas:pd.DataFrame) -> pd.DataFrame:
+    """
+    Filtra las filas posteriores a la marca de agua de un dataset.
+
+    Parámetros:
+        nombre (str): Nombre del dataset en INCREMENTALES.
+        nuevas (DataFrame): Filas candidatas, con los tipos del dataset.
+
+    Retorna:
+        DataFrame: Filas que todavía no fueron ingeridas. Los grupos sin marca
+        (por ejemplo un símbolo nuevo) se incluyen completos.
+    """
+    columna, grupo = INCREMENTALES[nombre]
+    actual = marca(nombre)
+
+    if grupo is None:
+        limite = pd.Series(actual.get(''), index=nuevas.index)
+    else:
+        limite = nuevas[grupo].astype(str).map(actual)
+    if columna == 'Fecha':
+        limite = pd.to_datetime(limite)
+
+    return nuevas.loc[limite.isna() | (nuevas[columna] > limite)].reset_index(drop=True)
+
+
+def ingerir(nombre:str, nuevas:pd.DataFrame) -> pd.DataFrame:
+    """
+    Agrega al dataset las filas posteriores a su marca y actualiza sus agregados.
+
+    Parámetros:
+        nombre (str): Nombre del dataset en INCREMENTALES.
+        nuevas (DataFrame): Filas candidatas, con los tipos del dataset.
+
+    Retorna:
+        DataFrame: Filas efectivamente agregadas (vacío si no había nada nuevo).
+    """
+    columna, grupo = INCREMENTALES[nombre]
+    delta = pendientes(nombre, nuevas)
+    if delta.empty:
+        return delta
+
+    anterior = marca(nombre)
+    huella_anterior = firma(nombre)
+    claves_anteriores = {consulta: clave(consulta) for consulta, definicion in CONSULTAS.items()
+                         if definicion.dataset == nombre}
+
+    huella_cubo = cubo.huella() if nombre == cubo.FUENTES[0] else None
+
+    huella = anexar(nombre, delta)
+    anexar_particiones(nombre, delta, huella_anterior, huella)
+    actualizar(nombre, delta, claves_anteriores)
+    if huella_cubo is not None:
+        cubo.actualizar(delta, huella_cubo)
+
+    nueva = {**anterior}
+    for clave_grupo, valor in _calcular_marca(delta, columna, grupo).items():
+        nueva[clave_grupo] = max(valor, anterior.get(clave_grupo, valor))
+
+    marcas = _leer_marcas()
+    marcas[nombre] = {'sha256': huella, 'marca': nueva}
+    _escribir_marcas(marcas)
+    return delta
+
+
+def ingerir_acciones(nuevas:pd.DataFrame) -> tuple:
+    """
+    Reparte precios diarios nuevos entre los archivos de cada símbolo.
+
+    Cada fila va al archivo que ya tiene su símbolo. Los símbolos que no están
+    en ningún archivo no tienen dónde agregarse: sus filas se devuelven sin
+    escribir para que quien llama las informe.
+
+    Parámetros:
+        nuevas (DataFrame): Precios diarios de uno o más símbolos.
+
+    Retorna:
+        tuple: (dict con la cantidad de filas agregadas por dataset,
+        DataFrame con las filas de símbolos desconocidos).
+    """
+    agregadas = {}
+    simbolos = nuevas['Symbol'].astype(str)
+    asignadas = pd.Series(False, index=nuevas.index)
+
+    for nombre in ACCIONES:
+        propias = simbolos.isin(marca(nombre).keys())
+        asignadas |= propias
+        if propias.any():
+            agregadas[nombre] = len(ingerir(nombre, nuevas.loc[propias]))
+
+    return agregadas, nuevas.loc[~asignadas].reset_index(drop=True)
+
+
+def leer_entrada(nombre:str, ruta) -> pd.DataFrame:
+    """
+    Lee un CSV de entrada con los tipos declarados de un dataset.
+
+    Parámetros:
+        nombre (str): Nombre del dataset en DATASETS cuyo esquema se usa.
+        ruta (str o Path): Archivo a leer.
+
+    Retorna:
+        DataFrame: Filas del archivo con los tipos del dataset.
+    """
+    dataset = DATASETS[nombre]
+    return pd.read_csv(ruta, dtype=dataset.tipos, parse_dates=dataset.fechas)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Agrega filas nuevas a los datasets incrementales.')
+    parser.add_argument('dataset', choices=['acciones', *INCREMENTALES],
+                        help="Dataset de destino, o 'acciones' para repartir por símbolo.")
+    parser.add_argument('archivo', help='CSV con las filas nuevas.')
+    argumentos = parser.parse_args()
+
+    if argumentos.dataset == 'acciones':
+        agregadas, sin_asignar = ingerir_acciones(leer_entrada(ACCIONES[0], argumentos.archivo))
+        for nombre, filas in agregadas.items():
+            print(f'{nombre}: {filas} filas nuevas')
+        if not sin_asignar.empty:
+            desconocidos = ', '.join(sorted(sin_asignar['Symbol'].astype(str).unique()))
+            print(f'{len(sin_asignar)} filas sin agregar, de símbolos que no están en ningún archivo: '
+                  f'{desconocidos}', file=sys.stderr)
+            sys.exit(1)
+    else:
+        delta = ingerir(argumentos.dataset, leer_entrada(argumentos.dataset, argumentos.archivo))
+        print(f'{argumentos.dataset}: {len(delta)} filas nuevas')
@@ -0,0 +1,89 @@
+"""
+Reducción de series temporales antes de graficarlas.
+
+Las series largas (precios diarios o intradía de muchos símbolos) se reducen
+con LTTB (Largest-Triangle-Three-Buckets) a tantos puntos como píxeles tiene
+el gráfico, por lo que el tamaño de lo que se envía al navegador queda
+acotado sin importar cuánto histórico haya. Al acotar el rango de fechas se
+vuelve a reducir sólo ese tramo, con más detalle.
+"""
+import numpy as np
+import pandas as pd
+
+
+def lttb(x:np.ndarray, y:np.ndarray, puntos:int) -> np.ndarray:
+    """
+    Elige los índices de los puntos que mejor conservan la forma de la serie.
+
+    Parámetros:
+        x (ndarray): Valores del eje X ordenados (numéricos).
+        y (ndarray): Valores del eje Y.
+        puntos (int): Cantidad de puntos a conservar (al menos 3).
+
+    Retorna:
+        ndarray: Índices de los puntos elegidos, en orden.
+    """
+    total = len(x)
+    if puntos >= total or puntos < 3:
+        return np.arange(total)
+
+    x = x.astype('float64')
+    y = y.astype('float64')
+
+    # El primer y el último punto se conservan; el resto se reparte en cubetas.
+    bordes = np.linspace(1, total - 1, puntos - 1).astype(np.int64)
+    elegidos = np.empty(puntos, dtype=np.int64)
+    elegidos[0] = 0
+    elegidos[-1] = total - 1
+
+    anterior = 0
+    for i in range(puntos - 2):
+        inicio, fin = bordes[i], bordes[i + 1]
+        siguiente_inicio, siguiente_fin = bordes[i + 1], bordes[i + 2] if i + 2 < len(bordes) else total
+        promedio_x = x[siguiente_inicio:max(siguiente_fin, siguiente_inicio + 1)].mean()
+        promedio_y = y[siguiente_inicio:max(siguiente_fin, siguiente_inicio + 1)].mean()
+
+        areas = np.abs((x[anterior] - promedio_x) * (y[inicio:fin] - y[anterior])
+                       - (x[anterior] - x[inicio:fin]) * (promedio_y - y[anterior]))
+        anterior = inicio + int(np.argmax(areas))
+        elegidos[i + 1] = anterior
+
+    return elegidos
+
+
+def reducir(df:pd.DataFrame, x:str, y:str, grupo:str, puntos:int=1500,
+            desde=None, hasta=None) -> pd.DataFrame:
+    """
+    Reduce cada serie de un DataFrame a una cantidad acotada de puntos.
+
+    Parámetros:
+        df (DataFrame): Datos en formato largo, una fila por punto.
+        x (str): Columna del eje X (fechas o números).
+        y (str): Columna del eje Y.
+        grupo (str): Columna que identifica cada serie, por ejemplo 'Symbol'.
+        puntos (int, opcional): Puntos máximos por serie, normalmente el ancho
+            del gráfico en píxeles. Por defecto 1500.
+        desde, hasta (opcional): Límites del rango visible del eje X.
+
+    Retorna:
+        DataFrame: Filas elegidas de cada serie, ordenadas por grupo y eje X.
+    """
+    if desde is not None:
+        df = df.loc[df[x] >= desde]
+    if hasta is not None:
+        df = df.loc[df[x] <= hasta]
+
+    df = df.sort_values([grupo, x])
+    valores_x = df[x].to_numpy()
+    if np.issubdtype(valores_x.dtype, np.datetime64):
+        valores_x = valores_x.astype('datetime64[ns]').astype(np.int64)
+    valores_y = df[y].to_numpy()
+
+    posiciones = []
+    for filas in df.groupby(grupo, observed=True).indices.values():
+        filas = np.sort(filas)
+        posiciones.append(filas[lttb(valores_x[filas], valores_y[filas], puntos)])
+
+    if not posiciones:
+        return df
+    return df.iloc[np.concatenate(posiciones)]
@@ -0,0 +1,223 @@
+"""
+Almacenamiento particionado por año de los datasets de varios años de Forbes.
+
+Uso:
+    python app/particiones.py            # reconstruye las particiones desactualizadas
+    python app/particiones.py --forzar   # reconstruye todas
+
+Cada dataset de PARTICIONADOS se guarda en Data/particiones/<dataset> como
+Parquet con particiones Hive por Ano (Ano=2015/, Ano=2016/, ...). Dentro de
+cada año las filas se ordenan por Continente e Industria y se escriben en
+grupos de filas chicos, de modo que las estadísticas min/max de cada grupo
+permiten saltear los que no cumplen un filtro. consultar() traduce los mismos
+filtros (columna, operador, valor) del catálogo de consultas a expresiones de
+pyarrow, así que sólo se leen las columnas pedidas, los años pedidos y los
+grupos de filas que pueden cumplir el filtro, sin cargar el histórico completo.
+
+Como en los snapshots, manifest.json guarda la huella del CSV fuente; si no
+coincide con la actual, consultar() devuelve None y se usa el CSV.
+"""
+import argparse
+import json
+import os
+import shutil
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+
+from datos import DATASETS, RUTA_DATOS, firma, leer_csv
+
+RUTA_PARTICIONES = RUTA_DATOS / 'particiones'
+RUTA_MANIFIESTO = RUTA_PARTICIONES / 'manifest.json'
+
+# Columnas de partición y de orden dentro de cada partición.
+PARTICIONADOS = {
+    'forbes_2015_2022': (('Ano',), ('Continente', 'Industria')),
+}
+FILAS_POR_GRUPO = 256
+# Posición de cada fila en el CSV, para devolver las filas en el orden original.
+FILA = '_fila'
+
+_OPERADORES = {
+    '==': lambda campo, valor: campo == valor,
+    '!=': lambda campo, valor: campo != valor,
+    '<': lambda campo, valor: campo < valor,
+    '<=': lambda campo, valor: campo <= valor,
+    '>': lambda campo, valor: campo > valor,
+    '>=': lambda campo, valor: campo >= valor,
+    'in': lambda campo, valor: campo.isin(list(valor)),
+}
+
+
+def leer_manifiesto() -> dict:
+    """
+    Lee el manifiesto de particiones.
+
+    Retorna:
+        dict: Entradas del manifiesto por nombre de dataset, vacío si no existe.
+    """
+    try:
+        with open(RUTA_MANIFIESTO, encoding='utf-8') as archivo:
+            return json.load(archivo)
+    except FileNotFoundError:
+        return {}
+
+
+def _escribir_manifiesto(manifiesto:dict):
+    temporal = RUTA_MANIFIESTO.with_suffix('.tmp')
+    with open(temporal, 'w', encoding='utf-8') as archivo:
+        json.dump(manifiesto, archivo, indent=2)
+    os.replace(temporal, RUTA_MANIFIESTO)
+
+
+def _vigente(nombre:str, huella:str=None):
+    entrada = leer_manifiesto().get(nombre)
+    if (entrada is None or entrada['sha256'] != (huella or firma(nombre))
+            or entrada['esquema'] != DATASETS[nombre].esquema):
+        return None
+    return entrada
+
+
+def _escribir(nombre:str, df, inicio:int, comportamiento:str):
+    particiones, orden = PARTICIONADOS[nombre]
+    df = df.assign(**{FILA: range(inicio, inicio + len(df))})
+    # Las categorías se guardan como texto: pyarrow no usa las estadísticas de
+    # las columnas diccionario para saltear grupos de filas.
+    tabla = pa.Table.from_pandas(df.sort_values([*particiones, *orden]), preserve_index=False)
+    tabla = tabla.cast(pa.schema([
+        campo.with_type(campo.type.value_type) if pa.types.is_dictionary(campo.type) else campo
+        for campo in tabla.schema
+    ]))
+    esquema_particion = pa.schema([tabla.schema.field(columna) for columna in particiones])
+
+    ds.write_dataset(
+        tabla, RUTA_PARTICIONES / nombre, format='parquet',
+        partitioning=ds.partitioning(esquema_particion, flavor='hive'),
+        basename_template='parte-{i}.parquet',
+        max_rows_per_group=FILAS_POR_GRUPO, min_rows_per_group=FILAS_POR_GRUPO,
+        existing_data_behavior=comportamiento,
+    )
+    return tabla
+
+
+def expresion(filtros:tuple):
+    """
+    Traduce filtros (columna, operador, valor) del catálogo a una expresión de pyarrow.
+
+    Parámetros:
+        filtros (tuple): Condiciones combinadas con AND, como en consultas.Consulta.
+
+    Retorna:
+        Expression o None: Expresión para ds.Dataset.to_table, None si no hay filtros.
+    """
+    resultado = None
+    for columna, operador, valor in filtros:
+        condicion = _OPERADORES[operador](pc.field(columna), valor)
+        resultado = condicion if resultado is None else resultado & condicion
+    return resultado
+
+
+def consultar(nombre:str, columnas:list=None, filtros:tuple=()):
+    """
+    Lee de un dataset particionado sólo las columnas y filas que cumplen los filtros.
+
+    Los filtros sobre las columnas de partición descartan carpetas completas y
+    el resto se evalúa con las estadísticas de cada grupo de filas antes de
+    leerlo.
+
+    Parámetros:
+        nombre (str): Nombre del dataset en PARTICIONADOS.
+        columnas (list, opcional): Columnas a devolver. Por defecto todas, en el
+            orden del CSV fuente.
+        filtros (tuple, opcional): Condiciones (columna, operador, valor).
+
+    Retorna:
+        DataFrame o None: Filas que cumplen los filtros con los tipos declarados,
+        o None si el dataset no está particionado o las particiones no están vigentes.
+    """
+    if nombre not in PARTICIONADOS:
+        return None
+    entrada = _vigente(nombre)
+    if entrada is None:
+        return None
+
+    particiones, _ = PARTICIONADOS[nombre]
+    tipos = DATASETS[nombre].tipos
+    esquema_particion = pa.schema([(columna, pa.from_numpy_dtype(tipos[columna])) for columna in particiones])
+    dataset = ds.dataset(RUTA_PARTICIONES / nombre, format='parquet',
+                         partitioning=ds.partitioning(esquema_particion, flavor='hive'))
+
+    columnas = list(columnas or entrada['columnas'])
+    tabla = dataset.to_table(columns=[*columnas, FILA], filter=expresion(filtros))
+    df = tabla.sort_by(FILA).drop_columns([FILA]).to_pandas()
+    return df.astype({columna: tipo for columna, tipo in tipos.items() if columna in df.columns})
+
+
+def anexar(nombre:str, nuevas, huella_anterior:str, huella:str) -> bool:
+    """
+    Escribe las particiones de filas anexadas al CSV fuente (ver ingesta.py).
+
+    Sólo se escribe si las particiones estaban vigentes para el CSV anterior;
+    como la ingesta agrega años nuevos, cada año queda en una carpeta nueva y
+    las existentes no se tocan.
+
+    Parámetros:
+        nombre (str): Nombre del dataset en PARTICIONADOS.
+        nuevas (DataFrame): Filas anexadas, con los tipos del dataset.
+        huella_anterior (str): Huella del CSV antes de anexar.
+        huella (str): Huella del CSV después de anexar.
+
+    Retorna:
+        bool: True si las particiones quedaron vigentes.
+    """
+    if nombre not in PARTICIONADOS or _vigente(nombre, huella_anterior) is None:
+        return False
+
+    manifiesto = leer_manifiesto()
+    tabla = _escribir(nombre, nuevas, manifiesto[nombre]['filas'], 'overwrite_or_ignore')
+    manifiesto[nombre]['sha256'] = huella
+    manifiesto[nombre]['filas'] += tabla.num_rows
+    _escribir_manifiesto(manifiesto)
+    return True
+
+
+def construir(forzar:bool=False) -> dict:
+    """
+    Escribe las particiones de los datasets cuyo CSV cambió.
+
+    Parámetros:
+        forzar (bool, opcional): Reconstruye todas aunque estén vigentes. Por defecto False.
+
+    Retorna:
+        dict: Manifiesto actualizado.
+    """
+    RUTA_PARTICIONES.mkdir(exist_ok=True)
+    manifiesto = leer_manifiesto()
+
+    for nombre in PARTICIONADOS:
+        if not forzar and _vigente(nombre) is not None:
+            continue
+
+        huella = firma(nombre)
+        df = leer_csv(DATASETS[nombre])
+        shutil.rmtree(RUTA_PARTICIONES / nombre, ignore_errors=True)
+        tabla = _escribir(nombre, df, 0, 'error')
+
+        manifiesto[nombre] = {
+            'fuente': DATASETS[nombre].archivo,
+            'sha256': huella,
+            'esquema': DATASETS[nombre].esquema,
+            'columnas': list(df.columns),
+            'filas': tabla.num_rows,
+        }
+        print(f'{DATASETS[nombre].archivo} -> particiones/{nombre} ({tabla.num_rows} filas)')
+
+    _escribir_manifiesto(manifiesto)
+    return manifiesto
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Construye las particiones por año de los datasets de Forbes.')
+    parser.add_argument('--forzar', action='store_true', help='Reconstruye todas las particiones.')
+    construir(parser.parse_args().forzar)
@@ -0,0 +1,213 @@
+"""
+Precalentamiento de las caches del dashboard al arrancar el servidor.
+
+Uso:
+    python app/precalentar.py                         # calcula todas las secciones
+    python app/precalentar.py --procesos 4 --motor webgl
+
+Después de un despliegue los primeros visitantes pagarían la carga de cada
+dataset y el dibujo de cada gráfico, y con varias sesiones a la vez todas
+harían el mismo trabajo en paralelo. El precalentamiento lo hace una sola vez:
+
+1. Se construyen los snapshots y las particiones en el proceso principal,
+   para que los procesos del pool no compitan por escribirlos.
+2. Cada sección se calcula en un pool de procesos, una tarea por sección y
+   hasta un proceso por núcleo: materializa su consulta en el almacén de
+   agregados y prerenderiza su gráfico estático con la misma huella que
+   busca la app (ver artefactos.py). Las secciones que leen directamente los
+   datos sólo necesitan los snapshots del paso anterior. Después se eliminan
+   los gráficos de huellas anteriores.
+3. Se escribe Data/listo.json, la señal de disponibilidad para el
+   orquestador: las caches en disco están completas.
+
+Dentro del servidor: con DATA_INSIDER_PRECALENTAR=1 la primera sesión lanza
+en_segundo_plano(), que ejecuta este script en un proceso aparte (Streamlit
+usa el script de la app como módulo __main__, y los procesos del pool lo
+volverían a ejecutar) y después calcula todas las secciones en el servidor,
+leyendo de las caches en disco ya completas, para llenar las caches en
+memoria. Las sesiones que llegan mientras tanto lo esperan con esperar() en
+lugar de repetir el mismo trabajo.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+
+from datos import RUTA_DATOS
+
+RUTA_LISTO = RUTA_DATOS / 'listo.json'
+ACTIVO = os.environ.get('DATA_INSIDER_PRECALENTAR', '') not in ('', '0')
+
+_listo = threading.Event()
+_bloqueo = threading.Lock()
+_hilo = None
+
+
+def _calentar(clave:str, motor:str) -> tuple:
+    # Se ejecuta en un proceso del pool. Devuelve los segundos y las rutas
+    # de los gráficos vigentes de la sección.
+    from agregados import materializar_consulta
+    from artefactos import construir_seccion, es_estatico
+    from secciones import SECCIONES
+
+    inicio = time.perf_counter()
+    seccion = SECCIONES[clave]
+    rutas = []
+    if seccion.datos is None:
+        materializar_consulta(seccion.consulta or clave)
+    if es_estatico(seccion) and motor == 'matplotlib':
+        rutas = [str(ruta) for ruta in construir_seccion(seccion)]
+    return time.perf_counter() - inicio, rutas
+
+
+def _escribir_listo(estado:dict):
+    temporal = RUTA_LISTO.with_suffix('.tmp')
+    with open(temporal, 'w', encoding='utf-8') as archivo:
+        json.dump(estado, archivo, indent=2)
+    os.replace(temporal, RUTA_LISTO)
+
+
+def precalentar(procesos:int=None, motor:str=None) -> dict:
+    """
+    Calcula todas las secciones en paralelo y deja completas las caches en disco.
+
+    Una sección que falla se informa y no detiene a las demás: la app la
+    calculará en la primera visita, como sin precalentamiento. Debe llamarse
+    desde un programa cuyo módulo principal esté protegido con
+    `if __name__ == '__main__'`, porque el pool importa ese módulo.
+
+    Parámetros:
+        procesos (int, opcional): Procesos del pool. Por defecto uno por
+            núcleo, sin pasar de la cantidad de secciones.
+        motor (str, opcional): Motor de los gráficos de visualizaciones.py.
+            Por defecto visualizaciones.MOTOR.
+
+    Retorna:
+        dict: Estado escrito en Data/listo.json (segundos por sección y errores).
+    """
+    import particiones
+    import snapshots
+    from artefactos import es_estatico, podar
+    from secciones import SECCIONES
+    from visualizaciones import MOTOR
+
+    RUTA_LISTO.unlink(missing_ok=True)
+    inicio = time.perf_counter()
+    motor = motor or MOTOR
+    procesos = min(len(SECCIONES), procesos or os.cpu_count() or 1)
+
+    snapshots.construir()
+    particiones.construir()
+
+    tiempos, errores, vigentes = {}, {}, []
+    contexto = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=procesos, mp_context=contexto) as pool:
+        trabajos = {pool.submit(_calentar, clave, motor): clave for clave in SECCIONES}
+        for trabajo in as_completed(trabajos):
+            clave = trabajos[trabajo]
+            try:
+                segundos, rutas = trabajo.result()
+            except Exception as error:
+                errores[clave] = repr(error)
+                print(f'precalentar: {clave} falló: {error!r}', file=sys.stderr)
+            else:
+                tiempos[clave] = round(segundos, 3)
+                vigentes.extend(rutas)
+
+    # Los gráficos de huellas anteriores de las secciones que se calcularon
+    # ya no se van a leer; los de las que fallaron se conservan.
+    eliminados = []
+    if motor == 'matplotlib':
+        eliminados = podar(vigentes, [clave for clave in tiempos if es_estatico(SECCIONES[clave])])
+
+    estado = {
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'segundos': round(time.perf_counter() - inicio, 3),
+        'procesos': procesos,
+        'motor': motor,
+        'secciones': tiempos,
+        'errores': errores,
+        'graficos_eliminados': len(eliminados),
+    }
+    _escribir_listo(estado)
+    return estado
+
+
+def _precalentar_servidor(procesos:int, motor:str):
+    from secciones import SECCIONES, calcular
+
+    try:
+        comando = [sys.executable, str(Path(__file__).resolve())]
+        if procesos:
+            comando += ['--procesos', str(procesos)]
+        if motor:
+            comando += ['--motor', motor]
+        subprocess.run(comando, check=False)
+
+        for seccion in SECCIONES.values():
+            try:
+                if seccion.controles is None:
+                    calcular(seccion, motor=motor)
+                else:
+                    # Las secciones con controles se calculan con los valores
+                    # de cada sesión; alcanza con tener sus datos en memoria.
+                    seccion.tabla()
+            except Exception as error:
+                print(f'precalentar: {seccion.clave} falló: {error!r}', file=sys.stderr)
+    finally:
+        _listo.set()
+
+
+def en_segundo_plano(procesos:int=None, motor:str=None):
+    """
+    Lanza el precalentamiento en un hilo, una sola vez por proceso.
+
+    Parámetros:
+        procesos (int, opcional): Procesos del pool. Por defecto uno por núcleo.
+        motor (str, opcional): Motor de los gráficos. Por defecto visualizaciones.MOTOR.
+    """
+    global _hilo
+    with _bloqueo:
+        if _hilo is None:
+            _hilo = threading.Thread(target=_precalentar_servidor, args=(procesos, motor),
+                                     name='precalentar', daemon=True)
+            _hilo.start()
+
+
+def listo() -> bool:
+    """Indica si el precalentamiento de este proceso terminó."""
+    return _listo.is_set()
+
+
+def esperar(segundos:float=None) -> bool:
+    """
+    Espera a que termine el precalentamiento de este proceso.
+
+    Parámetros:
+        segundos (float, opcional): Tiempo máximo de espera. Por defecto sin límite.
+
+    Retorna:
+        bool: True si terminó, False si se agotó el tiempo.
+    """
+    return _listo.wait(segundos)
+
+
+if __name__ == '__main__':
+    from visualizaciones import MOTORES
+
+    parser = argparse.ArgumentParser(description='Calcula todas las secciones y llena las caches en disco.')
+    parser.add_argument('--procesos', type=int, help='Procesos del pool. Por defecto uno por núcleo.')
+    parser.add_argument('--motor', choices=MOTORES, help='Motor de los gráficos de visualizaciones.py.')
+    argumentos = parser.parse_args()
+
+    estado = precalentar(argumentos.procesos, argumentos.motor)
+    print(f'{len(estado["secciones"])} secciones en {estado["segundos"]:.1f}s con {estado["procesos"]} procesos'
+          f' -> {RUTA_LISTO}')
+    sys.exit(1 if estado['errores'] else 0)
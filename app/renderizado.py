@@ -0,0 +1,106 @@
+"""
+Cache de figuras ya renderizadas.
+
+Las figuras se serializan una sola vez (PNG o SVG para Matplotlib, JSON para
+Plotly) y se guardan en una cache LRU con límite de memoria, indexada por la
+clave de cada sección junto con la versión de sus datos. En los reruns la app
+muestra directamente los bytes guardados, sin volver a agregar ni a dibujar.
+"""
+import io
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+LIMITE_BYTES = 64 * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class Salida:
+    """
+    Figura serializada lista para mostrarse.
+
+    Atributos:
+        formato (str): 'png', 'svg' o 'plotly'.
+        contenido (bytes o str): Imagen en bytes, SVG o JSON de Plotly.
+    """
+    formato: str
+    contenido: object
+
+    @property
+    def tamano(self) -> int:
+        return len(self.contenido)
+
+
+def serializar(fig, formato:str='png', dpi:int=200, comprimir:bool=False) -> Salida:
+    """
+    Serializa una figura de Matplotlib o Plotly y devuelve la de Matplotlib al pool.
+
+    Parámetros:
+        fig: Figura de Matplotlib o Plotly.
+        formato (str, opcional): 'png' o 'svg' para Matplotlib. Por defecto 'png'.
+        dpi (int, opcional): Resolución de la imagen PNG. Por defecto 200, igual que st.pyplot.
+        comprimir (bool, opcional): Optimiza la compresión del PNG (más lento). Por defecto False.
+
+    Retorna:
+        Salida: Figura serializada.
+    """
+    # Si Matplotlib no se importó todavía, la figura no puede ser suya.
+    matplotlib_figure = sys.modules.get('matplotlib.figure')
+    if matplotlib_figure is None or not isinstance(fig, matplotlib_figure.Figure):
+        return Salida('plotly', fig.to_json())
+
+    from visualizaciones import liberar_figura
+
+    buffer = io.BytesIO()
+    opciones = {'pil_kwargs': {'optimize': True}} if comprimir and formato == 'png' else {}
+    fig.savefig(buffer, format=formato, dpi=dpi, bbox_inches='tight', **opciones)
+    liberar_figura(fig)
+
+    contenido = buffer.getvalue()
+    return Salida(formato, contenido.decode('utf-8') if formato == 'svg' else contenido)
+
+
+class CacheLRU:
+    """
+    Cache LRU segura entre hilos con límite de memoria total.
+
+    Cada valor se guarda junto a su tamaño en bytes; al superar el límite se
+    descartan las entradas usadas hace más tiempo.
+    """
+
+    def __init__(self, limite_bytes:int=LIMITE_BYTES):
+        self.limite_bytes = limite_bytes
+        self.bytes = 0
+        self._entradas = OrderedDict()
+        self._bloqueo = threading.Lock()
+
+    def obtener(self, clave):
+        """Devuelve el valor guardado para la clave, o None si no existe."""
+        with self._bloqueo:
+            entrada = self._entradas.get(clave)
+            if entrada is None:
+                return None
+            self._entradas.move_to_end(clave)
+            return entrada[0]
+
+    def guardar(self, clave, valor, tamano:int):
+        """Guarda un valor y descarta las entradas más antiguas si se supera el límite."""
+        with self._bloqueo:
+            anterior = self._entradas.pop(clave, None)
+            if anterior is not None:
+                self.bytes -= anterior[1]
+            self._entradas[clave] = (valor, tamano)
+            self.bytes += tamano
+            while self.bytes > self.limite_bytes and len(self._entradas) > 1:
+                _, (_, liberado) = self._entradas.popitem(last=False)
+                self.bytes -= liberado
+
+    def vaciar(self):
+        """Descarta todas las entradas."""
+        with self._bloqueo:
+            self._entradas.clear()
+            self.bytes = 0
+
+    def __len__(self):
+        return len(self._entradas)
@@ -0,0 +1,828 @@
+"""
+Registro de las secciones del dashboard.
+
+Cada pregunta de los cuestionarios es un objeto Seccion con su texto, la
+consulta que produce su tabla, el gráfico que la acompaña y su informe. La app
+sólo calcula las secciones de la página activa y guarda el resultado de cada
+una mientras no cambien los datos de los que depende.
+"""
+from dataclasses import dataclass, field
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+import diagnostico
+import visualizaciones
+from acciones import ACCIONES, diarios, lineas_informe, mejores_periodos, resumen_periodico, texto_hover
+from agregados import clave as clave_consulta, resultado
+from animaciones import Carrera
+from artefactos import es_estatico, leer_artefacto
+from cubo import CONTEO, FUENTES as FUENTES_CUBO, MEDIDAS, obtener as obtener_cubo, participacion, variacion_interanual
+from datos import cargar, firma
+from importaciones import diferido
+from indices import CATEGORICAS, NUMERICAS, obtener as obtener_indice
+from muestreo import reducir
+from renderizado import CacheLRU, serializar
+
+px = diferido('plotly.express')
+
+CUESTIONARIO_A = 'Cuestionario A'
+CUESTIONARIO_B = 'Cuestionario B'
+EXTRA = 'Visualizaciones Extra'
+PAGINAS = [CUESTIONARIO_A, CUESTIONARIO_B, EXTRA]
+
+# Categorías que se muestran en la exploración del cubo, las de mayor total.
+CATEGORIAS_CUBO = 10
+VISTAS_CUBO = ('Total', 'Variación interanual (%)', 'Participación (%)')
+
+# Dataset del explorador de empresas y máximo de filas que muestra.
+DATASET_EXPLORADOR = 'forbes_2015_2022'
+FILAS_EXPLORADOR = 5000
+
+# Ancho en píxeles del gráfico de acciones: también es el máximo de puntos por símbolo.
+ANCHO_ACCIONES = 1500
+
+# Define una paleta de colores personalizada
+COLORES_PERSONALIZADOS = [
+    '#1f77b4',  # Azul (frío, alto valor)
+    '#00bfff',  # Celeste
+    '#5dade2',  # Azul intermedio
+    '#aec7e8',  # Azul claro
+    '#17becf',  # Turquesa
+    '#98df8a',  # Verde claro
+    '#2ca02c',  # Verde
+    '#bcbd22',  # Verde-amarillo
+    '#ffd700',  # Amarillo
+    '#ffbb78',  # Naranja claro
+    '#ff7f0e',  # Naranja
+    '#ff9896',  # Rosa claro
+    '#ff1493',  # Fucsia
+    '#d62728',  # Rojo
+    '#c49c94',  # Marrón claro
+    '#8c564b',  # Marrón
+    '#9467bd',  # Violeta
+    '#a55194',  # Violeta oscuro
+    '#e377c2',  # Rosa
+    '#f7b6d2',  # Rosa pálido
+    '#c7c7c7',  # Gris claro
+    '#7f7f7f',  # Gris
+    '#393b79',  # Azul oscuro
+    '#637939',  # Verde oliva
+    '#8c6d31',  # Marrón oliva
+    '#843c39',  # Marrón rojizo
+    '#7b4173',  # Púrpura
+    '#dbdb8d',  # Amarillo pálido
+    '#9edae5'   # Celeste pálido
+]
+
+
+@dataclass
+class Seccion:
+    """
+    Describe una sección del dashboard: pregunta, tabla, gráfico e informe.
+
+    Atributos:
+        clave (str): Identificador único de la sección.
+        pagina (str): Página del dashboard en la que se muestra.
+        pregunta (str): Texto de la pregunta o título de la sección.
+        informe (str o Callable): Texto descriptivo o análisis del gráfico, o
+            función que lo redacta a partir de la tabla.
+        consulta (str): Consulta de consultas.CONSULTAS que produce la tabla.
+            Por defecto la que tiene el mismo nombre que la sección.
+        datos (Callable): Función sin argumentos que produce la tabla, para
+            las secciones que no salen del catálogo de consultas.
+        datasets (tuple): Datasets de los que depende una sección con `datos`.
+        ajuste (Callable): Transformación aplicada a la tabla antes de mostrarla.
+        grafico (str o Callable): Nombre de una función de visualizaciones.py
+            o función que recibe la tabla y devuelve la figura.
+        opciones (dict): Argumentos con los que se llama a la función del gráfico.
+        filas_grafico (int): Cantidad de filas de la tabla que se grafican.
+        controles (Callable): Función que dibuja los widgets de la sección y
+            devuelve un dict con sus valores, que se pasan al gráfico.
+        datos_con_controles (bool): Si es True, los valores de los controles
+            también se pasan a `datos`, para las tablas que dependen de ellos.
+        hechos (Callable): Función que recibe la tabla y devuelve un dict de
+            DataFrames con los datos que cita el informe y no están en la
+            tabla, para exponerlos fuera de la app (ver api.py).
+    """
+    clave: str
+    pagina: str
+    pregunta: str
+    informe: object = ''
+    consulta: str = None
+    datos: Callable = None
+    datasets: tuple = ()
+    ajuste: Callable = None
+    grafico: object = None
+    opciones: dict = field(default_factory=dict)
+    filas_grafico: int = None
+    controles: Callable = None
+    datos_con_controles: bool = False
+    hechos: Callable = None
+
+    def version(self) -> str:
+        """Huella de los datos de los que depende la sección."""
+        if self.datos is None:
+            return clave_consulta(self.consulta or self.clave)
+        return '|'.join(firma(nombre) for nombre in self.datasets)
+
+    def tabla(self, **parametros) -> pd.DataFrame:
+        """Calcula la tabla de la sección, con los valores de sus controles si los usa."""
+        if self.datos is None:
+            df = resultado(self.consulta or self.clave)
+        elif self.datos_con_controles:
+            df = self.datos(**parametros)
+        else:
+            df = self.datos()
+        if self.ajuste is not None:
+            df = self.ajuste(df)
+        return df
+
+    def figura(self, df:pd.DataFrame, motor:str=None, **parametros):
+        """
+        Construye el gráfico de la sección a partir de su tabla y los valores de sus controles.
+
+        `motor` elige cómo se dibujan los gráficos de visualizaciones.py (ver
+        visualizaciones.MOTORES); los demás gráficos lo ignoran.
+        """
+        if self.grafico is None:
+            return None
+        if self.filas_grafico:
+            df = df.head(self.filas_grafico)
+        if callable(self.grafico):
+            return self.grafico(df, **parametros)
+        return getattr(visualizaciones, self.grafico)(data=df, motor=motor, **self.opciones)
+
+    def redactar(self, df:pd.DataFrame) -> str:
+        """Devuelve el informe de la sección, redactándolo a partir de la tabla si hace falta."""
+        return self.informe(df) if callable(self.informe) else self.informe
+
+
+def _abreviar_aramco(df:pd.DataFrame) -> pd.DataFrame:
+    return df.replace({'Empresa': {'Saudi Arabian Oil Company (Saudi Aramco)': 'Saudi Aramco'}})
+
+
+def _controles_acciones() -> dict:
+    """
+    Selector del rango de fechas visible en el gráfico de acciones.
+    """
+    import streamlit as st
+
+    fechas = diarios()['Fecha']
+    inicio, fin = fechas.min().date(), fechas.max().date()
+    desde, hasta = st.slider('Rango de fechas', min_value=inicio, max_value=fin,
+                             value=(inicio, fin), format='DD-MM-YYYY')
+    return {'desde': desde, 'hasta': hasta}
+
+
+def _grafico_acciones(resumen_semanal:pd.DataFrame, desde=None, hasta=None):
+    """
+    Gráfico de líneas del precio de cierre diario con las mejores semanas de compra y venta.
+
+    La serie diaria se reduce con LTTB al ancho del gráfico dentro del rango
+    de fechas pedido, de modo que al acotar el rango se ve con más detalle.
+    """
+    desde = pd.Timestamp(desde) if desde is not None else None
+    hasta = pd.Timestamp(hasta) if hasta is not None else None
+    df_diario = reducir(diarios(), 'Fecha', 'Precio_Cierre', 'Symbol',
+                        puntos=ANCHO_ACCIONES, desde=desde, hasta=hasta)
+    mejor_semana_compra, mejor_semana_venta = mejores_periodos(resumen_semanal)
+    if desde is not None:
+        mejor_semana_compra = mejor_semana_compra.loc[mejor_semana_compra['Fecha'].between(desde, hasta)]
+        mejor_semana_venta = mejor_semana_venta.loc[mejor_semana_venta['Fecha'].between(desde, hasta)]
+
+    fig = px.line(df_diario, x='Fecha', y='Precio_Cierre', color='Symbol',
+                title=f'Precio de cierre diario de las acciones<br>{df_diario["Symbol"].unique().astype(str)}',
+                labels={'Precio_Cierre': 'Precio de Cierre'}, width=ANCHO_ACCIONES, height=500)
+
+    fig.add_trace(go.Scatter(x=mejor_semana_venta['Fecha'], y=mejor_semana_venta['Precio_Cierre_Promedio'],
+                            mode='markers', name='Mejor semana venta', marker=dict(size = 7,color='blue'),
+                            hovertext=texto_hover(mejor_semana_venta),
+                            hoverinfo='text'))
+    fig.add_trace(go.Scatter(x=mejor_semana_compra['Fecha'], y=mejor_semana_compra['Precio_Cierre_Promedio'],
+                            mode='markers', name='Mejor semana compra', marker=dict(size = 7,color='green'),
+                            hovertext=texto_hover(mejor_semana_compra),
+                            hoverinfo='text'))
+
+    return fig
+
+
+def _informe_acciones(resumen_semanal:pd.DataFrame) -> str:
+    """
+    Informe del gráfico de acciones con las mejores semanas calculadas a partir de los datos.
+    """
+    mejor_semana_compra, mejor_semana_venta = mejores_periodos(resumen_semanal)
+    simbolos = ', '.join(resumen_semanal['Symbol'].unique().astype(str))
+    return f'''**Informe del Gráfico: Precio de cierre diario de las acciones (2024):**\n
+Este gráfico de líneas interactivo muestra el precio de cierre diario de
+las acciones de las empresas seleccionadas ({simbolos}) a lo largo del año
+2024. Se han añadido marcadores para indicar la "mejor semana para comprar"
+(precio mínimo semanal) en verde y la "mejor semana para vender" (precio
+máximo semanal) en azul para cada empresa, según los datos históricos de valores.\n
+Mejores Semanas para Comprar:\n
+{lineas_informe(mejor_semana_compra)}\n
+Mejores Semanas para Vender:\n
+{lineas_informe(mejor_semana_venta)}'''
+
+
+def _por_industria_y_ano(medida:str) -> pd.DataFrame:
+    """
+    Suma de una medida por industria y año, leída del cubo (ver cubo.py).
+    """
+    df = obtener_cubo().consultar(('Industria', 'Ano'), (medida,))
+    return df.loc[df[medida] != 0, ['Industria', 'Ano', medida]].reset_index(drop=True)
+
+
+def _controles_cubo() -> dict:
+    """
+    Selectores de la medida, la dimensión y la vista de la exploración del cubo.
+    """
+    import streamlit as st
+
+    columnas = st.columns(3)
+    medida = columnas[0].selectbox('Medida', (CONTEO, *MEDIDAS), index=1, key='cubo_medida')
+    dimension = columnas[1].selectbox('Agrupar por', ('Industria', 'Continente', 'Pais'), key='cubo_dimension')
+    vista = columnas[2].selectbox('Vista', VISTAS_CUBO, key='cubo_vista')
+    return {'medida': medida, 'dimension': dimension, 'vista': vista}
+
+
+def _explorar_cubo(medida:str='Ingresos', dimension:str='Industria', vista:str='Total') -> pd.DataFrame:
+    """
+    Evolución anual de una medida por industria, continente o país, calculada sobre el cubo.
+
+    Retorna:
+        DataFrame: Una fila por año y una columna por cada una de las
+        CATEGORIAS_CUBO categorías de mayor total.
+    """
+    cubo = obtener_cubo()
+    valores = cubo.sumar((dimension, 'Ano'), medida)
+    if vista == 'Variación interanual (%)':
+        tabla = variacion_interanual(valores)
+    elif vista == 'Participación (%)':
+        tabla = participacion(valores)
+    else:
+        tabla = valores
+    mayores = np.argsort(-np.abs(valores).sum(axis=1), kind='stable')[:CATEGORIAS_CUBO]
+    df = pd.DataFrame(tabla[mayores].T.round(2), columns=cubo.categorias[dimension][mayores])
+    df.insert(0, 'Ano', cubo.categorias['Ano'])
+    return df
+
+
+def _grafico_cubo(df:pd.DataFrame, medida:str='Ingresos', dimension:str='Industria', vista:str='Total'):
+    """
+    Gráfico de líneas de la exploración del cubo, una línea por categoría.
+    """
+    etiqueta = medida if vista == 'Total' else f'{vista} de {medida}'
+    return px.line(df, x='Ano', y=list(df.columns[1:]), markers=True,
+                   title=f'{etiqueta} por {dimension}',
+                   labels={'value': etiqueta, 'variable': dimension, 'Ano': 'Año'})
+
+
+def _controles_filtros() -> dict:
+    """
+    Panel de filtros del explorador de empresas en la barra lateral.
+
+    Las opciones salen del índice del dataset (ver indices.py). Un rango
+    numérico sólo filtra si se lo acota, para no excluir las filas sin valor.
+    """
+    import streamlit as st
+
+    indice = obtener_indice(DATASET_EXPLORADOR)
+    panel = st.sidebar.expander('Filtros del explorador de empresas', expanded=True)
+    valores = {columna: tuple(panel.multiselect(columna, indice.valores(columna), key=f'filtro_{columna}'))
+               for columna in CATEGORICAS}
+    rangos = {}
+    for columna in NUMERICAS:
+        minimo, maximo = indice.rango(columna)
+        elegido = panel.slider(columna, min_value=minimo, max_value=maximo, value=(minimo, maximo),
+                               key=f'filtro_{columna}')
+        if tuple(elegido) != (minimo, maximo):
+            rangos[columna] = tuple(elegido)
+    return {'valores': tuple(valores.items()), 'rangos': tuple(rangos.items())}
+
+
+def _explorar_empresas(valores:tuple=(), rangos:tuple=()) -> pd.DataFrame:
+    """
+    Empresas de Forbes 2015-2022 que cumplen los filtros del panel.
+
+    Los filtros se resuelven con los bitmaps y órdenes de indices.py en lugar
+    de recorrer el frame. La cantidad total de filas que los cumplen queda en
+    el atributo 'total' de la tabla, que se recorta a FILAS_EXPLORADOR.
+    """
+    posiciones = obtener_indice(DATASET_EXPLORADOR).filtrar(dict(valores), dict(rangos))
+    df = cargar(DATASET_EXPLORADOR).take(posiciones[:FILAS_EXPLORADOR]).reset_index(drop=True)
+    df.attrs['total'] = len(posiciones)
+    return df
+
+
+def _grafico_explorador(df:pd.DataFrame, **filtros):
+    """
+    Dispersión de activos e ingresos de las empresas filtradas, en WebGL.
+    """
+    return px.scatter(df, x='Activos', y='Ingresos', color='Continente', hover_name='Empresa',
+                      hover_data=['Industria', 'Pais', 'Ano', 'Ganancias'], render_mode='webgl',
+                      title='Activos e ingresos de las empresas filtradas',
+                      labels={'Activos': 'Activos (en millones de dólares)',
+                              'Ingresos': 'Ingresos (en millones de dólares)'})
+
+
+def _informe_explorador(df:pd.DataFrame) -> str:
+    """
+    Informe del explorador con la cantidad de empresas que cumplen los filtros.
+    """
+    total = df.attrs.get('total', len(df))
+    texto = f'{total} registros de empresas cumplen los filtros elegidos en la barra lateral.'
+    if total > len(df):
+        texto += f' La tabla y el gráfico muestran los primeros {len(df)}.'
+    return texto
+
+
+def _grafico_ventas(df_ventas_globales:pd.DataFrame):
+    """
+    Mapa coroplético de los ingresos totales por país.
+    """
+    return px.choropleth(df_ventas_globales, locations="Codigo",
+                        color="Ingresos",
+                        hover_name="Pais",
+                        hover_data={'Ingresos':':.2f'},
+                        color_continuous_scale=px.colors.sequential.Inferno,
+                        title='Total de Ventas Globales x País (2022)')
+
+
+SECCIONES = {
+    seccion.clave: seccion for seccion in [
+    Seccion(
+        clave='top_paises_con_mas_empresas',
+        pagina=CUESTIONARIO_A,
+        pregunta='¿Cuál es el Top 10 de países con más empresas en \
+                Forbes para el periodo indicado?',
+        grafico='bar_char',
+        opciones=dict(
+            x='Pais',
+            y='Empresa',
+            hue='Pais',
+            title='Top 10 de países con más empresas',
+            suptitle='Paises con mayor número de empresas Forbes Global',
+            xlabel='País',
+            ylabel='Número de Empresas',
+            figsize=(15, 8),
+            rotation=25),
+        informe='''**Paises con mayor número de empresas Forbes Global (2022):**\n
+    Este gráfico de barras muestra el Top 10 de países con la mayor cantidad de 
+    empresas incluidas en el ranking Forbes Global del año 2022. Se observa que
+    Estados Unidos lidera la lista con una cantidad significativamente mayor de
+    empresas, seguido por China y Japón. Este gráfico resalta la concentración de
+    grandes corporaciones a nivel global en estos países.'''),
+
+    Seccion(
+        clave='top_paises_empresas_tech',
+        pagina=CUESTIONARIO_A,
+        pregunta='¿Cuál es el Top 4 de países con más empresas \
+    en el área de tecnología y de telecomunicaciones?',
+        grafico='bar_char',
+        opciones=dict(
+            x='Pais',
+            y='Empresa',
+            hue='Pais',
+            title='Top 4 de países con más empresas Tech',
+            suptitle='Paises con mayor número de empresas en la industria\n tecnológica y telecomunicaciones en el año 2022',
+            xlabel='País',
+            ylabel='Número de Empresas',
+            figsize=(15, 8)),
+        informe='''**Paises con mayor número de empresas en la industria tecnológica y telecomunicaciones (2022):**\n
+    Este gráfico de barras presenta el Top 4 de países con la mayor cantidad de 
+    empresas en las áreas de tecnología y telecomunicaciones según el ranking 
+    Forbes Global 2022. Similar al ranking general, Estados Unidos y China ocupan
+    los primeros lugares, lo que indica su dominio en estas industrias estratégicas.
+    Japón y Taiwan también figuran en este top, mostrando su relevancia en el sector
+    tecnológico.'''),
+
+    Seccion(
+        clave='top_empresas_margen_perdida',
+        pagina=CUESTIONARIO_A,
+        pregunta='¿Cuál fue el margen de pérdida de las 5 empresas que presentaron mayores perjuicios considerando el total de pérdidas \
+    registradas en la Industria de los Hoteles, Restaurantes y entretenimiento?',
+        grafico='bar_char',
+        opciones=dict(
+            x='Empresa',
+            y='Margen_de_rentabilidad (%)',
+            hue='Empresa',
+            title='Top 5 de países con mayor margen de perdida',
+            suptitle='Grafico del top paises con el mayor margen de perdida\n en la Industria de los Hoteles, Restaurantes y entretenimiento?',
+            xlabel='Empresa',
+            ylabel='Margen de rentabilidad (%)',
+            figsize=(15, 8),
+            pallete='Reds_r',
+            symbol='%'),
+        informe='''**Margen de Rentabilidad de las Empresas en la Industria de Hoteles, Restaurantes y Entretenimiento (2022):**\n
+    Este gráfico de barras muestra el margen de rentabilidad de las 5 empresas con
+    mayores pérdidas en la industria de Hoteles, Restaurantes y Entretenimiento en
+    el ranking Forbes Global 2022. Se observa que Carnival Corporation presentó el 
+    mayor margen de pérdida, seguido por Las Vegas Sands y Caesars Entertainment.
+    Esto refleja el impacto negativo que enfrentaron estas empresas en el año 2022.'''),
+
+    Seccion(
+        clave='margen_rentabilidad_Asia',
+        ajuste=_abreviar_aramco,
+        pagina=CUESTIONARIO_A,
+        pregunta='Considerando a la Industria Petrolera en Asia,\
+                ¿Cuál o cuáles empresas superaron en más del 20% su margen de rentabilidad?',
+        grafico='bar_char',
+        opciones=dict(
+            x='Empresa',
+            y='Margen_de_rentabilidad (%)',
+            hue='Empresa',
+            title='Empresas que superaron más del 20% su margen de rentabilidad',
+            suptitle='Margen de Rentabilidad de la Industria Petrolera en Asia',
+            xlabel='Empresa',
+            ylabel='Margen de rentabilidad (%)',
+            figsize=(15, 8),
+            pallete='inferno',
+            symbol='%'),
+        informe='''**Margen de Rentabilidad de la Industria Petrolera en Asia (2022):**\n
+    Este gráfico de barras presenta las empresas de la industria petrolera en Asia
+    que superaron en más del 20% su margen de rentabilidad según el ranking 
+    Forbes Global 2022. Empresas como Novatek, Surgutneftegas y CNOOC destacan con
+    altos márgenes de rentabilidad, lo que sugiere un año favorable para estas 
+    compañías en el sector petrolero asiático.'''),
+
+    Seccion(
+        clave='empresas_NA_top_rentabilidad',
+        pagina=CUESTIONARIO_A,
+        pregunta='¿Cuáles fueron las empresas norteamericanas con el mayor porcentaje de rentabilidad por industria?',
+        grafico='hbar_char',
+        opciones=dict(
+            x='Margen_de_rentabilidad (%)',
+            y='Empresa',
+            hue='Industria',
+            title='Empresas con mayor margen de rentabilidad por industria',
+            suptitle='Margen de Rentabilidad de las Empresas por Industria en Norte America (2022)',
+            xlabel='Margen de rentabilidad (%)',
+            ylabel='Empresa',
+            figsize=(15, 8),
+            pallete=COLORES_PERSONALIZADOS,
+            legend=True,
+            symbol='%'),
+        informe='''**Margen de Rentabilidad de las Empresas por Industria en Norte América (2022):**\n
+    Este gráfico de barras horizontal exhibe las empresas norteamericanas con el 
+    mayor porcentaje de rentabilidad por industria en el ranking Forbes Global 2022.
+    Se puede observar la diversidad de industrias representadas y cómo empresas 
+    individuales dentro de cada sector lograron altos márgenes de rentabilidad en 
+    Norteamérica durante este año.'''),
+
+    Seccion(
+        clave='empresas_EU_top_perdidas',
+        pagina=CUESTIONARIO_A,
+        pregunta='Excluyendo a la industria Bancaria,\
+    ¿Cuáles fueron las empresas europeas con mayores \
+    pérdidas registradas por industria a nivel global?',
+        filas_grafico=5,
+        grafico='hbar_char',
+        opciones=dict(
+            x='Ganancias',
+            y='Empresa',
+            hue='Industria',
+            title='Empresas con mayores perdidas por industria (Excluyendo la bancaria)',
+            suptitle='Mayores perdidas generadas a nivel global por empresas europeas (2022)',
+            xlabel='Margen de rentabilidad (%)',
+            ylabel='Empresa',
+            figsize=(15, 8),
+            pallete='Reds_r',
+            legend=True,
+            symbol='$'),
+        informe='''**Mayores pérdidas generadas a nivel global por empresas europeas (2022):** \n
+    Este gráfico de barras horizontal ilustra las empresas europeas 
+    (excluyendo la industria bancaria) que registraron las mayores 
+    pérdidas a nivel global en el ranking Forbes Global 2022.
+    Telecom Italia en telecomunicaciones y Air France-KLM en transporte se destacan
+    con las mayores pérdidas, lo que indica desafíos significativos
+    en estos sectores para las empresas europeas.'''),
+
+    Seccion(
+        clave='bancos_dist_activos_ingresos',
+        pagina=CUESTIONARIO_A,
+        pregunta='¿Cuál fue la distribución de Ingresos y Activos con respecto a las ganancias\
+                de los bancos cuyos activos no superan los 300000 millones de dólares?',
+        grafico='scatter_char',
+        opciones=dict(
+            x='Ingresos',
+            y='Activos',
+            size='Ganancias',
+            hue='Ganancias',
+            sizes=(10, 200),
+            title='Distribución de Ingresos y Activos con respecto a las ganancias\n cuyos activos no superan los 300000$ Millones',
+            suptitle='Ingresos y Activos con respecto a las ganancias de los bancos (2022)',
+            xlabel='Ingresos (en millones de dólares)',
+            ylabel='Activos (en millones de dólares)',
+            figsize=(15, 8)),
+        informe='''Se observa que, en general, a mayor nivel de activos e ingresos,
+                las ganancias tienden a incrementarse, aunque existen bancos con 
+                altos ingresos y activos relativamente bajos. Esto permite identificar
+                bancos eficientes y posibles outliers en el sector.'''),
+
+    Seccion(
+        clave='mejor_semana',
+        pagina=CUESTIONARIO_A,
+        pregunta='Considerando el histórico de valores de las acciones en el año 2022 de las 5 empresas de tu elección, \
+    Indica ¿Cuál fue la mejor semana para comprar y cuál para vender respectivamente?',
+        datos=lambda: resumen_periodico(diarios()),
+        datasets=ACCIONES,
+        grafico=_grafico_acciones,
+        controles=_controles_acciones,
+        informe=_informe_acciones,
+        hechos=lambda df: dict(zip(('mejor_semana_compra', 'mejor_semana_venta'), mejores_periodos(df)))),
+
+    Seccion(
+        clave='top_paises_empresas_15_22',
+        pagina=CUESTIONARIO_B,
+        pregunta='¿Cuál es el Top 10 de países con más empresas en Forbes para el periodo indicado?',
+        grafico='bar_char',
+        opciones=dict(
+            x='Pais',
+            y='Empresa',
+            hue='Pais',
+            title='Top 10 paises con más empresas',
+            suptitle='Cantidad de empresas por pais en el periodo 2015-2022',
+            xlabel='País',
+            ylabel='Número de Empresas',
+            figsize=(15, 8),
+            rotation=10),
+        informe='''**Informe del Gráfico: Cantidad de empresas por país en el periodo 2015-2022:**\n
+    Este gráfico de barras presenta el Top 10 de países con la mayor cantidad
+    de empresas incluidas en el ranking Forbes Global durante el periodo 2015-2022.
+    De manera consistente con el año 2022, Estados Unidos, China y Japón mantienen
+    su liderazgo en la concentración de grandes empresas a lo largo de estos años.'''),
+
+    Seccion(
+        clave='top_paises_empresas_tech_15_22',
+        pagina=CUESTIONARIO_B,
+        pregunta='¿Cuál es el Top 5 de países con más empresas en el área de tecnología y de telecomunicaciones?',
+        grafico='bar_char',
+        opciones=dict(
+            x='Pais',
+            y='Empresa',
+            hue='Pais',
+            title='Top 5 de países con más empresas Tech',
+            suptitle='Cantidad de empresas del Área de tecnología y telecomunicaciones\n por pais en el periodo 2015-2022',
+            xlabel='País',
+            ylabel='Número de Empresas',
+            figsize=(15, 8)),
+        informe='''**Informe del Gráfico: Cantidad de empresas del área de\n
+    tecnología y telecomunicaciones por país en el periodo 2015-2022:
+    Este gráfico de barras muestra el Top 5 de países con la mayor cantidad
+    de empresas en las áreas de tecnología y telecomunicaciones en el ranking
+    Forbes Global durante el periodo 2015-2022. Estados Unidos y China siguen
+    siendo los principales actores, seguidos por Taiwan y Japón, lo que subraya
+    su continua importancia en estos sectores a lo largo del tiempo.'''),
+
+    Seccion(
+        clave='top_perdidas_empresas_HRE',
+        pagina=CUESTIONARIO_B,
+        pregunta='¿Cuál fue el margen de pérdida de las 10 empresas que presentaron mayores perjuicios considerando\
+                el total de pérdidas registradas en la Industria de los Hoteles, Restaurantes y entretenimiento?',
+        grafico='bar_char',
+        opciones=dict(
+            x='Empresa',
+            y='Ganancias',
+            hue='Empresa',
+            title='Top 10 Empresas con mayor margen de perdidas',
+            suptitle='Grafico del margen de perdida de las empresas del Hoteles, Restaurantes y Entretenimiento\n en el periodo 2015-2022',
+            xlabel='Empresa',
+            ylabel='Margen de Rentabilidad',
+            figsize=(15, 8),
+            pallete='coolwarm',
+            rotation=15,
+            symbol='$'),
+        informe='''**Informe del Gráfico: Margen de pérdida de las empresas de la industria de
+    Hoteles, Restaurantes y Entretenimiento en el periodo 2015-2022:**\n
+    Este gráfico de barras visualiza el margen de pérdida de las 10 empresas
+    con mayores perjuicios en la industria de Hoteles, Restaurantes y Entretenimiento
+    durante el periodo 2015-2022. Carnival Corporation y Royal Caribbean Group
+    muestran las mayores pérdidas acumuladas en este sector a lo largo de los
+    años indicados.'''),
+
+    Seccion(
+        clave='top_empresas_ROA',
+        pagina=CUESTIONARIO_B,
+        pregunta='Considerando a la Industria Petrolera en las Américas,\
+                ¿Cuál o cuáles empresas superaron en más del 20% la rentabilidad de sus activos?',
+        grafico='bar_char',
+        opciones=dict(
+            x='Empresa',
+            y='ROA (%)',
+            hue='Empresa',
+            title='Empresas que tienen un ROA superior al 20%',
+            suptitle='Rentabilidad de activos en Empresas Americanas de\n la industria petrolera en el periodo 2015-2022',
+            xlabel='Empresa',
+            ylabel='Rentabilidad de Activos (%)',
+            figsize=(15, 8),
+            pallete='inferno',
+            symbol='%'),
+        informe='''**Informe del Gráfico: Rentabilidad de activos en Empresas
+    Americanas de la industria petrolera en el periodo 2015-2022:**\n
+    Este gráfico de barras presenta las empresas americanas de la industria
+    petrolera que tuvieron una rentabilidad de activos (ROA) superior al 20%
+    en promedio durante el periodo 2015-2022. Weatherford International y Whitecap
+    Resources destacan con un ROA promedio superior a este umbral, indicando una 
+    gestión eficiente de sus activos para generar ganancias.'''),
+
+    Seccion(
+        clave='empresas_EU_top_rentabilidad',
+        pagina=CUESTIONARIO_B,
+        pregunta='¿Cuáles fueron las empresas europeas con el mayor porcentaje de rentabilidad por industria?',
+        grafico='hbar_char',
+        opciones=dict(
+            x='Margen_de_rentabilidad (%)',
+            y='Industria',
+            hue='Empresa',
+            title='Empresas con mayor margen de rentabilidad por industria',
+            suptitle='Margen de Rentabilidad de las Empresas por Industria en Europa\n durante el periodo 2015-2022',
+            xlabel='Margen de rentabilidad (%)',
+            ylabel='Industria',
+            figsize=(15, 8),
+            pallete=COLORES_PERSONALIZADOS,
+            legend=True,
+            symbol='%'),
+        informe='''**Informe del Gráfico: Margen de Rentabilidad de las Empresas
+    por Industria en Europa durante el periodo 2015-2022:**\n
+    Este gráfico de barras horizontal exhibe el margen de rentabilidad
+    de las empresas europeas con el mayor porcentaje de rentabilidad por
+    industria durante el periodo 2015-2022. Se observa la diversidad de 
+    industrias y las empresas líderes en rentabilidad dentro de cada sector
+    en Europa a lo largo de estos años.'''),
+
+    Seccion(
+        clave='empresas_NA_top_perdidas',
+        pagina=CUESTIONARIO_B,
+        pregunta='¿Cuáles fueron las 10 empresas norteamericanas con\
+                mayores pérdidas registradas por industria a nivel global?',
+        grafico='bar_char',
+        opciones=dict(
+            x='Empresa',
+            y='Ganancias',
+            hue='Industria',
+            title='Top 10 empresas con mayores perdidas',
+            suptitle='Margen de Perdidas de las Empresas Norteamericanas por Industria\n durante el periodo 2015-2022',
+            xlabel='Empresa',
+            ylabel='Perdidas',
+            figsize=(15, 8),
+            legend=True,
+            symbol='$'),
+        informe='''**Informe del Gráfico: Margen de Perdidas de las Empresas
+    Norteamericanas por Industria durante el periodo 2015-2022:**\n
+    Este gráfico de barras muestra las 10 empresas norteamericanas
+    con las mayores pérdidas registradas por industria a nivel global
+    durante el periodo 2015-2022. Empresas en sectores como
+    Oil & Gas Operations, Conglomerates y Transportation figuran
+    entre las que experimentaron mayores pérdidas en este periodo.'''),
+
+    Seccion(
+        clave='bancos_dist_activos_ingresos_15_22',
+        pagina=CUESTIONARIO_B,
+        pregunta='¿Cuál fue la distribución de Ingresos y Activos con respecto\
+                a las ganancias de los bancos cuyos activos no superan los 150000 millones de dólares?',
+        grafico='scatter_char',
+        opciones=dict(
+            x='Ingresos',
+            y='Activos',
+            size='Ganancias',
+            hue='Ganancias',
+            sizes=(10, 200),
+            title='Distribución de Ingresos y Activos con respecto a las ganancias\n cuyos activos no superan los 150000 millones de dólares',
+            suptitle='Distribución de Ingresos y Activos con respecto a las ganancias de los bancos (2022)',
+            xlabel='Ingresos (en millones de dólares)',
+            ylabel='Activos (en millones de dólares)',
+            figsize=(15, 8)),
+        informe='''Se puede observar un crecimiento en los ingresos
+    a medida que los activos superan los 50000 millones de dólares
+    alcanzando hasta 15000 millones de dolares. tambien se puede
+    observar algunos datos con activos menores a 50000 millones
+    presentando ingresos muy elevados. Sin embargo, no se aprecia
+    un aumento significativo en las ganancias'''),
+
+    Seccion(
+        clave='valor_mercado_industria',
+        pagina=EXTRA,
+        pregunta='Valor de mercado por industria a lo largo de los años',
+        datos=lambda: _por_industria_y_ano('Valor_de_mercado'),
+        datasets=FUENTES_CUBO,
+        grafico=Carrera('Industria', 'Valor_de_mercado', 'Ano',
+                        titulo='Valor de mercado por industria',
+                        etiqueta='Valor de mercado (en millones de dólares)')),
+
+    Seccion(
+        clave='empleados_industria',
+        pagina=EXTRA,
+        pregunta='Empleados por industria a lo largo de los años',
+        datos=lambda: _por_industria_y_ano('Empleados'),
+        datasets=FUENTES_CUBO,
+        grafico=Carrera('Industria', 'Empleados', 'Ano',
+                        titulo='Empleados por industria',
+                        etiqueta='Cantidad de empleados')),
+
+    Seccion(
+        clave='explorar_cubo',
+        pagina=EXTRA,
+        pregunta='Evolución por industria, continente y país (2015-2022)',
+        datos=_explorar_cubo,
+        datasets=FUENTES_CUBO,
+        controles=_controles_cubo,
+        datos_con_controles=True,
+        grafico=_grafico_cubo,
+        informe='''Se puede elegir una medida, cómo agruparla y la vista: el total de
+    cada año, la variación respecto del año anterior o la participación en
+    el total del año. Se muestran las 10 categorías de mayor total en el periodo;
+    los valores se calculan sobre el cubo precalculado, sin recorrer las
+    filas de Forbes en cada cambio.'''),
+
+    Seccion(
+        clave='explorar_empresas',
+        pagina=EXTRA,
+        pregunta='Explorador de empresas Forbes (2015-2022)',
+        datos=_explorar_empresas,
+        datasets=(DATASET_EXPLORADOR,),
+        controles=_controles_filtros,
+        datos_con_controles=True,
+        grafico=_grafico_explorador,
+        informe=_informe_explorador),
+
+    Seccion(
+        clave='ventas_globales',
+        pagina=EXTRA,
+        pregunta='Ventas Globales por País (2022)',
+        datos=lambda: cargar('ventas_globales'),
+        datasets=('ventas_globales',),
+        grafico=_grafico_ventas,
+        informe='''Segun los datos, podemos observar que la mayoria de los paises
+    se mantienen con ventas globales por debajo de los 100000 millones 
+    de dolares, mientras China y Estados Unidos se destacan con ventas
+    por encima de los 800000 millones de dolares y 1400000 millones de 
+    dolares respectivamente.'''),
+    ]
+}
+
+_resultados = CacheLRU()
+
+
+def secciones_de(pagina:str) -> list:
+    """
+    Devuelve las secciones registradas para una página, en orden.
+
+    Parámetros:
+        pagina (str): Nombre de la página.
+
+    Retorna:
+        list: Secciones de la página.
+    """
+    return [seccion for seccion in SECCIONES.values() if seccion.pagina == pagina]
+
+
+def calcular(seccion:Seccion, motor:str=None, **parametros) -> tuple:
+    """
+    Calcula la tabla y la figura serializada de una sección bajo demanda.
+
+    El resultado se guarda en una cache LRU por sección junto con la versión
+    de los datos de los que depende, de modo que los reruns y las demás
+    sesiones no vuelven a agregar ni a dibujar mientras los datos no cambien.
+    Si existe un gráfico prerenderizado vigente (ver artefactos.py) se usa
+    ese archivo en lugar de dibujarlo.
+
+    Parámetros:
+        seccion (Seccion): Sección a calcular.
+        motor (str, opcional): Motor de los gráficos de visualizaciones.py.
+            Por defecto visualizaciones.MOTOR.
+        **parametros: Valores de los controles de la sección.
+
+    Retorna:
+        tuple: (DataFrame, Salida o None, informe).
+    """
+    version = seccion.version()
+    motor = (motor or visualizaciones.MOTOR) if es_estatico(seccion) else None
+    clave = (seccion.clave, motor, tuple(sorted(parametros.items())))
+
+    entrada = _resultados.obtener(clave)
+    diagnostico.contar('render', entrada is not None and entrada[0] == version)
+    if entrada is not None and entrada[0] == version:
+        return entrada[1:]
+
+    with diagnostico.medir('tabla'):
+        df = seccion.tabla(**parametros)
+    salida = None
+    # Los gráficos prerenderizados son imágenes de Matplotlib.
+    if not parametros and motor == 'matplotlib':
+        salida = leer_artefacto(seccion, df)
+        diagnostico.contar('artefactos', salida is not None)
+    if salida is None:
+        with diagnostico.medir('grafico'):
+            fig = seccion.figura(df, motor=motor, **parametros)
+        with diagnostico.medir('serializar'):
+            salida = serializar(fig) if fig is not None else None
+
+    informe = seccion.redactar(df)
+
+    tamano = int(df.memory_usage(deep=True).sum()) + (salida.tamano if salida else 0) + len(informe)
+    _resultados.guardar(clave, (version, df, salida, informe), tamano)
+
+    return df, salida, informe
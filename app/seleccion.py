@@ -0,0 +1,146 @@
+"""
+Selección de las k mejores filas de cada grupo según una métrica.
+
+Responde preguntas del tipo "la empresa con mayor margen de cada industria"
+conservando la fila completa de la ganadora. Agregar cada columna por
+separado (por ejemplo groupby(...)[['Empresa', 'Margen']].max()) no sirve:
+devuelve el máximo de cada columna de forma independiente, y la Empresa
+resultante es el nombre alfabéticamente mayor del grupo, no la dueña del
+valor.
+
+Los grupos se identifican con códigos enteros (los de la categoría si la
+clave es categórica) y la selección no ordena las filas: para k chico se
+hacen k pasadas lineales que eligen en cada una el mejor valor restante de
+cada grupo (máximo por grupo y primera fila que lo alcanza), con un costo
+proporcional a k veces la cantidad de filas. Para k grande las filas se
+separan por grupo y en cada uno se eligen las k mejores con una selección
+parcial (np.partition); sólo esas k se ordenan.
+"""
+import numpy as np
+import pandas as pd
+
+# Hasta este k conviene hacer k pasadas lineales en lugar de ordenar.
+PASADAS_MAXIMAS = 8
+
+
+def codigos_de_grupo(df:pd.DataFrame, grupos) -> tuple:
+    """
+    Asigna a cada fila el código entero de su grupo.
+
+    Parámetros:
+        df (DataFrame): Datos a agrupar.
+        grupos (list): Columnas de agrupación.
+
+    Retorna:
+        tuple: (códigos por fila, -1 si alguna clave es nula; cantidad de grupos).
+        Los códigos siguen el orden en que groupby devuelve los grupos.
+    """
+    grupos = list(grupos)
+    if len(grupos) == 1 and isinstance(df[grupos[0]].dtype, pd.CategoricalDtype):
+        columna = df[grupos[0]]
+        return columna.cat.codes.to_numpy(dtype=np.int64), len(columna.cat.categories)
+    codigos = df.groupby(grupos, observed=True, sort=True).ngroup().fillna(-1).to_numpy(dtype=np.int64)
+    return codigos, int(codigos.max()) + 1 if len(codigos) else 0
+
+
+def _mejor_por_grupo(codigos:np.ndarray, valores:np.ndarray, cantidad:int) -> np.ndarray:
+    # Posición de la primera fila con el mayor valor de cada grupo.
+    mejor = np.full(cantidad, -np.inf)
+    np.maximum.at(mejor, codigos, valores)
+    candidatas = np.flatnonzero(valores == mejor[codigos])
+    primera = np.full(cantidad, -1, dtype=np.int64)
+    # Al asignar en orden inverso, la primera fila de cada grupo es la que queda.
+    primera[codigos[candidatas[::-1]]] = candidatas[::-1]
+    return primera[primera >= 0]
+
+
+def _por_segmentos(codigos:np.ndarray, valores:np.ndarray, k:int) -> np.ndarray:
+    # Separa las filas por grupo (orden estable, así cada segmento queda en
+    # el orden original). Los grupos de hasta k filas se conservan enteros y
+    # en los demás np.partition encuentra el k-ésimo mayor valor: sólo se
+    # ordenan las filas elegidas.
+    # Con códigos de 16 bits NumPy ordena de forma estable con radix sort.
+    compactos = codigos.astype(np.int16) if codigos.max() < 2 ** 15 else codigos
+    orden = np.argsort(compactos, kind='stable')
+    limites = np.flatnonzero(np.diff(compactos[orden])) + 1
+    inicios, fines = np.r_[0, limites], np.r_[limites, len(orden)]
+
+    conservar = np.ones(len(orden), dtype=bool)
+    for inicio, fin in zip(inicios[fines - inicios > k], fines[fines - inicios > k]):
+        propios = valores[orden[inicio:fin]]
+        umbral = np.partition(propios, len(propios) - k)[len(propios) - k]
+        elegidos = propios >= umbral
+        # Entre los empatados con el umbral entran los primeros.
+        faltan = k - np.count_nonzero(propios > umbral)
+        elegidos[np.flatnonzero(propios == umbral)[faltan:]] = False
+        conservar[inicio:fin] = elegidos
+
+    elegidas = orden[conservar]
+    return elegidas[np.lexsort((elegidas, -valores[elegidas], codigos[elegidas]))]
+
+
+def posiciones_por_grupo(codigos:np.ndarray, valores:np.ndarray, k:int=1, mayores:bool=True) -> np.ndarray:
+    """
+    Elige las posiciones de las k filas con mayor (o menor) valor de cada grupo.
+
+    Las filas con código -1 o valor nulo se ignoran. Ante empates gana la
+    fila que aparece primero, como en idxmax.
+
+    Parámetros:
+        codigos (ndarray): Código de grupo de cada fila (ver codigos_de_grupo).
+        valores (ndarray): Métrica de cada fila.
+        k (int, opcional): Filas por grupo. Por defecto 1.
+        mayores (bool, opcional): True para los mayores valores, False para los menores.
+
+    Retorna:
+        ndarray: Posiciones de las filas elegidas, ordenadas por grupo y,
+        dentro de cada grupo, de la mejor a la peor.
+    """
+    valores = np.asarray(valores, dtype=np.float64)
+    if not mayores:
+        valores = -valores
+    filas = np.flatnonzero((codigos >= 0) & ~np.isnan(valores))
+    if len(filas) == 0 or k < 1:
+        return np.empty(0, dtype=np.int64)
+    codigos, valores = codigos[filas], valores[filas]
+    cantidad = int(codigos.max()) + 1
+
+    if k > PASADAS_MAXIMAS:
+        return filas[_por_segmentos(codigos, valores, k)]
+
+    elegidas, puestos = [], []
+    restantes = np.arange(len(filas))
+    for puesto in range(k):
+        mejores = restantes[_mejor_por_grupo(codigos[restantes], valores[restantes], cantidad)]
+        elegidas.append(mejores)
+        puestos.append(np.full(len(mejores), puesto))
+        if puesto + 1 < k:
+            quedan = np.ones(len(filas), dtype=bool)
+            quedan[np.concatenate(elegidas)] = False
+            restantes = np.flatnonzero(quedan)
+            if len(restantes) == 0:
+                break
+
+    elegidas, puestos = np.concatenate(elegidas), np.concatenate(puestos)
+    orden = np.lexsort((puestos, codigos[elegidas]))
+    return filas[elegidas[orden]]
+
+
+def por_grupo(df:pd.DataFrame, grupos, metrica:str, k:int=1, mayores:bool=True) -> pd.DataFrame:
+    """
+    Devuelve las filas completas de las k mejores de cada grupo según una métrica.
+
+    Parámetros:
+        df (DataFrame): Datos.
+        grupos (list): Columnas de agrupación.
+        metrica (str): Columna numérica por la que se eligen las filas.
+        k (int, opcional): Filas por grupo. Por defecto 1.
+        mayores (bool, opcional): True para los mayores valores, False para los menores.
+
+    Retorna:
+        DataFrame: Filas elegidas con todas sus columnas y su índice original,
+        ordenadas por grupo y, dentro de cada grupo, de la mejor a la peor.
+    """
+    codigos, _ = codigos_de_grupo(df, grupos)
+    valores = df[metrica].to_numpy(dtype=np.float64, na_value=np.nan)
+    return df.take(posiciones_por_grupo(codigos, valores, k, mayores))
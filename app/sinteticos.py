@@ -0,0 +1,272 @@
+"""
+Datos sintéticos a escala con los mismos esquemas y archivos que la carpeta Data.
+
+Uso:
+    python app/sinteticos.py escalar destino --escala 10
+    python app/sinteticos.py generar destino --empresas 50000 --simbolos 100 --anos-acciones 20
+
+Ambas funciones escriben en otra carpeta todos los CSV que lee la app, de
+modo que cualquier cargador o gráfico se puede probar con más datos apuntando
+DATA_INSIDER_DATOS a esa carpeta.
+
+escalar() multiplica las filas de los datos de ejemplo: cada empresa de
+Forbes se replica `escala` veces con un sufijo en el nombre y los montos
+perturbados, y cada acción tiene `escala` años de historia generados a partir
+de sus retornos diarios reales. Las respuestas de los cuestionarios cambian
+poco, así que sirve para comparar rendimiento.
+
+generar() no copia filas: ajusta un perfil a los datos de ejemplo (frecuencia
+conjunta de industria, país y continente, distribución lognormal conjunta de
+ingresos, activos y valor de mercado, márgenes observados, empleados y
+volatilidad diaria de las acciones) y produce cualquier cantidad de empresas
+por año y de símbolos por cantidad de años con esas características. Las
+empresas persisten entre años con variaciones anuales, el ranking se ordena
+por valor de mercado y los precios siguen un movimiento browniano geométrico.
+"""
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from acciones import ACCIONES
+from datos import COLUMNAS_DINERO, DATASETS, leer_csv
+
+PRECIOS = ['Precio_Apertura', 'Precio_Cierre', 'Precio_Maximo', 'Precio_Minimo']
+
+
+def _replicar_forbes(df:pd.DataFrame, escala:int, rng) -> pd.DataFrame:
+    copias = [df]
+    for copia in range(1, escala):
+        replica = df.copy()
+        replica['Empresa'] = replica['Empresa'] + f' {copia}'
+        # El mismo factor para todos los montos de una fila conserva los márgenes.
+        factor = rng.lognormal(0, 0.1, len(replica)).astype('float32')
+        replica[COLUMNAS_DINERO] = replica[COLUMNAS_DINERO].mul(factor, axis=0).round(1)
+        copias.append(replica)
+    return pd.concat(copias, ignore_index=True)
+
+
+def _replicar_empleados(df:pd.DataFrame, escala:int) -> pd.DataFrame:
+    copias = [df]
+    for copia in range(1, escala):
+        copias.append(df.assign(Empresa=df['Empresa'] + f' {copia}'))
+    return pd.concat(copias, ignore_index=True)
+
+
+def _extender_acciones(df:pd.DataFrame, escala:int, rng) -> pd.DataFrame:
+    if escala == 1:
+        return df
+
+    # Los años anteriores se generan remuestreando los retornos diarios del
+    # año real y encadenándolos hacia atrás desde el primer precio conocido.
+    df = df.sort_values('Fecha', ignore_index=True)
+    fechas = pd.bdate_range(end=df['Fecha'].iloc[0] - pd.Timedelta(days=1), periods=len(df) * (escala - 1))
+    retornos = np.log(df['Precio_Cierre'].to_numpy(dtype='float64'))
+    retornos = np.diff(retornos)
+    caminata = np.cumsum(rng.choice(retornos, len(fechas))[::-1])[::-1]
+    cierre = df['Precio_Cierre'].iloc[0] * np.exp(-caminata)
+
+    rango = (df['Precio_Maximo'] / df['Precio_Minimo']).to_numpy(dtype='float64')
+    amplitud = rng.choice(rango, len(fechas))
+    apertura = cierre * np.exp(rng.choice(retornos, len(fechas)))
+    historia = pd.DataFrame({
+        'Symbol': df['Symbol'].iloc[0],
+        'Fecha': fechas,
+        'Precio_Apertura': apertura,
+        'Precio_Cierre': cierre,
+        'Precio_Maximo': np.maximum(apertura, cierre) * np.sqrt(amplitud),
+        'Precio_Minimo': np.minimum(apertura, cierre) / np.sqrt(amplitud),
+    }).round(dict.fromkeys(PRECIOS, 4))
+    return pd.concat([historia, df], ignore_index=True)
+
+
+def escalar(destino, escala:int=1, semilla:int=0) -> Path:
+    """
+    Escribe una copia escalada de todos los datasets en otra carpeta.
+
+    Parámetros:
+        destino (str o Path): Carpeta de destino; se crea si no existe.
+        escala (int, opcional): Factor de filas. Por defecto 1 (copia exacta).
+        semilla (int, opcional): Semilla del generador aleatorio. Por defecto 0.
+
+    Retorna:
+        Path: Carpeta de destino, lista para usarse como DATA_INSIDER_DATOS.
+    """
+    destino = Path(destino)
+    destino.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(semilla)
+
+    def escribir(nombre, df):
+        df.to_csv(destino / DATASETS[nombre].archivo, index=False, date_format='%Y-%m-%d')
+
+    for nombre in ('forbes_2022', 'forbes_2015_2022'):
+        escribir(nombre, _replicar_forbes(leer_csv(DATASETS[nombre]), escala, rng))
+    escribir('empleados', _replicar_empleados(leer_csv(DATASETS['empleados']), escala))
+
+    for nombre in ACCIONES:
+        escribir(nombre, _extender_acciones(leer_csv(DATASETS[nombre]), escala, rng))
+
+    return destino
+
+
+def perfil() -> dict:
+    """
+    Resume las distribuciones de los datos de ejemplo que imita generar().
+
+    Retorna:
+        dict: Frecuencias de (Industria, Pais, Codigo, Continente), media y
+        covarianza del logaritmo de Ingresos, Activos y Valor_de_mercado,
+        márgenes observados, empleados y parámetros diarios de las acciones.
+    """
+    forbes = leer_csv(DATASETS['forbes_2015_2022'])
+    montos = forbes[['Ingresos', 'Activos', 'Valor_de_mercado']].to_numpy(dtype='float64')
+    logaritmos = np.log(montos[(montos > 0).all(axis=1)])
+    margen = (forbes['Ganancias'] / forbes['Ingresos']).to_numpy(dtype='float64')
+    margen = margen[np.isfinite(margen)]
+
+    categorias = (forbes.groupby(['Industria', 'Pais', 'Codigo', 'Continente'], observed=True)
+                        .size().rename('filas').reset_index())
+
+    acciones = pd.concat([leer_csv(DATASETS[nombre]) for nombre in ACCIONES], ignore_index=True)
+    acciones = acciones.sort_values(['Symbol', 'Fecha'])
+    cierre = np.log(acciones['Precio_Cierre'].to_numpy(dtype='float64'))
+    mismo = acciones['Symbol'].to_numpy()[1:] == acciones['Symbol'].to_numpy()[:-1]
+    retornos = np.diff(cierre)[mismo]
+
+    return {
+        'categorias': categorias,
+        'media': logaritmos.mean(axis=0),
+        'covarianza': np.cov(logaritmos, rowvar=False),
+        'margenes': np.clip(margen, *np.quantile(margen, [0.01, 0.99])),
+        'empleados': leer_csv(DATASETS['empleados'])['Empleados'].to_numpy(),
+        'proporcion_empleados': len(leer_csv(DATASETS['empleados'])) / len(forbes),
+        'volatilidad': (retornos.std() * 0.3, retornos.std() * 1.5),
+        'deriva': retornos.mean(),
+        'precio': np.log(acciones['Precio_Cierre'].to_numpy(dtype='float64')),
+    }
+
+
+def _generar_forbes(datos:dict, empresas:int, anos, rng) -> pd.DataFrame:
+    categorias = datos['categorias']
+    elegidas = categorias.iloc[rng.choice(len(categorias), empresas, p=categorias['filas'] / categorias['filas'].sum())]
+    nombres = np.char.add('Empresa ', np.arange(empresas).astype(str))
+    base = rng.multivariate_normal(datos['media'], datos['covarianza'], empresas)
+    margen = rng.choice(datos['margenes'], empresas)
+
+    anos_generados = []
+    for ano in anos:
+        # Cada año las empresas cambian de tamaño y de margen de forma gradual.
+        base = base + rng.normal(0, 0.15, base.shape)
+        margen = np.clip(margen + rng.normal(0, 0.03, empresas), -1, 0.9)
+        ingresos, activos, valor = np.round(np.exp(base), 1).T
+        ganancias = np.round(ingresos * margen, 1)
+
+        df = pd.DataFrame({
+            'Empresa': nombres,
+            'Industria': elegidas['Industria'].to_numpy(),
+            'Pais': elegidas['Pais'].to_numpy(),
+            'Ingresos': ingresos,
+            'Ganancias': ganancias,
+            'Activos': activos,
+            'Valor_de_mercado': valor,
+            'Margen_de_rentabilidad (%)': np.round(ganancias / ingresos * 100, 2),
+            'ROA (%)': np.round(ganancias / activos * 100, 2),
+            'Ano': ano,
+            'Codigo': elegidas['Codigo'].to_numpy(),
+            'Continente': elegidas['Continente'].to_numpy(),
+        })
+        df.insert(0, 'Rank_nr', df['Valor_de_mercado'].rank(ascending=False, method='first').astype('int32'))
+        anos_generados.append(df.sort_values('Rank_nr'))
+
+    return pd.concat(anos_generados, ignore_index=True)
+
+
+def _generar_acciones(datos:dict, simbolo:str, fechas, rng) -> pd.DataFrame:
+    volatilidad = rng.uniform(*datos['volatilidad'])
+    retornos = rng.normal(datos['deriva'], volatilidad, len(fechas))
+    cierre = np.exp(rng.choice(datos['precio']) + np.cumsum(retornos))
+    apertura = cierre * np.exp(-retornos + rng.normal(0, volatilidad * 0.5, len(fechas)))
+    amplitud = np.exp(np.abs(rng.normal(0, volatilidad * 0.6, (2, len(fechas)))))
+
+    return pd.DataFrame({
+        'Symbol': simbolo,
+        'Fecha': fechas,
+        'Precio_Apertura': apertura,
+        'Precio_Cierre': cierre,
+        'Precio_Maximo': np.maximum(apertura, cierre) * amplitud[0],
+        'Precio_Minimo': np.minimum(apertura, cierre) / amplitud[1],
+    }).round(dict.fromkeys(PRECIOS, 4))
+
+
+def generar(destino, empresas:int=2000, anos=range(2015, 2023), simbolos:int=5,
+            anos_acciones:int=1, fin:str='2024-12-31', semilla:int=0) -> Path:
+    """
+    Genera datos sintéticos con las características de los datos de ejemplo.
+
+    Parámetros:
+        destino (str o Path): Carpeta de destino; se crea si no existe.
+        empresas (int, opcional): Empresas del ranking por año. Por defecto 2000.
+        anos (iterable, opcional): Años del ranking. Por defecto 2015 a 2022.
+        simbolos (int, opcional): Cantidad de acciones. Por defecto 5.
+        anos_acciones (int, opcional): Años de precios diarios por acción. Por defecto 1.
+        fin (str, opcional): Último día de cotización. Por defecto '2024-12-31'.
+        semilla (int, opcional): Semilla del generador aleatorio. Por defecto 0.
+
+    Retorna:
+        Path: Carpeta de destino, lista para usarse como DATA_INSIDER_DATOS.
+    """
+    destino = Path(destino)
+    destino.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(semilla)
+    datos = perfil()
+
+    def escribir(nombre, df):
+        df.to_csv(destino / DATASETS[nombre].archivo, index=False, date_format='%Y-%m-%d')
+
+    forbes = _generar_forbes(datos, empresas, list(anos), rng)
+    escribir('forbes_2015_2022', forbes)
+    escribir('forbes_2022', forbes.loc[forbes['Ano'] == forbes['Ano'].max()])
+
+    con_empleados = forbes.sample(frac=datos['proporcion_empleados'], random_state=semilla).sort_index()
+    escribir('empleados', con_empleados[['Rank_nr', 'Empresa', 'Ano']].assign(
+        Empleados=rng.choice(datos['empleados'], len(con_empleados))))
+
+    # Los símbolos se reparten entre los archivos por símbolo que lee la app.
+    fechas = pd.bdate_range(end=fin, periods=252 * anos_acciones)
+    nombres = [f'SIM{numero:04d}' for numero in range(simbolos)]
+    diarios = {nombre: [] for nombre in ACCIONES}
+    for numero, simbolo in enumerate(nombres):
+        diarios[ACCIONES[numero % len(ACCIONES)]].append(_generar_acciones(datos, simbolo, fechas, rng))
+
+    for nombre, partes in diarios.items():
+        escribir(nombre, pd.concat(partes, ignore_index=True) if partes
+                 else _generar_acciones(datos, 'SIM', fechas[:0], rng))
+
+    return destino
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Genera datos sintéticos con los esquemas de la app.')
+    subcomandos = parser.add_subparsers(dest='comando', required=True)
+
+    escala = subcomandos.add_parser('escalar', help='Replica los datos de ejemplo.')
+    escala.add_argument('destino', help='Carpeta de destino.')
+    escala.add_argument('--escala', type=int, default=1, help='Factor de filas. Por defecto 1.')
+    escala.add_argument('--semilla', type=int, default=0, help='Semilla aleatoria. Por defecto 0.')
+
+    generacion = subcomandos.add_parser('generar', help='Genera datos con las distribuciones de los de ejemplo.')
+    generacion.add_argument('destino', help='Carpeta de destino.')
+    generacion.add_argument('--empresas', type=int, default=2000, help='Empresas por año. Por defecto 2000.')
+    generacion.add_argument('--desde', type=int, default=2015, help='Primer año del ranking. Por defecto 2015.')
+    generacion.add_argument('--hasta', type=int, default=2022, help='Último año del ranking. Por defecto 2022.')
+    generacion.add_argument('--simbolos', type=int, default=5, help='Cantidad de acciones. Por defecto 5.')
+    generacion.add_argument('--anos-acciones', type=int, default=1, help='Años de precios diarios. Por defecto 1.')
+    generacion.add_argument('--semilla', type=int, default=0, help='Semilla aleatoria. Por defecto 0.')
+
+    argumentos = parser.parse_args()
+    if argumentos.comando == 'escalar':
+        escalar(argumentos.destino, argumentos.escala, argumentos.semilla)
+    else:
+        generar(argumentos.destino, argumentos.empresas, range(argumentos.desde, argumentos.hasta + 1),
+                argumentos.simbolos, argumentos.anos_acciones, semilla=argumentos.semilla)
@@ -0,0 +1,129 @@
+"""
+Snapshots columnares (Arrow IPC) de los CSV de la carpeta Data.
+
+Uso:
+    python app/snapshots.py            # reconstruye los snapshots desactualizados
+    python app/snapshots.py --forzar   # reconstruye todos
+
+Cada CSV se convierte a un archivo .arrow sin compresión con el esquema
+declarado en datos.DATASETS, para que pueda abrirse con memory-map. El archivo
+manifest.json guarda la huella sha256 del CSV fuente y del esquema de cada
+snapshot; la app sólo usa un snapshot cuando ambas coinciden con las actuales.
+"""
+import argparse
+import json
+import os
+
+import pyarrow as pa
+
+from datos import DATASETS, RUTA_DATOS, Dataset, firma, leer_csv
+
+RUTA_SNAPSHOTS = RUTA_DATOS / 'snapshots'
+RUTA_MANIFIESTO = RUTA_SNAPSHOTS / 'manifest.json'
+
+
+def leer_manifiesto() -> dict:
+    """
+    Lee el manifiesto de snapshots.
+
+    Retorna:
+        dict: Entradas del manifiesto por nombre de dataset, vacío si no existe.
+    """
+    try:
+        with open(RUTA_MANIFIESTO, encoding='utf-8') as archivo:
+            return json.load(archivo)
+    except FileNotFoundError:
+        return {}
+
+
+def _escribir_manifiesto(manifiesto:dict):
+    temporal = RUTA_MANIFIESTO.with_suffix('.tmp')
+    with open(temporal, 'w', encoding='utf-8') as archivo:
+        json.dump(manifiesto, archivo, indent=2, sort_keys=True)
+    os.replace(temporal, RUTA_MANIFIESTO)
+
+
+def leer_snapshot(dataset:Dataset, huella:str):
+    """
+    Lee el snapshot Arrow de un dataset si está vigente.
+
+    Parámetros:
+        dataset (Dataset): Descripción del dataset.
+        huella (str): Huella sha256 actual del CSV fuente.
+
+    Retorna:
+        DataFrame o None: Datos del snapshot, o None si no existe o está desactualizado.
+    """
+    entrada = leer_manifiesto().get(dataset.nombre)
+    if entrada is None or entrada['sha256'] != huella or entrada['esquema'] != dataset.esquema:
+        return None
+
+    ruta = RUTA_SNAPSHOTS / entrada['archivo']
+    try:
+        with pa.memory_map(str(ruta)) as fuente:
+            tabla = pa.ipc.open_file(fuente).read_all()
+    except (FileNotFoundError, pa.ArrowInvalid):
+        return None
+
+    return tabla.to_pandas(split_blocks=True)
+
+
+def construir(forzar:bool=False) -> dict:
+    """
+    Convierte a Arrow IPC cada CSV de la carpeta Data cuyo snapshot no esté vigente.
+
+    Los CSV que no están registrados en DATASETS se convierten con los tipos
+    que infiere pandas.
+
+    Parámetros:
+        forzar (bool, opcional): Reconstruye todos los snapshots. Por defecto False.
+
+    Retorna:
+        dict: Manifiesto actualizado.
+    """
+    RUTA_SNAPSHOTS.mkdir(exist_ok=True)
+    manifiesto = leer_manifiesto()
+    registrados = {dataset.archivo: dataset for dataset in DATASETS.values()}
+
+    for ruta_csv in sorted(RUTA_DATOS.glob('*.csv')):
+        dataset = registrados.get(ruta_csv.name, Dataset(ruta_csv.stem, ruta_csv.name))
+        if dataset.nombre not in DATASETS:
+            DATASETS[dataset.nombre] = dataset
+        huella = firma(dataset.nombre)
+
+        entrada = manifiesto.get(dataset.nombre)
+        if (not forzar and entrada is not None and entrada['sha256'] == huella
+                and entrada['esquema'] == dataset.esquema
+                and (RUTA_SNAPSHOTS / entrada['archivo']).exists()):
+            continue
+
+        tabla = pa.Table.from_pandas(leer_csv(dataset), preserve_index=False)
+        archivo = f'{dataset.nombre}.arrow'
+        temporal = RUTA_SNAPSHOTS / f'{archivo}.tmp'
+        with pa.OSFile(str(temporal), 'wb') as destino:
+            with pa.ipc.new_file(destino, tabla.schema) as escritor:
+                escritor.write_table(tabla)
+        os.replace(temporal, RUTA_SNAPSHOTS / archivo)
+
+        manifiesto[dataset.nombre] = {
+            'fuente': dataset.archivo,
+            'archivo': archivo,
+            'sha256': huella,
+            'esquema': dataset.esquema,
+            'filas': tabla.num_rows,
+        }
+        print(f'{dataset.archivo} -> {archivo} ({tabla.num_rows} filas)')
+
+    # Los snapshots de CSV que ya no existen se eliminan.
+    for nombre in [nombre for nombre, entrada in manifiesto.items()
+                   if not (RUTA_DATOS / entrada['fuente']).exists()]:
+        (RUTA_SNAPSHOTS / manifiesto.pop(nombre)['archivo']).unlink(missing_ok=True)
+
+    _escribir_manifiesto(manifiesto)
+    return manifiesto
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Construye los snapshots Arrow de la carpeta Data.')
+    parser.add_argument('--forzar', action='store_true', help='Reconstruye todos los snapshots.')
+    construir(parser.parse_args().forzar)
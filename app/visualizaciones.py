@@ -1,12 +1,210 @@
+import os
+import threading
+from collections import defaultdict
 
+import numpy as np
+import pandas as pd
 
+from datos import para_mostrar
+from diagnostico import cronometrado
+from importaciones import diferido
+
+# Matplotlib y Seaborn se importan recién al dibujar el primer gráfico.
+figura = diferido('matplotlib.figure')
+sns = diferido('seaborn')
+go = diferido('plotly.graph_objects')
+colores_plotly = diferido('plotly.colors')
+excepciones_plotly = diferido('plotly.exceptions')
+
+FIGURAS_POR_FORMA = 4
+
+# Motores de dibujo: imagen de Matplotlib renderizada en el servidor, o figura
+# de Plotly dibujada en el navegador con SVG o, en los de dispersión, con
+# WebGL (scattergl), que sigue siendo fluido con decenas de miles de puntos.
+# Plotly no tiene barras en WebGL, así que 'webgl' las dibuja igual que 'plotly'.
+MOTORES = ('matplotlib', 'plotly', 'webgl')
+MOTOR = os.environ.get('DATA_INSIDER_MOTOR', 'matplotlib')
+
+# Píxeles por pulgada de figsize al dibujar con Plotly.
+PIXELES_POR_PULGADA = 60
+
+_bloqueo_pool = threading.Lock()
+_pool = defaultdict(list)
+
+
+def _nueva_figura(figsize):
+    """
+    Devuelve una figura vacía del tamaño pedido, reutilizando una del pool si hay.
+
+    Las figuras se crean con la API orientada a objetos de Matplotlib, por lo
+    que no quedan registradas en el estado global de pyplot.
+    """
+    with _bloqueo_pool:
+        libres = _pool[tuple(figsize)]
+        fig = libres.pop() if libres else None
+    if fig is None:
+        return figura.Figure(figsize=figsize)
+    fig.clear()
+    return fig
+
+
+def liberar_figura(fig):
+    """
+    Devuelve al pool una figura ya renderizada para que pueda reutilizarse.
+
+    Parámetros:
+        fig (matplotlib.figure.Figure): Figura creada por alguna de las funciones de este módulo.
+    """
+    forma = tuple(fig.get_size_inches())
+    fig.clear()
+    with _bloqueo_pool:
+        libres = _pool[forma]
+        if len(libres) < FIGURAS_POR_FORMA:
+            libres.append(fig)
+
+def _preparar(data):
+    """
+    Adapta los tipos compactos del cargador de datos para graficar: las columnas
+    categóricas pasan a texto para que Seaborn respete el orden de las filas y
+    no dibuje categorías sin observaciones, y las float32 pasan a float64
+    redondeado para que las etiquetas no muestren ruido de precisión (ver
+    datos.para_mostrar).
+    """
+    data = para_mostrar(data)
+    categoricas = data.select_dtypes('category').columns
+    if len(categoricas) == 0:
+        return data
+    return data.astype(dict.fromkeys(categoricas, str))
+
+
+def _etiquetar_barras(ax, valores, symbol:str='', formato:str=None):
+    """
+    Etiqueta todas las barras del gráfico con una llamada a bar_label por contenedor.
+
+    Las etiquetas se arman de forma vectorizada con numpy y se ubican a una
+    distancia fija del extremo de cada barra (hacia afuera también en las
+    negativas), por lo que no dependen de la escala de los datos.
+    """
+    if formato is None:
+        formato = '%d' if valores.dtype.kind in 'iu' else '%.2f'
+
+    for contenedor in ax.containers:
+        etiquetas = _textos(contenedor.datavalues, symbol, formato)
+        ax.bar_label(contenedor, labels=etiquetas.tolist(), padding=4, color='black', fontsize=12)
+
+
+def _textos(datos, symbol:str, formato:str):
+    """Etiquetas de las barras con formato printf y símbolo; vacías donde no hay valor."""
+    datos = np.asarray(datos, dtype=float)
+    etiquetas = np.char.add(np.char.mod(formato, np.nan_to_num(datos)), symbol)
+    return np.where(np.isnan(datos), '', etiquetas)
+
+
+def _elegir_motor(motor:str) -> str:
+    motor = motor or MOTOR
+    if motor not in MOTORES:
+        raise ValueError(f'Motor de gráficos desconocido: {motor!r}. Opciones: {", ".join(MOTORES)}')
+    return motor
+
+
+def _colores(paleta, n:int) -> list:
+    """
+    Devuelve n colores de una paleta para Plotly, como los elegiría Seaborn.
+
+    Las listas se usan tal cual (repitiéndose si hacen falta más colores) y
+    las escalas con nombre se muestrean a intervalos regulares sin tomar los
+    extremos. Sólo si Plotly no conoce la escala se recurre a Seaborn.
+    """
+    if not isinstance(paleta, str):
+        return [paleta[i % len(paleta)] for i in range(n)]
+    puntos = np.linspace(0, 1, n + 2)[1:-1].tolist()
+    try:
+        return colores_plotly.sample_colorscale(colores_plotly.get_colorscale(paleta), puntos)
+    except excepciones_plotly.PlotlyError:
+        return sns.color_palette(paleta, n).as_hex()
+
+
+def _titulo(suptitle:str, title:str) -> str:
+    return f'{suptitle}<br><sup>{title}</sup>' if title else suptitle
+
+
+def _barras_plotly(x:str, y:str, hue:str, data, title:str, suptitle:str, xlabel:str, ylabel:str,
+                   figsize, pallete, legend:bool, rotation:int, symbol:str, formato:str, horizontal:bool):
+    """
+    Versión en Plotly de bar_char y hbar_char, con una traza por valor de hue.
+
+    Las tablas del dashboard tienen una fila por categoría, así que las trazas
+    se superponen en lugar de agruparse y cada barra ocupa todo su lugar.
+    """
+    valor = x if horizontal else y
+    if formato is None:
+        formato = '%d' if data[valor].dtype.kind in 'iu' else '%.2f'
+
+    grupos = pd.unique(data[hue])
+    colores = _colores(pallete, len(grupos))
+    fig = go.Figure()
+    for grupo, color in zip(grupos, colores):
+        filas = data.loc[data[hue] == grupo]
+        fig.add_trace(go.Bar(x=filas[x], y=filas[y], name=str(grupo), marker_color=color,
+                             orientation='h' if horizontal else 'v',
+                             text=_textos(filas[valor], symbol, formato), textposition='outside',
+                             cliponaxis=False, showlegend=legend))
+
+    fig.update_layout(title=_titulo(suptitle, title), barmode='overlay', height=figsize[1] * PIXELES_POR_PULGADA,
+                      xaxis_title=xlabel, yaxis_title=ylabel, plot_bgcolor='white', legend_title=hue)
+    eje_valores = fig.layout.xaxis if horizontal else fig.layout.yaxis
+    eje_valores.update(showticklabels=False, showgrid=False, zeroline=False)
+    if horizontal:
+        # Como en Seaborn, la primera fila de la tabla queda arriba.
+        fig.update_yaxes(autorange='reversed', categoryorder='array', categoryarray=data[y].tolist(),
+                         tickangle=-rotation)
+    else:
+        fig.update_xaxes(categoryorder='array', categoryarray=data[x].tolist(), tickangle=-rotation)
+    return fig
+
+
+def _dispersion_plotly(xlabel:str, ylabel:str, data, x:str, y:str, size:str, sizes:tuple, hue:str, title:str,
+                       suptitle:str, figsize, palette, legend:bool, webgl:bool):
+    """
+    Versión en Plotly de scatter_char.
+
+    Como en Seaborn, `sizes` es el rango del área de los puntos y los valores
+    de `size` se reparten linealmente en ese rango. Con webgl los puntos se
+    dibujan con scattergl. x e y deben ser numéricas.
+    """
+    marcador = {'opacity': 0.8}
+    if size is not None:
+        valores = data[size].to_numpy(dtype=float)
+        minimo, maximo = sizes if sizes is not None else (20, 200)
+        rango = np.nanmax(valores) - np.nanmin(valores)
+        escala = (valores - np.nanmin(valores)) / rango if rango else np.zeros_like(valores)
+        marcador['size'] = np.sqrt(minimo + escala * (maximo - minimo)).astype('float32')
+    hover = f'{xlabel}: %{{x:,.2f}}<br>{ylabel}: %{{y:,.2f}}'
+    if hue is not None and data[hue].dtype.kind in 'iuf':
+        marcador.update(color=data[hue].to_numpy(dtype='float32'), colorscale=colores_plotly.get_colorscale(palette),
+                        showscale=legend, colorbar={'title': {'text': size if size else hue}})
+        hover += f'<br>{hue}: %{{marker.color:,.2f}}'
+    elif hue is not None:
+        categorias = pd.unique(data[hue])
+        marcador['color'] = data[hue].map(dict(zip(categorias, _colores(palette, len(categorias)))))
+
+    traza = go.Scattergl if webgl else go.Scatter
+    # Con float32 el JSON que se envía al navegador ocupa la mitad.
+    fig = go.Figure(traza(x=data[x].to_numpy(dtype='float32'), y=data[y].to_numpy(dtype='float32'),
+                          mode='markers', marker=marcador, hovertemplate=hover + '<extra></extra>'))
+    fig.update_layout(title=_titulo(suptitle, title), height=figsize[1] * PIXELES_POR_PULGADA,
+                      xaxis_title=xlabel, yaxis_title=ylabel)
+    return fig
+
+
+@cronometrado('visualizaciones')
 def bar_char(x:str, y:str, hue:str, data, title:str, suptitle:str, xlabel:str, ylabel:str, 
-             figsize=(10, 6), pallete:str='inferno', legend:bool=False, rotation:int=0, n:int=0, symbol:str=''):
+             figsize=(10, 6), pallete:str='inferno', legend:bool=False, rotation:int=0, symbol:str='', formato:str=None,
+             motor:str=None):
     """
-    Crea un gráfico de barras vertical personalizado usando Seaborn y Matplotlib.
+    Crea un gráfico de barras vertical personalizado usando Seaborn y Matplotlib, o Plotly.
 
     Parámetros:
-        n (int): Valor a sumar al valor de la barra para mostrar encima de ella. Por defecto 0.
         x (str): Nombre de la columna para el eje X.
         y (str): Nombre de la columna para el eje Y.
         hue (str): Nombre de la columna para agrupar por color.
@@ -19,41 +217,47 @@ def bar_char(x:str, y:str, hue:str, data, title:str, suptitle:str, xlabel:str, y
         figsize (tuple, opcional): Tamaño de la figura (ancho, alto). Por defecto (10, 6).
         pallete (str, opcional): Paleta de colores de Seaborn. Por defecto 'inferno'.
         legend (bool, opcional): Si se muestra la leyenda. Por defecto False.
-    symbol (str): Símbolo a mostrar junto al valor de la barra. Por defecto vacío.
+        symbol (str): Símbolo a mostrar junto al valor de la barra. Por defecto vacío.
+        formato (str, opcional): Formato printf de las etiquetas, por ejemplo '%.1f' o '%d'.
+            Por defecto '%d' para enteros y '%.2f' para decimales.
+        motor (str, opcional): 'matplotlib', 'plotly' (SVG) o 'webgl'. Por defecto MOTOR,
+            que se toma de la variable de entorno DATA_INSIDER_MOTOR ('matplotlib' si no está).
 
     Retorna:
-        fig (matplotlib.figure.Figure): Objeto figura de Matplotlib listo para mostrar en Streamlit.
+        fig (matplotlib.figure.Figure o plotly.graph_objects.Figure): Figura lista para mostrar
+        en Streamlit. Las de Matplotlib deben devolverse al pool con liberar_figura una vez renderizadas.
     """
-    
-
-    import matplotlib.pyplot as plt
-    import seaborn as sns
-    import numpy as np
-
-    fig = plt.figure(figsize=figsize)
-
-    ax = sns.barplot(x=x, y=y,data=data, hue=hue, palette=pallete, legend=legend)
-
-    plt.suptitle(suptitle, fontsize=18, y=1.01, ha='center')
-    plt.title(title, fontsize=16)
-    plt.xlabel(xlabel, fontsize=14)
-    plt.xticks(fontsize=12, rotation=rotation)
-    plt.ylabel(ylabel, fontsize=14)
-    plt.yticks(fontsize=12)
+    data = _preparar(data)
+    if _elegir_motor(motor) != 'matplotlib':
+        return _barras_plotly(x, y, hue, data, title, suptitle, xlabel, ylabel, figsize,
+                              pallete, legend, rotation, symbol, formato, horizontal=False)
+
+    fig = _nueva_figura(figsize)
+    ax = fig.add_subplot()
+
+    sns.barplot(x=x, y=y,data=data, hue=hue, palette=pallete, legend=legend, ax=ax)
+
+    fig.suptitle(suptitle, fontsize=18, y=1.01, ha='center')
+    ax.set_title(title, fontsize=16)
+    ax.set_xlabel(xlabel, fontsize=14)
+    ax.tick_params(axis='x', labelsize=12, labelrotation=rotation)
+    ax.set_ylabel(ylabel, fontsize=14)
+    ax.tick_params(axis='y', labelsize=12)
     ax.set_yticklabels([])
-    sns.despine(left=True,bottom=True)
+    sns.despine(ax=ax, left=True,bottom=True)
     ax.tick_params(left=False, bottom=False)
 
-    for i,j in enumerate(data[y]):
-        ax.text(i,j-n if j < 0 else j+n,str(j) + symbol,color='black',fontsize=12,ha='center',va='center')
+    _etiquetar_barras(ax, data[y], symbol, formato)
 
     return fig
 
 
+@cronometrado('visualizaciones')
 def hbar_char(x:str, y:str, hue:str, data, title:str, suptitle:str, xlabel:str, ylabel:str, 
-             figsize=(10, 6), pallete:str='inferno', legend:bool=False, rotation:int=0, n:int=0, symbol:str=''):
+             figsize=(10, 6), pallete:str='inferno', legend:bool=False, rotation:int=0, symbol:str='', formato:str=None,
+             motor:str=None):
     """
-    Crea un gráfico de barras horizontal personalizado usando Seaborn y Matplotlib.
+    Crea un gráfico de barras horizontal personalizado usando Seaborn y Matplotlib, o Plotly.
 
     Parámetros:
         x (str): Nombre de la columna para el eje X (valor numérico).
@@ -68,45 +272,48 @@ def hbar_char(x:str, y:str, hue:str, data, title:str, suptitle:str, xlabel:str,
         figsize (tuple, opcional): Tamaño de la figura (ancho, alto). Por defecto (10, 6).
         pallete (str, opcional): Paleta de colores de Seaborn. Por defecto 'inferno'.
         legend (bool, opcional): Si se muestra la leyenda. Por defecto False.
-        n (int): Valor a sumar al valor de la barra para mostrar encima de ella. Por defecto 0.
         symbol (str): Símbolo a mostrar junto al valor de la barra. Por defecto vacío.
+        formato (str, opcional): Formato printf de las etiquetas, por ejemplo '%.1f' o '%d'.
+            Por defecto '%d' para enteros y '%.2f' para decimales.
+        motor (str, opcional): 'matplotlib', 'plotly' (SVG) o 'webgl'. Por defecto MOTOR,
+            que se toma de la variable de entorno DATA_INSIDER_MOTOR ('matplotlib' si no está).
 
     Retorna:
-        fig (matplotlib.figure.Figure): Objeto figura de Matplotlib listo para mostrar en Streamlit.
+        fig (matplotlib.figure.Figure o plotly.graph_objects.Figure): Figura lista para mostrar
+        en Streamlit. Las de Matplotlib deben devolverse al pool con liberar_figura una vez renderizadas.
     """
-    
-
-    import matplotlib.pyplot as plt
-    import seaborn as sns
-    import numpy as np
+    data = _preparar(data)
+    if _elegir_motor(motor) != 'matplotlib':
+        return _barras_plotly(x, y, hue, data, title, suptitle, xlabel, ylabel, figsize,
+                              pallete, legend, rotation, symbol, formato, horizontal=True)
 
-    fig = plt.figure(figsize=figsize)
+    fig = _nueva_figura(figsize)
+    ax = fig.add_subplot()
 
+    sns.barplot(x=x, y=y, hue=hue, data=data, orient='h', palette=pallete, legend=legend, ax=ax)
 
-    ax = sns.barplot(x=x, y=y, hue=hue, data=data, orient='h', palette=pallete, legend=legend)
-
-    plt.suptitle(suptitle, fontsize=18)
-    plt.title(title, fontsize=16)
-    plt.xlabel(xlabel, fontsize=14)
-    plt.ylabel(ylabel, fontsize=14)
-    plt.yticks(fontsize=12)
+    fig.suptitle(suptitle, fontsize=18)
+    ax.set_title(title, fontsize=16)
+    ax.set_xlabel(xlabel, fontsize=14)
+    ax.set_ylabel(ylabel, fontsize=14)
+    ax.tick_params(axis='y', labelsize=12)
     ax.set_xticklabels([])
     ax.tick_params(left=False, bottom=False)
-    sns.despine(left=True,bottom=True)
+    sns.despine(ax=ax, left=True,bottom=True)
     if legend:
         ax.legend(bbox_to_anchor=(1.25,-0.05), bbox_transform=ax.transAxes,
                   fontsize=10, loc='lower right', title='Industria')
 
-    for i,j in enumerate(data[x]):
-        ax.text(j+n,i,str(j) + symbol,color='black',fontsize=12,ha='center',va='center')
+    _etiquetar_barras(ax, data[x], symbol, formato)
 
     return fig
 
 
+@cronometrado('visualizaciones')
 def scatter_char(xlabel:str, ylabel:str, data, x:str, y:str, size:str=None, sizes:tuple=None, hue:str=None, title:str='', suptitle:str='',
-                 figsize=(10, 6), palette:str='inferno_r', legend:bool=True):
+                 figsize=(10, 6), palette:str='inferno_r', legend:bool=True, motor:str=None):
     """
-    Crea un gráfico de dispersión personalizado usando Seaborn y Matplotlib.
+    Crea un gráfico de dispersión personalizado usando Seaborn y Matplotlib, o Plotly.
 
     Parámetros:
         xlabel (str): Etiqueta del eje X.
@@ -122,25 +329,29 @@ def scatter_char(xlabel:str, ylabel:str, data, x:str, y:str, size:str=None, size
         figsize (tuple, opcional): Tamaño de la figura (ancho, alto). Por defecto (10, 6).
         palette (str, opcional): Paleta de colores de Seaborn. Por defecto 'inferno_r'.
         legend (bool, opcional): Si se muestra la leyenda. Por defecto True.
+        motor (str, opcional): 'matplotlib', 'plotly' (SVG) o 'webgl'. Por defecto MOTOR,
+            que se toma de la variable de entorno DATA_INSIDER_MOTOR ('matplotlib' si no está).
 
     Retorna:
-        fig (matplotlib.figure.Figure): Objeto figura de Matplotlib listo para mostrar en Streamlit.
+        fig (matplotlib.figure.Figure o plotly.graph_objects.Figure): Figura lista para mostrar
+        en Streamlit. Las de Matplotlib deben devolverse al pool con liberar_figura una vez renderizadas.
     """
-    
-    import matplotlib.pyplot as plt
-    import seaborn as sns
-
+    data = _preparar(data)
+    motor = _elegir_motor(motor)
+    if motor != 'matplotlib':
+        return _dispersion_plotly(xlabel, ylabel, data, x, y, size, sizes, hue, title, suptitle,
+                                  figsize, palette, legend, webgl=motor == 'webgl')
 
-    fig, ax = plt.subplots(figsize=figsize)
+    fig = _nueva_figura(figsize)
+    ax = fig.add_subplot()
 
-    sns.scatterplot(x=x, y=y, data=data, size=size,  sizes=sizes, palette=palette, hue=hue, legend=legend)
+    sns.scatterplot(x=x, y=y, data=data, size=size,  sizes=sizes, palette=palette, hue=hue, legend=legend, ax=ax)
 
-    plt.suptitle(suptitle, fontsize=18, y=1.02)
-    plt.title(title, fontsize=16)
-    plt.xlabel(xlabel, fontsize=14)
-    plt.ylabel(ylabel, fontsize=14)
-    plt.yticks(fontsize=12)
-    plt.xticks(fontsize=12)
+    fig.suptitle(suptitle, fontsize=18, y=1.02)
+    ax.set_title(title, fontsize=16)
+    ax.set_xlabel(xlabel, fontsize=14)
+    ax.set_ylabel(ylabel, fontsize=14)
+    ax.tick_params(axis='both', labelsize=12)
 
     if legend:
         ax.legend(bbox_to_anchor=(1.2,-0.05), bbox_transform=ax.transAxes,
@@ -148,4 +359,4 @@ def scatter_char(xlabel:str, ylabel:str, data, x:str, y:str, size:str=None, size
 
     ax.tick_params(left=False, bottom=False)
 
-    return fig
\ No newline at end of file
+    return fig
@@ -0,0 +1,66 @@
+"""
+Configuración común de las pruebas.
+
+Los módulos de app/ fijan sus rutas al importarse a partir de
+DATA_INSIDER_DATOS, así que antes de importarlos se copian los CSV de Data/
+a una carpeta temporal: las pruebas de ingesta agregan filas a esos archivos
+y generan agregados, particiones y tablas compartidas sin tocar Data/.
+"""
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+RAIZ = Path(__file__).resolve().parent.parent
+RUTA_PRUEBAS = Path(tempfile.mkdtemp(prefix='data_insider_'))
+for _csv in (RAIZ / 'Data').glob('*.csv'):
+    shutil.copy(_csv, RUTA_PRUEBAS / _csv.name)
+
+os.environ['DATA_INSIDER_DATOS'] = str(RUTA_PRUEBAS)
+sys.path.insert(0, str(RAIZ / 'app'))
+
+_ORIGINALES = {ruta.name: ruta.read_bytes() for ruta in RUTA_PRUEBAS.glob('*.csv')}
+
+
+def _limpiar():
+    # Restaura los CSV, borra lo que se genera a partir de ellos y vacía las
+    # caches en memoria, como benchmark._limpiar.
+    import acciones
+    import agregados
+    import api
+    import cubo
+    import datos
+    import indices
+    import secciones
+
+    for nombre, contenido in _ORIGINALES.items():
+        (RUTA_PRUEBAS / nombre).write_bytes(contenido)
+    for ruta in RUTA_PRUEBAS.iterdir():
+        if ruta.is_dir():
+            shutil.rmtree(ruta)
+        elif ruta.suffix != '.csv':
+            ruta.unlink()
+
+    datos._cache.clear()
+    datos._huellas.clear()
+    acciones._diarios.clear()
+    agregados._memoria.clear()
+    cubo._cache.clear()
+    indices._cache.clear()
+    secciones._resultados.vaciar()
+    api._respuestas.vaciar()
+
+
+@pytest.fixture(autouse=True)
+def datos_limpios():
+    """Deja la carpeta de datos y las caches como recién copiadas en cada prueba."""
+    _limpiar()
+    yield RUTA_PRUEBAS
+    _limpiar()
+
+
+def pytest_sessionfinish(session, exitstatus):
+    shutil.rmtree(RUTA_PRUEBAS, ignore_errors=True)
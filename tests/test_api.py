@@ -0,0 +1,79 @@
+import asyncio
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import api
+import ingesta
+from datos import cargar
+
+
+def _pedir(destino:str, **cabeceras) -> tuple:
+    cabeceras = {nombre.replace('_', '-').lower(): valor for nombre, valor in cabeceras.items()}
+    return asyncio.run(api._procesar('GET', destino, cabeceras))
+
+
+def test_etag_y_304():
+    estado, cuerpo, etag = _pedir('/cubo?por=Continente&medidas=Ingresos')
+    assert estado == 200 and etag
+
+    # La segunda petición sale de la cache con el mismo ETag.
+    assert _pedir('/cubo?por=Continente&medidas=Ingresos') == (200, cuerpo, etag)
+    assert _pedir('/cubo?por=Continente&medidas=Ingresos', if_none_match=etag) == (304, b'', etag)
+    assert _pedir('/cubo?por=Continente&medidas=Ingresos', if_none_match=f'"otro", W/{etag}')[0] == 304
+    assert _pedir('/cubo?por=Continente&medidas=Ingresos', if_none_match='"otro"')[0] == 200
+
+
+def test_etag_cambia_con_los_datos():
+    _, _, etag = _pedir('/cubo?por=Ano&medidas=Ganancias')
+    forbes = cargar('forbes_2015_2022')
+    nuevas = forbes.loc[forbes['Ano'] == forbes['Ano'].max()].head(20).assign(Ano=lambda d: d['Ano'] + 1)
+    ingesta.ingerir('forbes_2015_2022', nuevas)
+
+    estado, cuerpo, nuevo = _pedir('/cubo?por=Ano&medidas=Ganancias', if_none_match=etag)
+    assert estado == 200 and nuevo != etag
+    assert json.loads(cuerpo)['tabla'][-1]['Ano'] == int(nuevas['Ano'].iloc[0])
+
+
+def test_cubo_como_groupby_sum():
+    _, cuerpo, _ = _pedir('/cubo?por=Continente&medidas=Ganancias&Ano=2020,2021')
+    obtenido = pd.DataFrame(json.loads(cuerpo)['tabla']).set_index('Continente').sort_index()
+
+    forbes = cargar('forbes_2015_2022')
+    filas = forbes.loc[forbes['Ano'].isin([2020, 2021])].dropna(subset=['Industria', 'Pais'])
+    esperado = filas.astype({'Ganancias': np.float64}).groupby('Continente', observed=True)['Ganancias'].sum()
+    esperado.index = esperado.index.astype(str)
+    np.testing.assert_allclose(obtenido['Ganancias'], esperado.sort_index().round(2), atol=0.01)
+
+
+def test_empresas_como_mascara():
+    _, cuerpo, _ = _pedir('/empresas?Industria=Banking&Activos=0:300000&limite=5')
+    respuesta = json.loads(cuerpo)
+    df = cargar(api.DATASET_EXPLORADOR)
+    esperado = df.loc[(df['Industria'] == 'Banking') & df['Activos'].between(0, 300000)]
+    assert respuesta['total'] == len(esperado)
+    assert [fila['Empresa'] for fila in respuesta['filas']] == esperado['Empresa'].head(5).tolist()
+
+
+@pytest.mark.parametrize('destino, estado', [
+    ('/cubo?por=Pais,Continente', 400),
+    ('/cubo?por=Ano,Ano', 400),
+    ('/cubo?por=Region', 400),
+    ('/cubo?por=Ano&Ano=dos', 400),
+    ('/empresas?limite=0', 400),
+    ('/empresas?limite=-1', 400),
+    (f'/empresas?limite={api.LIMITE_EMPRESAS + 1}', 400),
+    ('/empresas?Activos=mucho', 400),
+    ('/no-existe', 404),
+    ('/consultas/no-existe', 404),
+])
+def test_errores(destino, estado):
+    obtenido, cuerpo, etag = _pedir(destino)
+    assert obtenido == estado and etag is None
+    assert 'error' in json.loads(cuerpo)
+
+
+def test_metodo_no_permitido():
+    assert asyncio.run(api._procesar('POST', '/cubo', {}))[0] == 405
@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from consultas import CONSULTAS, _mascara, combinar, ejecutar, es_combinable, finalizar, parcial
+from datos import cargar
+
+COMBINABLES = [nombre for nombre, consulta in CONSULTAS.items() if es_combinable(consulta)]
+
+
+@pytest.mark.parametrize('nombre', COMBINABLES)
+def test_combinar_parciales_como_todas_las_filas(nombre):
+    consulta = CONSULTAS[nombre]
+    df = cargar(consulta.dataset)
+    # El histórico y las filas anexadas después, como en una ingesta: ante
+    # empates gana la fila anterior en ambos casos.
+    partes = [df.iloc[:len(df) // 3], df.iloc[len(df) // 3:]]
+
+    combinado = finalizar(consulta, combinar(consulta, *(parcial(consulta, parte) for parte in partes)))
+    completo = ejecutar(consulta, df)
+    pd.testing.assert_frame_equal(combinado, completo, check_categorical=False)
+
+
+def test_conteo_como_groupby():
+    consulta = CONSULTAS['top_paises_con_mas_empresas']
+    df = cargar(consulta.dataset)
+    esperado = (df.groupby(['Pais', 'Codigo'], observed=True)['Empresa'].count()
+                .sort_values(ascending=False, kind='stable').head(consulta.n))
+    obtenido = ejecutar(consulta, df)
+    np.testing.assert_array_equal(obtenido['Empresa'], esperado.to_numpy())
+    assert set(obtenido['Pais'].astype(str)) == set(esperado.index.get_level_values('Pais').astype(str))
+
+
+def test_seleccion_como_groupby_nlargest():
+    consulta = CONSULTAS['empresas_EU_top_rentabilidad']
+    df = cargar(consulta.dataset)
+    metrica = consulta.metrica or consulta.columnas[-1]
+    filas = df.loc[_mascara(df, consulta.filtros)]
+    esperado = (filas.groupby('Industria', observed=True)[metrica]
+                .apply(lambda serie: serie.nlargest(consulta.k, keep='first')))
+    obtenido = parcial(consulta, df)
+    np.testing.assert_array_equal(obtenido[metrica].to_numpy(), esperado.to_numpy())
+    assert list(obtenido.index.astype(str)) == list(esperado.index.get_level_values('Industria').astype(str))
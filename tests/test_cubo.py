@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import cubo
+import ingesta
+from datos import cargar
+
+
+def _esperado(por:list, filtros:dict=None) -> pd.DataFrame:
+    # Las mismas sumas con groupby sobre las filas de Forbes y de empleados.
+    forbes, empleados = cargar('forbes_2015_2022'), cargar('forbes_empleados')
+    for dimension, valores in (filtros or {}).items():
+        forbes = forbes.loc[forbes[dimension].isin(valores)]
+        empleados = empleados.loc[empleados[dimension].isin(valores)]
+    forbes = forbes.dropna(subset=['Industria', 'Pais', 'Ano'])
+    medidas = [medida for medida in cubo.MEDIDAS if medida != 'Empleados']
+
+    tabla = forbes.astype(dict.fromkeys(medidas, np.float64)).groupby(por, observed=True).agg(
+        **{cubo.CONTEO: ('Ano', 'size')}, **{medida: (medida, 'sum') for medida in medidas})
+    tabla['Empleados'] = empleados.groupby(por, observed=True)['Empleados'].sum().astype(np.float64)
+    return tabla.fillna({'Empleados': 0}).round(2)
+
+
+def _por_claves(tabla:pd.DataFrame, por:list) -> pd.DataFrame:
+    # Las categorías agregadas por ingesta quedan al final de sus códigos:
+    # se compara por etiqueta y no por posición.
+    tabla = tabla.astype(dict.fromkeys([dimension for dimension in por if dimension != 'Ano'], str))
+    return tabla.set_index(por).sort_index()
+
+
+def _comparar(obtenido:pd.DataFrame, esperado:pd.DataFrame, por:list):
+    obtenido, esperado = _por_claves(obtenido, por), _por_claves(esperado.reset_index(), por)
+    assert list(obtenido.index) == list(esperado.index)
+    np.testing.assert_array_equal(obtenido[cubo.CONTEO], esperado[cubo.CONTEO])
+    for medida in cubo.MEDIDAS:
+        np.testing.assert_allclose(obtenido[medida], esperado[medida], rtol=1e-9, atol=0.01, err_msg=medida)
+
+
+@pytest.mark.parametrize('por, filtros', [
+    (['Ano'], None),
+    (['Continente', 'Ano'], None),
+    (['Industria', 'Pais'], {'Ano': [2021, 2022]}),
+    (['Pais'], {'Continente': ['Europe'], 'Industria': ['Banking', 'Insurance']}),
+    (['Ano', 'Industria'], {'Continente': ['Asia']}),
+])
+def test_consultar_como_groupby_sum(por, filtros):
+    _comparar(cubo.obtener().consultar(por, filtros=filtros), _esperado(por, filtros), por)
+
+
+def test_total_sin_dimensiones():
+    total = cubo.obtener().consultar(())
+    assert total[cubo.CONTEO].item() == cargar('forbes_2015_2022').dropna(subset=['Industria', 'Pais']).shape[0]
+
+
+@pytest.mark.parametrize('por', [('Region',), ('Ano', 'Ano'), ('Pais', 'Continente')])
+def test_validar_rechaza(por):
+    with pytest.raises(ValueError):
+        cubo.validar(por)
+    with pytest.raises(ValueError):
+        cubo.obtener().sumar(por)
+
+
+def test_actualizar_como_recalculo_completo():
+    forbes = cargar('forbes_2015_2022')
+    cubo.obtener()
+
+    # Un año nuevo con una industria que no existía.
+    nuevas = forbes.loc[forbes['Ano'] == forbes['Ano'].max()].head(300).copy()
+    nuevas['Ano'] = nuevas['Ano'] + 1
+    nuevas['Industria'] = nuevas['Industria'].cat.add_categories(['Quantum']).where(
+        nuevas.index % 7 != 0, 'Quantum')
+    anterior = cubo.huella()
+    assert len(ingesta.ingerir('forbes_2015_2022', nuevas)) == len(nuevas)
+    assert cubo.huella() != anterior
+    # El cubo se actualizó con las filas nuevas, sin esperar a reconstruirse.
+    assert cubo._cache['cubo'][0] == cubo.huella()
+
+    incremental = cubo.obtener()
+    completo = cubo.Cubo(cubo.celdas(cargar('forbes_2015_2022'), cargar('forbes_empleados')))
+    for por in (['Ano'], ['Industria', 'Ano'], ['Continente']):
+        pd.testing.assert_frame_equal(_por_claves(incremental.consultar(por), por),
+                                      _por_claves(completo.consultar(por), por))
+    _comparar(incremental.consultar(['Industria', 'Ano']), _esperado(['Industria', 'Ano']), ['Industria', 'Ano'])
@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import indices
+from datos import cargar
+
+
+@pytest.mark.parametrize('valores, rangos', [
+    ({}, {}),
+    ({'Continente': ['Europe']}, {}),
+    ({'Industria': ['Banking', 'Insurance'], 'Ano': [2019, 2020]}, {}),
+    ({'Pais': []}, {'Ganancias': (-50.0, 500.0)}),
+    ({'Continente': ['Asia', 'North America']}, {'Ingresos': (10000.0, 1e9), 'Activos': (0.0, 50000.0)}),
+    ({'Industria': ['No existe']}, {}),
+])
+def test_filtrar_como_mascara(valores, rangos):
+    df = cargar('forbes_2015_2022')
+    mascara = np.ones(len(df), dtype=bool)
+    for columna, elegidos in valores.items():
+        if elegidos:
+            mascara &= df[columna].isin(elegidos).to_numpy()
+    for columna, (desde, hasta) in rangos.items():
+        mascara &= df[columna].between(desde, hasta).fillna(False).to_numpy(dtype=bool)
+
+    obtenidas = indices.obtener('forbes_2015_2022').filtrar(valores, rangos)
+    np.testing.assert_array_equal(obtenidas, np.flatnonzero(mascara))
+
+
+def test_nulos_fuera_de_los_rangos():
+    df = pd.DataFrame({'Grupo': ['a', 'b', 'a', 'b'], 'Monto': [1.0, np.nan, 3.0, 2.0]})
+    indice = indices.Indice(df, categoricas=('Grupo',), numericas=('Monto',))
+    np.testing.assert_array_equal(indice.filtrar(rangos={'Monto': (0.0, 10.0)}), [0, 2, 3])
+    np.testing.assert_array_equal(indice.filtrar({'Grupo': ['b']}, {'Monto': (2.0, 2.0)}), [3])
+    assert indice.valores('Grupo') == ['a', 'b']
+    assert indice.rango('Monto') == (1.0, 3.0)
@@ -0,0 +1,91 @@
+import pandas as pd
+import pytest
+
+import agregados
+import datos
+import ingesta
+from consultas import CONSULTAS, ejecutar, es_combinable
+
+
+def _anio_nuevo(filas:int=400) -> pd.DataFrame:
+    # Copia del último año con el año siguiente y una industria que no existía.
+    forbes = datos.cargar('forbes_2015_2022')
+    nuevas = forbes.loc[forbes['Ano'] == forbes['Ano'].max()].head(filas).copy()
+    nuevas['Ano'] = nuevas['Ano'] + 1
+    nuevas['Industria'] = nuevas['Industria'].cat.add_categories(['Quantum']).where(
+        nuevas.index % 5 != 0, 'Quantum')
+    return nuevas.reset_index(drop=True)
+
+
+def _sin_categorias(df:pd.DataFrame) -> pd.DataFrame:
+    # Al combinar parciales con categorías distintas la columna queda como texto.
+    return df.astype({columna: str for columna in df.select_dtypes('category').columns})
+
+
+def test_agregados_incrementales_como_recalculo_completo():
+    nombres = [nombre for nombre, consulta in CONSULTAS.items() if consulta.dataset == 'forbes_2015_2022']
+    for nombre in nombres:
+        agregados.materializar_consulta(nombre)
+
+    ingesta.ingerir('forbes_2015_2022', _anio_nuevo())
+    completo = datos.leer_csv(datos.DATASETS['forbes_2015_2022'])
+    for nombre in nombres:
+        incremental = agregados.resultado(nombre)
+        if es_combinable(CONSULTAS[nombre]):
+            # El resultado vino del parcial combinado, no de volver a ejecutar la consulta.
+            assert agregados._ruta_parcial(nombre, agregados.clave(nombre)).exists()
+        pd.testing.assert_frame_equal(_sin_categorias(incremental),
+                                      _sin_categorias(ejecutar(CONSULTAS[nombre], completo)), obj=nombre)
+
+
+def test_extender_como_lectura_completa():
+    dataset = datos.DATASETS['forbes_2015_2022']
+    historico = datos.cargar(dataset.nombre)
+    nuevas = _anio_nuevo()
+    # Las filas llegan como del CSV de entrada: sin las categorías del histórico.
+    extendido = datos._extender(historico, nuevas.astype({'Industria': str, 'Pais': str}), dataset)
+
+    datos.anexar(dataset.nombre, nuevas)
+    leido = datos.leer_csv(dataset)
+    pd.testing.assert_frame_equal(extendido, leido, check_categorical=False)
+    for columna in ('Industria', 'Pais', 'Codigo', 'Continente'):
+        assert isinstance(extendido[columna].dtype, pd.CategoricalDtype)
+        # Los códigos del histórico no cambian al agregar categorías.
+        assert (extendido[columna].cat.codes[:len(historico)] == historico[columna].cat.codes).all()
+
+
+def test_anexar_extiende_la_cache():
+    datos.cargar('forbes_2015_2022')
+    nuevas = _anio_nuevo(50)
+    huella = datos.anexar('forbes_2015_2022', nuevas)
+
+    assert huella == datos.firma('forbes_2015_2022')
+    datos._huellas.clear()
+    assert datos.firma('forbes_2015_2022') == huella
+    assert len(datos.cargar('forbes_2015_2022')) == len(datos.leer_csv(datos.DATASETS['forbes_2015_2022']))
+
+
+def test_ingerir_respeta_la_marca():
+    nuevas = _anio_nuevo(30)
+    assert len(ingesta.ingerir('forbes_2015_2022', nuevas)) == 30
+    assert ingesta.marca('forbes_2015_2022') == {'': int(nuevas['Ano'].max())}
+    assert ingesta.ingerir('forbes_2015_2022', nuevas).empty
+
+
+def test_ingerir_acciones_informa_simbolos_desconocidos():
+    nuevas = pd.DataFrame({
+        'Symbol': ['EA', 'EA', 'ZZZZ'],
+        'Fecha': pd.to_datetime(['2030-01-02', '2030-01-03', '2030-01-02']),
+        **{columna: [1.0, 2.0, 3.0] for columna in ('Precio_Apertura', 'Precio_Cierre',
+                                                     'Precio_Maximo', 'Precio_Minimo')},
+    }).astype(datos.TIPOS_ACCIONES)
+
+    agregadas, sin_asignar = ingesta.ingerir_acciones(nuevas)
+    assert agregadas == {'acciones_ea': 2}
+    assert sin_asignar['Symbol'].astype(str).tolist() == ['ZZZZ']
+    assert datos.cargar('acciones_ea')['Fecha'].max() == pd.Timestamp('2030-01-03')
+
+
+@pytest.mark.parametrize('nombre', ['acciones_ea', 'forbes_2015_2022'])
+def test_pendientes_sin_filas_nuevas(nombre):
+    assert ingesta.pendientes(nombre, datos.cargar(nombre)).empty
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from muestreo import lttb, reducir
+
+
+def _lttb_directo(x:np.ndarray, y:np.ndarray, puntos:int) -> list:
+    # Largest-Triangle-Three-Buckets tal como lo describe Steinarsson, punto por punto.
+    total = len(x)
+    ancho = (total - 2) / (puntos - 2)
+    elegidos, anterior = [0], 0
+    for cubeta in range(puntos - 2):
+        inicio = int(np.floor(cubeta * ancho)) + 1
+        fin = int(np.floor((cubeta + 1) * ancho)) + 1
+        siguiente_fin = min(int(np.floor((cubeta + 2) * ancho)) + 1, total)
+        siguiente = range(fin, max(siguiente_fin, fin + 1))
+        promedio_x, promedio_y = x[list(siguiente)].mean(), y[list(siguiente)].mean()
+        mejor, mayor = inicio, -1.0
+        for i in range(inicio, fin):
+            area = abs((x[anterior] - promedio_x) * (y[i] - y[anterior])
+                       - (x[anterior] - x[i]) * (promedio_y - y[anterior]))
+            if area > mayor:
+                mejor, mayor = i, area
+        elegidos.append(mejor)
+        anterior = mejor
+    return elegidos + [total - 1]
+
+
+@pytest.mark.parametrize('total, puntos', [(1000, 100), (5000, 37), (101, 100), (10, 3)])
+def test_lttb_como_referencia(total, puntos):
+    generador = np.random.default_rng(total)
+    x = np.arange(total, dtype=np.float64)
+    y = np.cumsum(generador.normal(size=total))
+    elegidos = lttb(x, y, puntos)
+    assert len(elegidos) == puntos
+    assert elegidos[0] == 0 and elegidos[-1] == total - 1
+    assert np.all(np.diff(elegidos) > 0)
+    np.testing.assert_array_equal(elegidos, _lttb_directo(x, y, puntos))
+
+
+@pytest.mark.parametrize('puntos', [2, 50, 80])
+def test_lttb_sin_reducir(puntos):
+    x = np.arange(50, dtype=np.float64)
+    np.testing.assert_array_equal(lttb(x, np.sin(x), puntos), np.arange(50))
+
+
+def test_reducir_por_grupo():
+    fechas = pd.date_range('2024-01-01', periods=400, freq='D')
+    df = pd.concat([pd.DataFrame({'Symbol': simbolo, 'Fecha': fechas, 'Precio': np.arange(400.0) * signo})
+                    for simbolo, signo in (('EA', 1), ('NTDOY', -1))], ignore_index=True)
+    df = df.sample(frac=1, random_state=0)
+
+    reducido = reducir(df, 'Fecha', 'Precio', 'Symbol', puntos=40, desde=fechas[100])
+    assert reducido.groupby('Symbol').size().tolist() == [40, 40]
+    assert reducido['Fecha'].min() == fechas[100]
+    for _, serie in reducido.groupby('Symbol'):
+        assert serie['Fecha'].is_monotonic_increasing
+        assert serie['Fecha'].iloc[-1] == fechas[-1]
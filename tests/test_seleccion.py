@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from seleccion import PASADAS_MAXIMAS, codigos_de_grupo, por_grupo, posiciones_por_grupo
+
+
+def _datos(filas:int=2000, grupos:int=40, semilla:int=0) -> pd.DataFrame:
+    # Valores redondeados para que haya empates y algunos nulos.
+    generador = np.random.default_rng(semilla)
+    metrica = generador.integers(0, 50, filas).astype(np.float64)
+    metrica[generador.random(filas) < 0.05] = np.nan
+    return pd.DataFrame({
+        'grupo': generador.integers(0, grupos, filas),
+        'metrica': metrica,
+    })
+
+
+def _esperadas(df:pd.DataFrame, k:int, mayores:bool) -> np.ndarray:
+    # nlargest/nsmallest con keep='first' desempatan por orden de aparición.
+    elegir = 'nlargest' if mayores else 'nsmallest'
+    filas = df.dropna(subset=['metrica']).groupby('grupo', sort=True)['metrica'].apply(
+        lambda serie: getattr(serie, elegir)(k, keep='first'))
+    return filas.index.get_level_values(-1).to_numpy()
+
+
+@pytest.mark.parametrize('k', [1, 3, PASADAS_MAXIMAS + 12])
+@pytest.mark.parametrize('mayores', [True, False])
+def test_posiciones_como_groupby_nlargest(k, mayores):
+    df = _datos()
+    codigos, _ = codigos_de_grupo(df, ['grupo'])
+    posiciones = posiciones_por_grupo(codigos, df['metrica'].to_numpy(), k, mayores)
+    np.testing.assert_array_equal(df.index[posiciones], _esperadas(df, k, mayores))
+
+
+def test_posiciones_con_grupos_chicos_y_grandes():
+    # Con k por encima de PASADAS_MAXIMAS hay grupos enteros y grupos recortados.
+    df = pd.concat([_datos(3000, 5, semilla=1), _datos(200, 60, semilla=2).assign(grupo=lambda d: d['grupo'] + 5)],
+                   ignore_index=True)
+    codigos, _ = codigos_de_grupo(df, ['grupo'])
+    k = PASADAS_MAXIMAS + 4
+    posiciones = posiciones_por_grupo(codigos, df['metrica'].to_numpy(), k)
+    np.testing.assert_array_equal(df.index[posiciones], _esperadas(df, k, True))
+
+
+def test_por_grupo_como_idxmax():
+    df = _datos().assign(grupo=lambda d: d['grupo'].astype(str).astype('category'))
+    esperado = df.loc[df.groupby('grupo', observed=True)['metrica'].idxmax().dropna()]
+    pd.testing.assert_frame_equal(por_grupo(df, ['grupo'], 'metrica'), esperado)
+
+
+def test_por_grupo_con_varias_claves():
+    df = _datos().assign(otra=lambda d: d.index % 3)
+    elegidas = por_grupo(df, ['grupo', 'otra'], 'metrica', k=2, mayores=False)
+    esperado = (df.dropna(subset=['metrica']).groupby(['grupo', 'otra'], sort=True)['metrica']
+                .apply(lambda serie: serie.nsmallest(2, keep='first')))
+    np.testing.assert_array_equal(elegidas.index, esperado.index.get_level_values(-1))
+
+
+def test_sin_filas_validas():
+    codigos = np.array([0, 1, -1])
+    assert len(posiciones_por_grupo(codigos, np.array([np.nan, np.nan, 1.0]))) == 0
+    assert len(posiciones_por_grupo(codigos, np.array([1.0, 2.0, 3.0]), k=0)) == 0